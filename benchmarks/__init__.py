@@ -0,0 +1,4 @@
+"""Benchmarks for sql_lineage over generated worst-case SQL.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
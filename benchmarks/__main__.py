@@ -0,0 +1,104 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+
+from benchmarks.generators import GENERATORS, QUICK_SIZES, SIZES, dialects
+from benchmarks.runner import (
+    TARGETS,
+    build_report,
+    compare,
+    load_results,
+    run_benchmarks,
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark sql_lineage"
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        choices=sorted(GENERATORS),
+        help="Case to run (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--dialect",
+        action="append",
+        choices=dialects(),
+        help="Dialect to run (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--target", choices=TARGETS, default="analyze", help="API to benchmark"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Use small sizes for a smoke run"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per case; the fastest is kept"
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=5.0,
+        help="Stop repeating a case once this much time was spent on it",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run cases in this process (peak RSS then covers all cases so far)",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", help="Compare against a stored JSON report")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed throughput drop versus the baseline (0.2 = 20%%)",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    results = run_benchmarks(
+        cases=args.case,
+        dialect_names=args.dialect,
+        sizes=QUICK_SIZES if args.quick else SIZES,
+        target=args.target,
+        repeat=args.repeat,
+        max_seconds=args.max_seconds,
+        isolate=not args.in_process,
+        progress=sys.stderr,
+    )
+    report = build_report(results)
+    for name, curve in report["scaling"].items():
+        sys.stderr.write(f"scaling {name}: exponent {curve['exponent']}\n")
+    status = 1 if any(result.error for result in results) else 0
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        report["regressions"] = [item.to_dict() for item in regressions]
+        for item in regressions:
+            sys.stderr.write(
+                f"REGRESSION {item.case}/{item.dialect}/{item.size}: "
+                f"{item.current:.1f} vs {item.baseline:.1f} stmts/s "
+                f"({item.slowdown:.2f}x slower)\n"
+            )
+        if regressions:
+            status = 1
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+"""Deterministic generators of worst-case SQL for each supported dialect."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from sql_lineage.dialects import supported_dialects
+
+
+@dataclass(frozen=True)
+class DialectStyle:
+    """Dialect-specific spellings used by the generators."""
+
+    month: str
+    concat: str
+
+
+STYLES: Dict[str, DialectStyle] = {
+    "clickhouse": DialectStyle(month="toStartOfMonth({0})", concat="concat({0}, {1})"),
+    "postgres": DialectStyle(month="date_trunc('month', {0})", concat="{0} || {1}"),
+    "mysql": DialectStyle(
+        month="DATE_FORMAT({0}, '%Y-%m-01')", concat="CONCAT({0}, {1})"
+    ),
+    "spark": DialectStyle(month="date_trunc('MONTH', {0})", concat="concat({0}, {1})"),
+}
+
+
+def _style(dialect: str) -> DialectStyle:
+    try:
+        return STYLES[dialect]
+    except KeyError:
+        raise ValueError(f"No generator style for dialect: {dialect}") from None
+
+
+def _expression(position: int, column: str, style: DialectStyle) -> str:
+    """Return one of several select-item shapes for a column."""
+
+    kind = position % 5
+    if kind == 0:
+        return column
+    if kind == 1:
+        return f"{column} + {position} AS e{position}"
+    if kind == 2:
+        return f"{style.month.format(column)} AS m{position}"
+    if kind == 3:
+        return f"{style.concat.format(column, repr(str(position)))} AS s{position}"
+    return f"CASE WHEN {column} > {position} THEN {column} ELSE 0 END AS c{position}"
+
+
+def wide_select(size: int, dialect: str) -> str:
+    """One SELECT with ``size`` output columns of mixed expression types."""
+
+    style = _style(dialect)
+    items = [_expression(index, f"w.col{index}", style) for index in range(size)]
+    return f"SELECT {', '.join(items)} FROM warehouse.wide_table w"
+
+
+def cte_chain(size: int, dialect: str) -> str:
+    """A query over ``size`` CTEs, each reading the previous one."""
+
+    style = _style(dialect)
+    ctes = ["s0 AS (SELECT id, amount, created_at FROM raw.events)"]
+    for index in range(1, size):
+        ctes.append(
+            f"s{index} AS (SELECT id, amount + {index} AS amount, "
+            f"{style.month.format('created_at')} AS created_at FROM s{index - 1})"
+        )
+    return f"WITH {', '.join(ctes)} " f"SELECT id, amount, created_at FROM s{size - 1}"
+
+
+def join_chain(size: int, dialect: str) -> str:
+    """A SELECT joining ``size`` tables, reading one column from each."""
+
+    style = _style(dialect)
+    items = ["t0.id"] + [
+        _expression(index, f"t{index}.v{index}", style) for index in range(1, size)
+    ]
+    joins = " ".join(
+        f"{'LEFT JOIN' if index % 2 else 'JOIN'} dim.table{index} t{index} "
+        f"ON t{index}.id = t{index - 1}.id"
+        for index in range(1, size)
+    )
+    return f"SELECT {', '.join(items)} FROM dim.table0 t0 {joins}"
+
+
+def nested_subqueries(size: int, dialect: str) -> str:
+    """``size`` derived tables nested inside each other."""
+
+    style = _style(dialect)
+    query = "SELECT id, amount, created_at FROM raw.events"
+    for index in range(size):
+        query = (
+            f"SELECT id, amount * {index + 2} AS amount, "
+            f"{style.month.format('created_at')} AS created_at "
+            f"FROM ({query}) q{index}"
+        )
+    return query
+
+
+def union_chain(size: int, dialect: str) -> str:
+    """``size`` SELECTs combined with UNION ALL."""
+
+    style = _style(dialect)
+    return " UNION ALL ".join(
+        f"SELECT id, amount + {index} AS amount, "
+        f"{style.concat.format('name', repr(str(index)))} AS label "
+        f"FROM shard.events_{index}"
+        for index in range(size)
+    )
+
+
+def script(size: int, dialect: str, seed: int = 0) -> str:
+    """A script of ``size`` mixed INSERT, CREATE TABLE AS and SELECT statements."""
+
+    style = _style(dialect)
+    rng = random.Random(f"{seed}:{dialect}:{size}")
+    statements: List[str] = []
+    for index in range(size):
+        source = f"stage.source_{rng.randrange(200)}"
+        lookup = f"stage.lookup_{rng.randrange(50)}"
+        columns = ", ".join(
+            _expression(position, f"s.col{rng.randrange(40)}", style)
+            for position in range(rng.randint(3, 12))
+        )
+        body = (
+            f"SELECT s.id, l.name, {columns} FROM {source} s "
+            f"JOIN {lookup} l ON l.id = s.lookup_id WHERE s.id > {index}"
+        )
+        kind = rng.randrange(3)
+        if kind == 0:
+            statements.append(f"INSERT INTO mart.target_{index % 97} {body}")
+        elif kind == 1:
+            statements.append(f"CREATE TABLE mart.derived_{index} AS {body}")
+        else:
+            statements.append(
+                f"WITH base AS ({body}) SELECT id, name FROM base WHERE id < {index}"
+            )
+    return ";\n".join(statements) + ";\n"
+
+
+GENERATORS: Dict[str, Callable[[int, str], str]] = {
+    "wide_select": wide_select,
+    "cte_chain": cte_chain,
+    "join_chain": join_chain,
+    "nested_subqueries": nested_subqueries,
+    "union_chain": union_chain,
+    "script": script,
+}
+
+# Sizes per case for the full run and for quick smoke runs.
+SIZES: Dict[str, Tuple[int, ...]] = {
+    "wide_select": (100, 400, 1600),
+    "cte_chain": (8, 32, 128),
+    "join_chain": (4, 16, 64),
+    "nested_subqueries": (4, 8, 12),
+    "union_chain": (16, 64, 256),
+    "script": (100, 1000, 10000),
+}
+QUICK_SIZES: Dict[str, Tuple[int, ...]] = {
+    "wide_select": (20, 80),
+    "cte_chain": (4, 16),
+    "join_chain": (4, 8),
+    "nested_subqueries": (2, 4),
+    "union_chain": (8, 32),
+    "script": (20, 100),
+}
+
+
+def generate(case: str, size: int, dialect: str) -> str:
+    """Return the SQL of a benchmark case."""
+
+    try:
+        generator = GENERATORS[case]
+    except KeyError:
+        raise ValueError(f"Unknown benchmark case: {case}") from None
+    return generator(size, dialect)
+
+
+def dialects() -> List[str]:
+    """Return the dialects benchmarks are generated for."""
+
+    return supported_dialects()
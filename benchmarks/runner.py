@@ -0,0 +1,274 @@
+"""Run benchmark cases, report throughput and compare against a baseline."""
+
+from __future__ import annotations
+
+import json
+import math
+import multiprocessing
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from benchmarks.generators import GENERATORS, SIZES, dialects, generate
+
+TARGETS = ("analyze", "graph")
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """Timing of one benchmark case at one size in one dialect."""
+
+    case: str
+    dialect: str
+    size: int
+    target: str
+    statements: int
+    runs: int
+    seconds: float
+    statements_per_second: float
+    peak_rss_kb: Optional[int]
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, str, int, str]:
+        """Return the identity used to match results against a baseline."""
+
+        return (self.case, self.dialect, self.size, self.target)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the result to a dictionary."""
+
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A case that got slower than the baseline by more than the threshold."""
+
+    case: str
+    dialect: str
+    size: int
+    target: str
+    baseline: float
+    current: float
+
+    @property
+    def slowdown(self) -> float:
+        """Return how many times slower the current run is."""
+
+        return self.baseline / self.current if self.current else math.inf
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the regression to a dictionary."""
+
+        return {**asdict(self), "slowdown": round(self.slowdown, 3)}
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Return the peak resident set size of this process in KiB, if available."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_case(
+    case: str,
+    size: int,
+    dialect: str,
+    target: str = "analyze",
+    repeat: int = 3,
+    max_seconds: float = 5.0,
+) -> CaseResult:
+    """Time one case in the current process, keeping the fastest run.
+
+    Runs stop early once ``max_seconds`` have been spent, so the largest cases
+    run once.
+    """
+
+    from sql_lineage import analyze, build_graph
+
+    sql = generate(case, size, dialect)
+    best = math.inf
+    runs = 0
+    statements = 0
+    spent = 0.0
+    try:
+        while runs < max(repeat, 1) and (runs == 0 or spent < max_seconds):
+            started = time.perf_counter()
+            if target == "graph":
+                result = build_graph(sql, dialect=dialect, include_timestamp=False)
+                statements = result["meta"]["statements"]
+            else:
+                result = analyze(sql, dialect=dialect)
+                statements = len(result["statements"])
+            elapsed = time.perf_counter() - started
+            best = min(best, elapsed)
+            spent += elapsed
+            runs += 1
+    except Exception as exc:
+        return CaseResult(
+            case, dialect, size, target, 0, runs, 0.0, 0.0, peak_rss_kb(), repr(exc)
+        )
+    return CaseResult(
+        case=case,
+        dialect=dialect,
+        size=size,
+        target=target,
+        statements=statements,
+        runs=runs,
+        seconds=round(best, 6),
+        statements_per_second=round(statements / best, 3) if best else 0.0,
+        peak_rss_kb=peak_rss_kb(),
+    )
+
+
+def _run_isolated(arguments: Tuple[str, int, str, str, int, float]) -> CaseResult:
+    return run_case(*arguments)
+
+
+def run_benchmarks(
+    cases: Optional[Sequence[str]] = None,
+    dialect_names: Optional[Sequence[str]] = None,
+    sizes: Optional[Dict[str, Tuple[int, ...]]] = None,
+    target: str = "analyze",
+    repeat: int = 3,
+    max_seconds: float = 5.0,
+    isolate: bool = True,
+    progress: Optional[object] = None,
+) -> List[CaseResult]:
+    """Run every case, size and dialect combination.
+
+    With ``isolate``, each combination runs in a fresh worker process so that
+    ``peak_rss_kb`` is the peak of that case alone. ``progress`` is an optional
+    text stream receiving one line per finished case.
+    """
+
+    if target not in TARGETS:
+        raise ValueError(f"Unknown benchmark target: {target}")
+    sizes = sizes or SIZES
+    plan = [
+        (case, size, dialect, target, repeat, max_seconds)
+        for case in cases or list(GENERATORS)
+        for dialect in dialect_names or dialects()
+        for size in sizes[case]
+    ]
+    results: List[CaseResult] = []
+    if isolate:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=1, maxtasksperchild=1) as pool:
+            outcomes: Iterable[CaseResult] = pool.imap(_run_isolated, plan)
+            for result in outcomes:
+                results.append(_report(result, progress))
+    else:
+        for arguments in plan:
+            results.append(_report(run_case(*arguments), progress))
+    return results
+
+
+def _report(result: CaseResult, progress: Optional[object]) -> CaseResult:
+    if progress is not None:
+        status = result.error or f"{result.statements_per_second:.1f} stmts/s"
+        progress.write(
+            f"{result.case:<18} {result.dialect:<10} {result.size:>6} "
+            f"{result.seconds:>9.4f}s  {status}\n"
+        )
+        progress.flush()
+    return result
+
+
+def scaling(results: Iterable[CaseResult]) -> Dict[str, Dict[str, object]]:
+    """Return time per size and the fitted growth exponent of each case curve.
+
+    The exponent is the least-squares slope of log(seconds) over log(size): 1
+    means time grows linearly with size, 2 quadratically.
+    """
+
+    curves: Dict[Tuple[str, str, str], List[Tuple[int, float]]] = {}
+    for result in results:
+        if result.error is None and result.seconds > 0:
+            curves.setdefault((result.case, result.dialect, result.target), []).append(
+                (result.size, result.seconds)
+            )
+    report: Dict[str, Dict[str, object]] = {}
+    for (case, dialect, target), points in sorted(curves.items()):
+        points.sort()
+        report[f"{case}/{dialect}/{target}"] = {
+            "points": [[size, seconds] for size, seconds in points],
+            "exponent": _slope(points),
+        }
+    return report
+
+
+def _slope(points: List[Tuple[int, float]]) -> Optional[float]:
+    if len(points) < 2:
+        return None
+    xs = [math.log(size) for size, _seconds in points]
+    ys = [math.log(seconds) for _size, seconds in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+    return round(slope, 3)
+
+
+def build_report(results: Sequence[CaseResult]) -> Dict[str, object]:
+    """Build the JSON report of a benchmark run."""
+
+    from sql_lineage import __version__
+
+    return {
+        "library_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [result.to_dict() for result in results],
+        "scaling": scaling(results),
+    }
+
+
+def load_results(path: str) -> List[CaseResult]:
+    """Load the results of a report written by ``build_report``."""
+
+    with open(path, "r", encoding="utf-8") as handle:
+        report = json.load(handle)
+    return [CaseResult(**item) for item in report["results"]]
+
+
+def compare(
+    results: Iterable[CaseResult],
+    baseline: Iterable[CaseResult],
+    threshold: float = 0.2,
+) -> List[Regression]:
+    """Return cases whose throughput dropped more than ``threshold`` below baseline.
+
+    Cases missing from either side or failing in either run are skipped.
+    """
+
+    previous = {item.key: item for item in baseline if item.error is None}
+    regressions: List[Regression] = []
+    for result in results:
+        before = previous.get(result.key)
+        if before is None or result.error is not None:
+            continue
+        if result.statements_per_second < before.statements_per_second * (
+            1 - threshold
+        ):
+            regressions.append(
+                Regression(
+                    case=result.case,
+                    dialect=result.dialect,
+                    size=result.size,
+                    target=result.target,
+                    baseline=before.statements_per_second,
+                    current=result.statements_per_second,
+                )
+            )
+    return regressions
@@ -1,9 +1,106 @@
-"""Public interface for the sql_lineage package."""
+"""Public interface for the sql_lineage package.
+
+Public names are imported from their submodules on first access, so importing
+the package (and running ``sql-lineage --help``) does not load sqlglot.
+"""
 
 from __future__ import annotations
 
-from sql_lineage.analyzer import analyze, to_json
-from sql_lineage.exporters import export_graph
-from sql_lineage.graph import build_er_columns, build_graph
+import importlib
+from typing import TYPE_CHECKING, Dict, List
+
+from sql_lineage.version import __version__
+
+if TYPE_CHECKING:
+    from sql_lineage.analyzer import analyze, analyze_typed, iter_analyze, to_json
+    from sql_lineage.batch import analyze_many, build_graphs_many
+    from sql_lineage.cache import AnalysisCache, MemoryCacheBackend, SQLiteCacheBackend
+    from sql_lineage.catalog import SchemaCatalog, load_catalog, write_catalog_index
+    from sql_lineage.columnar import ColumnarResult, analyze_columnar
+    from sql_lineage.csr import CSRGraph
+    from sql_lineage.exporters import export_graph
+    from sql_lineage.graph import (
+        build_er_columns,
+        build_graph,
+        build_graph_from_analysis,
+        build_graphs,
+    )
+    from sql_lineage.incremental import GraphDelta, IncrementalGraph
+    from sql_lineage.lineage_graph import LineageGraph
+    from sql_lineage.reachability import ReachabilityIndex
+    from sql_lineage.script_lineage import ScriptLineage, resolve_script_lineage
+    from sql_lineage.store import GraphStore
+
+_EXPORTS: Dict[str, str] = {
+    "AnalysisCache": "sql_lineage.cache",
+    "CSRGraph": "sql_lineage.csr",
+    "ColumnarResult": "sql_lineage.columnar",
+    "GraphDelta": "sql_lineage.incremental",
+    "GraphStore": "sql_lineage.store",
+    "IncrementalGraph": "sql_lineage.incremental",
+    "LineageGraph": "sql_lineage.lineage_graph",
+    "MemoryCacheBackend": "sql_lineage.cache",
+    "ReachabilityIndex": "sql_lineage.reachability",
+    "SQLiteCacheBackend": "sql_lineage.cache",
+    "SchemaCatalog": "sql_lineage.catalog",
+    "ScriptLineage": "sql_lineage.script_lineage",
+    "analyze": "sql_lineage.analyzer",
+    "analyze_columnar": "sql_lineage.columnar",
+    "analyze_many": "sql_lineage.batch",
+    "analyze_typed": "sql_lineage.analyzer",
+    "build_er_columns": "sql_lineage.graph",
+    "build_graph": "sql_lineage.graph",
+    "build_graph_from_analysis": "sql_lineage.graph",
+    "build_graphs": "sql_lineage.graph",
+    "build_graphs_many": "sql_lineage.batch",
+    "export_graph": "sql_lineage.exporters",
+    "iter_analyze": "sql_lineage.analyzer",
+    "load_catalog": "sql_lineage.catalog",
+    "resolve_script_lineage": "sql_lineage.script_lineage",
+    "to_json": "sql_lineage.analyzer",
+    "write_catalog_index": "sql_lineage.catalog",
+}
+
+__all__ = [
+    "AnalysisCache",
+    "CSRGraph",
+    "ColumnarResult",
+    "GraphDelta",
+    "GraphStore",
+    "IncrementalGraph",
+    "LineageGraph",
+    "MemoryCacheBackend",
+    "ReachabilityIndex",
+    "SQLiteCacheBackend",
+    "SchemaCatalog",
+    "ScriptLineage",
+    "__version__",
+    "analyze",
+    "analyze_columnar",
+    "analyze_many",
+    "analyze_typed",
+    "build_er_columns",
+    "build_graph",
+    "build_graph_from_analysis",
+    "build_graphs",
+    "build_graphs_many",
+    "export_graph",
+    "iter_analyze",
+    "load_catalog",
+    "resolve_script_lineage",
+    "to_json",
+    "write_catalog_index",
+]
+
+
+def __getattr__(name: str) -> object:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["analyze", "build_er_columns", "build_graph", "export_graph", "to_json"]
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,199 @@
+"""Asyncio coroutines running lineage work off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar, Union
+
+from sql_lineage.cache import AnalysisCache
+from sql_lineage.catalog import CatalogSource
+from sql_lineage.context import DEFAULT_MAX_LINEAGE_DEPTH
+
+_ResultT = TypeVar("_ResultT")
+
+ExecutorSpec = Union[Executor, str, None]
+
+_default_executor: ExecutorSpec = "thread"
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_thread_pool_lock = threading.Lock()
+
+
+def set_default_executor(executor: ExecutorSpec) -> None:
+    """Set the executor used when a coroutine is called without one.
+
+    Accepts an ``Executor``, ``"thread"`` for a shared thread pool or
+    ``"process"`` for the shared warm process pool used by batch analysis.
+    """
+
+    global _default_executor
+    if executor is None:
+        executor = "thread"
+    _resolve_executor(executor)
+    _default_executor = executor
+
+
+def _resolve_executor(executor: ExecutorSpec) -> Executor:
+    """Return the executor for an ``Executor``, ``"thread"`` or ``"process"``."""
+
+    global _thread_pool
+    if executor is None:
+        executor = _default_executor
+    if isinstance(executor, Executor):
+        return executor
+    if executor == "thread":
+        with _thread_pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix="sql-lineage",
+                )
+            return _thread_pool
+    if executor == "process":
+        from sql_lineage.batch import get_executor
+
+        return get_executor()
+    raise ValueError(f"Unsupported executor: {executor!r}")
+
+
+async def run(
+    function: Callable[..., _ResultT],
+    *args: object,
+    executor: ExecutorSpec = None,
+    timeout: Optional[float] = None,
+    **kwargs: object,
+) -> _ResultT:
+    """Run ``function(*args, **kwargs)`` in an executor and await the result.
+
+    Raises ``asyncio.TimeoutError`` after ``timeout`` seconds. On timeout or
+    cancellation, work that has not started yet is dropped; work already
+    running finishes in its worker and the result is discarded. With a process
+    executor, the function and its arguments must be picklable.
+    """
+
+    call = functools.partial(function, *args, **kwargs)
+    pool = _resolve_executor(executor)
+    if executor == "process":
+        from sql_lineage.batch import _submit_job
+
+        future = asyncio.wrap_future(_submit_job(pool, call))
+    else:
+        future = asyncio.get_running_loop().run_in_executor(pool, call)
+    if timeout is None:
+        return await future
+    return await asyncio.wait_for(future, timeout)
+
+
+async def analyze(
+    sql: str,
+    dialect: str = "clickhouse",
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    cross_statement: bool = False,
+    catalog: Optional[CatalogSource] = None,
+    cache: Optional[AnalysisCache] = None,
+    executor: ExecutorSpec = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, object]:
+    """Coroutine version of ``sql_lineage.analyze``.
+
+    A ``cache`` with an in-memory backend is only shared with thread executors;
+    process workers get a copy.
+    """
+
+    from sql_lineage.analyzer import analyze as analyze_sync
+
+    return await run(
+        analyze_sync,
+        sql,
+        dialect=dialect,
+        max_lineage_depth=max_lineage_depth,
+        cache=cache,
+        cross_statement=cross_statement,
+        catalog=catalog,
+        executor=executor,
+        timeout=timeout,
+    )
+
+
+async def build_graph(
+    sql: str,
+    dialect: str = "clickhouse",
+    mode: str = "full",
+    include_timestamp: bool = True,
+    catalog: Optional[CatalogSource] = None,
+    cache: Optional[AnalysisCache] = None,
+    executor: ExecutorSpec = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, object]:
+    """Coroutine version of ``sql_lineage.build_graph``."""
+
+    from sql_lineage.graph import build_graph as build_graph_sync
+
+    return await run(
+        build_graph_sync,
+        sql,
+        dialect=dialect,
+        mode=mode,
+        include_timestamp=include_timestamp,
+        cache=cache,
+        catalog=catalog,
+        executor=executor,
+        timeout=timeout,
+    )
+
+
+async def export_graph(
+    graph: Dict[str, object],
+    format: str = "json",
+    executor: ExecutorSpec = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """Coroutine version of ``sql_lineage.export_graph``."""
+
+    from sql_lineage.exporters import export_graph as export_graph_sync
+
+    return await run(
+        export_graph_sync, graph, format=format, executor=executor, timeout=timeout
+    )
+
+
+async def gather(
+    awaitables: Iterable[Awaitable[_ResultT]],
+    limit: Optional[int] = None,
+    return_exceptions: bool = False,
+) -> List[_ResultT]:
+    """Await many coroutines with at most ``limit`` running at once.
+
+    Results are returned in input order. Coroutines are started only when a
+    slot is free, so a large batch queues in the caller instead of flooding the
+    executor. Unless ``return_exceptions`` is True, the first failure cancels
+    the remaining work and is raised; cancelling ``gather`` cancels everything.
+    """
+
+    items = list(awaitables)
+    slots = asyncio.Semaphore(limit or os.cpu_count() or 1)
+    started: List[bool] = [False] * len(items)
+
+    async def _bounded(position: int) -> _ResultT:
+        async with slots:
+            started[position] = True
+            return await items[position]
+
+    tasks = [
+        asyncio.ensure_future(_bounded(position)) for position in range(len(items))
+    ]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        for position, item in enumerate(items):
+            # Coroutines cancelled before they got a slot were never awaited.
+            if not started[position] and asyncio.iscoroutine(item):
+                item.close()
@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+import io
 import json
-from typing import List, Optional
+import os
+import pickle
+from dataclasses import replace
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
 
 from sqlglot import exp
 
+from sql_lineage.cache import AnalysisCache
 from sql_lineage.collectors import collect_joins, collect_subqueries
+from sql_lineage.catalog import (
+    CatalogSource,
+    DictCatalog,
+    SchemaCatalog,
+    load_catalog,
+)
+from sql_lineage.context import (
+    DEFAULT_MAX_LINEAGE_DEPTH,
+    AnalysisContext,
+    AnalysisMemo,
+)
 from sql_lineage.context_builder import build_context
 from sql_lineage.dialects import is_supported_dialect, normalize_dialect
 from sql_lineage.lineage_builder import (
@@ -17,14 +34,23 @@ from sql_lineage.lineage_builder import (
     extract_lineage_data,
 )
 from sql_lineage.models import (
-    ColumnRef,
-    Dependency,
+    AnalysisResult,
     LineageData,
     LineageMapping,
     OutputColumn,
+    QueryAnalysis,
     StatementAnalysis,
 )
-from sql_lineage.parser import StatementParseResult, parse_sql
+from sql_lineage.parser import (
+    DEFAULT_MAX_STATEMENT_SIZE,
+    StatementParseResult,
+    iter_statement_chunks,
+    iter_stream_chunks,
+    parse_sql,
+)
+from sql_lineage.profiling import Tracer, attach_timings, count_nodes, traced
+from sql_lineage.scope import ExpressionScope, build_select_scope, scan_expression
+from sql_lineage.script_lineage import resolve_script_lineage
 
 
 def _output_name(expression: exp.Expression) -> str:
@@ -45,31 +71,141 @@ def _expression_sql(expression: exp.Expression, dialect: str) -> str:
     return expression.sql(dialect=dialect)
 
 
-def _analyze_select(select: exp.Select, dialect: str) -> Dict[str, object]:
+def _output_column(
+    select_expr: exp.Expression,
+    dialect: str,
+    context: AnalysisContext,
+    item_scope: ExpressionScope,
+) -> OutputColumn:
+    """Build the lineage of one select item."""
+
+    name = _output_name(select_expr)
+    expression_sql = _expression_sql(select_expr, dialect)
+    lineage_expression = (
+        select_expr.this if isinstance(select_expr, exp.Alias) else select_expr
+    )
+    functions = extract_functions(lineage_expression, dialect, item_scope)
+    lineage_type, mapping_reason = determine_lineage_type(select_expr, functions)
+    lineage = extract_lineage_data(
+        lineage_expression,
+        name,
+        context,
+        lineage_type,
+        mapping_reason,
+        scope=item_scope,
+    )
+    return OutputColumn(
+        name=name,
+        expression=expression_sql,
+        lineage=lineage,
+        dependencies=build_dependencies(lineage.inputs, context),
+    )
+
+
+def _expand_star(
+    select_expr: exp.Expression, context: AnalysisContext
+) -> Optional[List[exp.Expression]]:
+    """Expand ``*`` or ``t.*`` into qualified columns of the starred relations.
+
+    CTE and subquery columns are always known; table columns come from the
+    catalog. A relation with unknown columns stays as a ``t.*`` item.
+    ``EXCEPT`` drops columns and ``REPLACE`` substitutes their expressions.
+    Returns None when the item is not a star, no starred relation has known
+    columns, or a star with modifiers covers a relation with unknown columns.
+    """
+
+    if isinstance(select_expr, exp.Star):
+        star = select_expr
+        identifiers = context.relations
+    elif isinstance(select_expr, exp.Column) and isinstance(select_expr.this, exp.Star):
+        star = select_expr.this
+        identifiers = [select_expr.table]
+    else:
+        return None
+    if star.args.get("rename") or star.args.get("ilike"):
+        return None
+    excluded = {
+        (column.table, column.name)
+        for column in star.args.get("except") or star.args.get("except_") or []
+    }
+    replaced = {item.alias: item for item in star.args.get("replace") or []}
+    columns: List[exp.Expression] = []
+    known = False
+    for identifier in identifiers:
+        source = context.resolve_source(identifier)
+        names = context.source_columns(source) if source is not None else None
+        if names is None:
+            if excluded or replaced:
+                return None
+            columns.append(_star_column(identifier))
+            continue
+        known = True
+        for name in names:
+            if ("", name) in excluded or (identifier, name) in excluded:
+                continue
+            if name in replaced:
+                columns.append(replaced[name].copy())
+            else:
+                columns.append(exp.column(name, table=identifier))
+    return columns if known else None
+
+
+def _star_column(identifier: str) -> exp.Column:
+    """Build a ``t.*`` column for a relation identifier."""
+
+    return exp.Column(this=exp.Star(), table=exp.to_identifier(identifier))
+
+
+def _star_scope(context: AnalysisContext) -> ExpressionScope:
+    """Build the scope of an unexpanded ``*`` as ``t.*`` of each relation."""
+
+    return ExpressionScope(
+        columns=[_star_column(identifier) for identifier in context.relations]
+    )
+
+
+def _analyze_select(
+    select: exp.Select, dialect: str, memo: AnalysisMemo
+) -> QueryAnalysis:
     """Analyze a Select expression and return lineage metadata."""
 
-    context = build_context(select, dialect, analyze_expression)
+    tracer = memo.tracer
+    scope = build_select_scope(select)
+    context = traced(
+        tracer,
+        "context",
+        memo.statement,
+        select,
+        build_context,
+        select,
+        dialect,
+        analyze_expression,
+        memo=memo,
+        scope=scope,
+    )
     output_columns: List[OutputColumn] = []
-    for select_expr in select.expressions:
-        name = _output_name(select_expr)
-        expression_sql = _expression_sql(select_expr, dialect)
-        lineage_expression = (
-            select_expr.this if isinstance(select_expr, exp.Alias) else select_expr
-        )
-        functions = extract_functions(lineage_expression, dialect)
-        lineage_type, mapping_reason = determine_lineage_type(select_expr, functions)
-        lineage = extract_lineage_data(
-            lineage_expression, name, context, lineage_type, mapping_reason
-        )
-        dependencies = build_dependencies(lineage.inputs, context)
-        output_columns.append(
-            OutputColumn(
-                name=name,
-                expression=expression_sql,
-                lineage=lineage,
-                dependencies=dependencies,
+    for select_expr, item_scope in zip(select.expressions, scope.items):
+        expanded = _expand_star(select_expr, context)
+        if expanded is None:
+            if isinstance(select_expr, exp.Star):
+                item_scope = _star_scope(context)
+            expanded_items = [(select_expr, item_scope)]
+        else:
+            expanded_items = [(column, scan_expression(column)) for column in expanded]
+        for item, item_scope in expanded_items:
+            output_columns.append(
+                traced(
+                    tracer,
+                    "lineage",
+                    memo.statement,
+                    item,
+                    _output_column,
+                    item,
+                    dialect,
+                    context,
+                    item_scope,
+                )
             )
-        )
 
     sources = [
         {
@@ -81,66 +217,41 @@ def _analyze_select(select: exp.Select, dialect: str) -> Dict[str, object]:
         for source in context.report_sources
     ]
 
-    return {
-        "sources": sources,
-        "output": {"columns": [col.to_dict() for col in output_columns]},
-        "joins": collect_joins(select, dialect),
-        "unions": [],
-        "subqueries": collect_subqueries(select, dialect),
-    }
+    return QueryAnalysis(
+        sources=sources,
+        output_columns=output_columns,
+        joins=collect_joins(select, dialect, join_nodes=scope.joins),
+        unions=[],
+        subqueries=collect_subqueries(
+            select, dialect, memo=memo, subquery_nodes=scope.subqueries
+        ),
+    )
 
 
-def _analyze_union(union: exp.Union, dialect: str) -> Dict[str, object]:
+def _analyze_union(union: exp.Union, dialect: str, memo: AnalysisMemo) -> QueryAnalysis:
     """Analyze a Union expression and return lineage metadata."""
 
-    left = union.left
-    right = union.right
-    left_data = analyze_expression(left, dialect)
-    right_data = analyze_expression(right, dialect)
+    left_data = analyze_expression(union.left, dialect, memo=memo)
+    right_data = analyze_expression(union.right, dialect, memo=memo)
 
     output_columns: List[OutputColumn] = []
-    left_columns = left_data.get("output", {}).get("columns", [])
-    right_columns = right_data.get("output", {}).get("columns", [])
-
-    for index, left_col in enumerate(left_columns):
-        right_col = right_columns[index] if index < len(right_columns) else None
-        inputs = list(left_col["lineage"]["inputs"])
-        if right_col:
-            inputs.extend(right_col["lineage"]["inputs"])
-        lineage_inputs = [
-            {
-                "table": item.get("table"),
-                "column": item.get("column"),
-            }
-            for item in inputs
-        ]
-        mapping_sources = [item for item in lineage_inputs if item.get("table")]
-        dependencies = build_dependencies(
-            [
-                ColumnRef(table=item.get("table"), column=item.get("column"))
-                for item in lineage_inputs
-            ]
-        )
+    right_columns = right_data.output_columns
+    for index, left_col in enumerate(left_data.output_columns):
+        inputs = list(left_col.lineage.inputs)
+        if index < len(right_columns):
+            inputs.extend(right_columns[index].lineage.inputs)
+        mapping_sources = [item for item in inputs if item.table]
         output_columns.append(
             OutputColumn(
-                name=left_col["name"],
-                expression=left_col["expression"],
+                name=left_col.name,
+                expression=left_col.expression,
                 lineage=LineageData(
                     lineage_type="union",
-                    inputs=[
-                        ColumnRef(table=item.get("table"), column=item.get("column"))
-                        for item in lineage_inputs
-                    ],
+                    inputs=inputs,
                     mapping=[
                         LineageMapping(
-                            output_column=left_col["name"],
-                            sources=[
-                                ColumnRef(
-                                    table=item.get("table"),
-                                    column=item.get("column"),
-                                )
-                                for item in mapping_sources
-                            ],
+                            output_column=left_col.name,
+                            sources=mapping_sources,
                             reason="union",
                         )
                     ],
@@ -148,60 +259,76 @@ def _analyze_union(union: exp.Union, dialect: str) -> Dict[str, object]:
                     literals=[],
                     notes=[],
                 ),
-                dependencies=dependencies,
+                dependencies=build_dependencies(inputs),
             )
         )
 
-    unions = [left_data, right_data]
-    sources = left_data.get("sources", []) + right_data.get("sources", [])
-    joins = left_data.get("joins", []) + right_data.get("joins", [])
-    subqueries = left_data.get("subqueries", []) + right_data.get("subqueries", [])
-
-    return {
-        "sources": sources,
-        "output": {"columns": [col.to_dict() for col in output_columns]},
-        "joins": joins,
-        "unions": unions,
-        "subqueries": subqueries,
-    }
-
-
-def analyze_expression(expression: exp.Expression, dialect: str) -> Dict[str, object]:
-    """Analyze a generic SQL expression (Select or Union)."""
-
-    if isinstance(expression, exp.Select):
-        return _analyze_select(expression, dialect)
-    if isinstance(expression, exp.Union):
-        return _analyze_union(expression, dialect)
-    select = expression.find(exp.Select)
-    if select is not None:
-        return _analyze_select(select, dialect)
-    return {
-        "sources": [],
-        "output": {"columns": []},
-        "joins": [],
-        "unions": [],
-        "subqueries": [],
-    }
-
+    return QueryAnalysis(
+        sources=left_data.sources + right_data.sources,
+        output_columns=output_columns,
+        joins=left_data.joins + right_data.joins,
+        unions=[left_data, right_data],
+        subqueries=left_data.subqueries + right_data.subqueries,
+    )
 
-def _target_from_table(table: exp.Table, dialect: str) -> Dict[str, str]:
-    """Create a target table dictionary from a sqlglot Table expression."""
 
-    return {
+def analyze_expression(
+    expression: exp.Expression,
+    dialect: str,
+    memo: Optional[AnalysisMemo] = None,
+) -> QueryAnalysis:
+    """Analyze a generic SQL expression (Select or Union).
+
+    Analyses are cached in ``memo`` by AST node identity so that nested derived
+    tables reached from several collectors are analyzed only once per statement.
+    """
+
+    if memo is None:
+        memo = AnalysisMemo()
+    target: Optional[exp.Expression] = expression
+    if not isinstance(expression, (exp.Select, exp.Union)):
+        target = expression.find(exp.Select)
+    if target is None:
+        return QueryAnalysis()
+    cached = memo.get(target)
+    if cached is not None:
+        return cached
+    if isinstance(target, exp.Union):
+        return memo.store(target, _analyze_union(target, dialect, memo))
+    return memo.store(target, _analyze_select(target, dialect, memo))
+
+
+def _target_from_table(
+    table: exp.Table, dialect: str, columns: Tuple[str, ...] = ()
+) -> Dict[str, object]:
+    """Create a target table dictionary from a sqlglot Table expression.
+
+    ``columns`` is the explicit column list of an INSERT, if any.
+    """
+
+    target: Dict[str, object] = {
         "type": "table",
         "name": table.name,
         "database": table.db or "",
         "raw": table.sql(dialect=dialect),
     }
+    if columns:
+        target["columns"] = list(columns)
+    return target
 
 
 def _analyze_statement(
-    statement: StatementParseResult, dialect: str
+    statement: StatementParseResult,
+    dialect: str,
+    index: int,
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    errors: Optional[List[str]] = None,
+    catalog: Optional[SchemaCatalog] = None,
+    tracer: Optional[Tracer] = None,
 ) -> StatementAnalysis:
     """Analyze a parsed SQL statement and return a StatementAnalysis."""
 
-    errors: List[str] = []
+    errors = list(errors or [])
     expression = statement.expression
     analysis_expression = expression
     if (
@@ -209,114 +336,363 @@ def _analyze_statement(
         and expression.args.get("expression") is not None
     ):
         analysis_expression = expression.args["expression"]
-    analysis = analyze_expression(analysis_expression, dialect)
-    target: Optional[Dict[str, str]] = None
+    memo = AnalysisMemo(
+        max_lineage_depth=max_lineage_depth,
+        catalog=catalog,
+        tracer=tracer,
+        statement=index,
+    )
+    analysis = analyze_expression(analysis_expression, dialect, memo=memo)
+    target: Optional[Dict[str, object]] = None
     if statement.target is not None:
-        target = _target_from_table(statement.target, dialect)
-    output_columns = [
-        OutputColumn(
-            name=col["name"],
-            expression=col["expression"],
-            lineage=LineageData(
-                lineage_type=col["lineage"]["type"],
-                inputs=[
-                    ColumnRef(
-                        table=item.get("table"),
-                        column=item.get("column"),
-                    )
-                    for item in col["lineage"]["inputs"]
-                ],
-                mapping=[
-                    LineageMapping(
-                        output_column=mapping["output_column"],
-                        sources=[
-                            ColumnRef(
-                                table=source.get("table"),
-                                column=source.get("column"),
-                            )
-                            for source in mapping["sources"]
-                        ],
-                        reason=mapping["reason"],
-                    )
-                    for mapping in col["lineage"].get("mapping", [])
-                ],
-                functions=col["lineage"]["functions"],
-                literals=col["lineage"]["literals"],
-                notes=col["lineage"]["notes"],
-            ),
-            dependencies=[
-                Dependency(
-                    table=dep["table"],
-                    columns=list(dep["columns"]),
-                )
-                for dep in col.get("dependencies", [])
-            ],
+        target = _target_from_table(
+            statement.target, dialect, statement.target_columns
         )
-        for col in analysis.get("output", {}).get("columns", [])
-    ]
     return StatementAnalysis(
-        index=0,
+        index=index,
         statement_type=statement.statement_type,
         target=target,
-        output_columns=output_columns,
-        sources=analysis.get("sources", []),
-        joins=analysis.get("joins", []),
-        unions=analysis.get("unions", []),
-        subqueries=analysis.get("subqueries", []),
+        output_columns=analysis.output_columns,
+        sources=analysis.sources,
+        joins=analysis.joins,
+        unions=analysis.unions,
+        subqueries=analysis.subqueries,
         errors=errors,
     )
 
 
-def analyze(sql: str, dialect: str = "clickhouse") -> Dict[str, object]:
-    """Analyze SQL and return a JSON-compatible lineage dictionary."""
+def _unparsed_statement(index: int, errors: List[str]) -> StatementAnalysis:
+    """Build a placeholder analysis for a statement that failed to parse."""
 
-    normalized_dialect = normalize_dialect(dialect)
-    errors: List[str] = []
-    if not is_supported_dialect(normalized_dialect):
-        errors.append(f"Unsupported dialect: {dialect}")
+    return StatementAnalysis(
+        index=index,
+        statement_type="unparsed",
+        target=None,
+        output_columns=[],
+        sources=[],
+        joins=[],
+        unions=[],
+        subqueries=[],
+        errors=errors,
+    )
+
+
+def _parsed_nodes(statements: List[StatementParseResult]) -> int:
+    """Return the number of AST nodes of parsed statements."""
+
+    return sum(count_nodes(statement.expression) for statement in statements)
+
+
+def _analyze_chunk(
+    sql: str,
+    dialect: str,
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    start_index: int = 1,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+) -> List[StatementAnalysis]:
+    """Parse and analyze one statement chunk with its own ansi fallback.
 
+    ``catalog`` may be a path, so pool workers load each catalog file once
+    through the per-process path cache instead of receiving it per chunk.
+    """
+
+    errors: List[str] = []
+    catalog = load_catalog(catalog)
     try:
-        statements = parse_sql(sql, normalized_dialect)
-        dialect_used = normalized_dialect
+        statements = traced(
+            tracer, "parse", start_index, _parsed_nodes, parse_sql, sql, dialect
+        )
+        dialect_used = dialect
     except Exception as exc:
         try:
-            statements = parse_sql(sql, "ansi")
+            statements = traced(
+                tracer, "parse", start_index, _parsed_nodes, parse_sql, sql, "ansi"
+            )
             dialect_used = "ansi"
             errors.append(
-                f"Failed to parse with dialect '{normalized_dialect}', using ansi: {exc}"
+                f"Failed to parse with dialect '{dialect}', using ansi: {exc}"
             )
         except Exception as fallback_exc:
-            return {
-                "dialect": normalized_dialect,
-                "statements": [],
-                "errors": errors + [str(fallback_exc)],
-            }
+            return [
+                _unparsed_statement(
+                    start_index,
+                    [
+                        f"Failed to parse with dialect '{dialect}': {exc}",
+                        f"Fallback to ansi failed: {fallback_exc}",
+                    ],
+                )
+            ]
+    return [
+        _analyze_statement(
+            statement,
+            dialect_used,
+            index,
+            max_lineage_depth,
+            errors=errors,
+            catalog=catalog,
+            tracer=tracer,
+        )
+        for index, statement in enumerate(statements, start=start_index)
+    ]
 
-    analyses: List[StatementAnalysis] = []
-    for index, statement in enumerate(statements, start=1):
-        analysis = _analyze_statement(statement, dialect_used)
-        analyses.append(
-            StatementAnalysis(
-                index=index,
-                statement_type=analysis.statement_type,
-                target=analysis.target,
-                output_columns=analysis.output_columns,
-                sources=analysis.sources,
-                joins=analysis.joins,
-                unions=analysis.unions,
-                subqueries=analysis.subqueries,
-                errors=analysis.errors,
-            )
+
+def _chunk_sqls(sql: str, dialect: str) -> List[str]:
+    """Split a script into the SQL text of its statement chunks."""
+
+    return [chunk.sql for chunk in iter_statement_chunks(sql, dialect)]
+
+
+def _worker_catalog(
+    source: Optional[CatalogSource], schema: Optional[SchemaCatalog]
+) -> Tuple[bool, Optional[CatalogSource]]:
+    """Return whether a catalog can be sent to pool workers, and what to send.
+
+    Path catalogs are sent as their path. Catalogs that cannot be pickled, such
+    as callables wrapping lambdas, cannot reach the workers.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        return True, os.path.abspath(os.fspath(source))
+    if schema is None or isinstance(schema, DictCatalog):
+        return True, schema
+    try:
+        pickle.dumps(schema)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False, None
+    return True, schema
+
+
+def _iter_chunk_groups(
+    chunks: List[str],
+    dialect: str,
+    max_lineage_depth: int,
+    catalog: Optional[SchemaCatalog],
+    tracer: Optional[Tracer],
+) -> Iterator[List[StatementAnalysis]]:
+    """Analyze chunks in the calling process, numbering statements in order."""
+
+    index = 1
+    for chunk in chunks:
+        group = _analyze_chunk(
+            chunk,
+            dialect,
+            max_lineage_depth,
+            start_index=index,
+            catalog=catalog,
+            tracer=tracer,
         )
+        index += len(group)
+        yield group
+
+
+def analyze_typed(
+    sql: str,
+    dialect: str = "clickhouse",
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    workers: Optional[int] = None,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+) -> AnalysisResult:
+    """Analyze SQL and return typed model objects without serializing them.
+
+    The script is split into statements with the tokenizer and each statement is
+    parsed on its own, so a statement that fails to parse only records errors on
+    its own entry. With ``workers`` > 1, statements are analyzed in the shared
+    batch process pool. ``catalog`` is a schema mapping, a JSON/YAML or index
+    file path, a callable or a ``SchemaCatalog`` (see ``sql_lineage.catalog``).
+    A ``tracer`` (see ``sql_lineage.profiling``) receives per-phase timings;
+    tracing runs every statement in the calling process, ignoring ``workers``.
+    """
+
+    normalized_dialect = normalize_dialect(dialect)
+    schema = load_catalog(catalog)
+    errors: List[str] = []
+    if not is_supported_dialect(normalized_dialect):
+        errors.append(f"Unsupported dialect: {dialect}")
+
+    chunks = traced(tracer, "split", None, 0, _chunk_sqls, sql, normalized_dialect)
+    parallel = (
+        tracer is None and workers is not None and workers > 1 and len(chunks) > 1
+    )
+    if parallel:
+        parallel, worker_catalog = _worker_catalog(catalog, schema)
+    if parallel:
+        from sql_lineage.batch import _map_shared
+
+        groups = _map_shared(
+            workers,
+            _analyze_chunk,
+            chunks,
+            repeat(normalized_dialect),
+            repeat(max_lineage_depth),
+            repeat(1),
+            repeat(worker_catalog),
+            chunksize=max(1, len(chunks) // (workers * 4)),
+        )
+    else:
+        groups = _iter_chunk_groups(
+            chunks, normalized_dialect, max_lineage_depth, schema, tracer
+        )
+    analyses: List[StatementAnalysis] = []
+    for group in groups:
+        for analysis in group:
+            index = len(analyses) + 1
+            if analysis.index != index:
+                analysis = replace(analysis, index=index)
+            analyses.append(analysis)
+    return AnalysisResult(
+        dialect=normalized_dialect, statements=analyses, errors=errors
+    )
 
-    return {
-        "dialect": dialect_used,
-        "statements": [analysis.to_dict() for analysis in analyses],
-        "errors": errors,
-    }
 
+def iter_analyze(
+    source: Union[str, os.PathLike, TextIO],
+    dialect: str = "clickhouse",
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    block_size: int = 1024 * 1024,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+    max_statement_size: int = DEFAULT_MAX_STATEMENT_SIZE,
+) -> Iterator[StatementAnalysis]:
+    """Analyze a script statement by statement and yield each result.
+
+    ``source`` is SQL text, a path (``pathlib.Path`` or other ``os.PathLike``)
+    or a text stream. Statements are split incrementally and each AST is
+    released before the next statement is parsed, so memory stays bounded for
+    very large scripts. A statement longer than ``max_statement_size``
+    characters is yielded as an unparsed statement with an error.
+    """
 
-def to_json(sql: str, dialect: str = "clickhouse", indent: int = 2) -> str:
+    normalized_dialect = normalize_dialect(dialect)
+    schema = load_catalog(catalog)
+    if isinstance(source, os.PathLike):
+        with open(source, "r", encoding="utf-8") as handle:
+            yield from iter_analyze(
+                handle,
+                normalized_dialect,
+                max_lineage_depth,
+                block_size,
+                schema,
+                tracer,
+                max_statement_size,
+            )
+        return
+    stream = io.StringIO(source) if isinstance(source, str) else source
+    index = 1
+    chunks = iter_stream_chunks(
+        stream, normalized_dialect, block_size, max_statement_size
+    )
+    for chunk in chunks:
+        if chunk.error is not None:
+            yield _unparsed_statement(index, [chunk.error])
+            index += 1
+            continue
+        for analysis in _analyze_chunk(
+            chunk.sql,
+            normalized_dialect,
+            max_lineage_depth,
+            start_index=index,
+            catalog=schema,
+            tracer=tracer,
+        ):
+            index += 1
+            yield analysis
+
+
+def analyze(
+    sql: str,
+    dialect: str = "clickhouse",
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    cache: Optional[AnalysisCache] = None,
+    workers: Optional[int] = None,
+    cross_statement: bool = False,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+) -> Dict[str, object]:
+    """Analyze SQL and return a JSON-compatible lineage dictionary.
+
+    With a ``cache``, results are looked up by SQL content, dialect, options and
+    library version before parsing. With ``cross_statement``, a
+    ``cross_statement`` key holds column lineage resolved through the targets of
+    earlier statements in the script. A schema ``catalog`` resolves ambiguous
+    unqualified columns and expands ``*``; results for catalogs without a
+    fingerprint, such as callables, are not cached. With a
+    ``profiling.TimingCollector`` as ``tracer``, per-phase timings are added under
+    ``meta.timings``; a cache hit records no phases.
+    """
+
+    schema = load_catalog(catalog)
+    fingerprint = schema.fingerprint() if schema is not None else None
+    # Paths are kept so that workers load the file instead of receiving it.
+    source = catalog if isinstance(catalog, (str, os.PathLike)) else schema
+    if cache is None or (schema is not None and fingerprint is None):
+        return attach_timings(
+            _analyze_dict(
+                sql,
+                dialect,
+                max_lineage_depth,
+                workers,
+                cross_statement,
+                source,
+                tracer,
+            ),
+            tracer,
+        )
+    options: Tuple[Tuple[str, object], ...] = (
+        ("max_lineage_depth", max_lineage_depth),
+    )
+    if cross_statement:
+        options += (("cross_statement", True),)
+    if fingerprint is not None:
+        options += (("catalog", fingerprint),)
+    key = cache.key("analysis", sql, normalize_dialect(dialect), options=options)
+    result = cache.load(key)
+    if result is None:
+        result = _analyze_dict(
+            sql, dialect, max_lineage_depth, workers, cross_statement, source, tracer
+        )
+        cache.store(key, result)
+    return attach_timings(result, tracer)
+
+
+def _analyze_dict(
+    sql: str,
+    dialect: str,
+    max_lineage_depth: int,
+    workers: Optional[int],
+    cross_statement: bool,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+) -> Dict[str, object]:
+    """Run typed analysis and serialize it, optionally resolving across statements."""
+
+    analysis = analyze_typed(
+        sql,
+        dialect=dialect,
+        max_lineage_depth=max_lineage_depth,
+        workers=workers,
+        catalog=catalog,
+        tracer=tracer,
+    )
+    result = analysis.to_dict()
+    if cross_statement:
+        result["cross_statement"] = resolve_script_lineage(
+            analysis.statements
+        ).to_dict()
+    return result
+
+
+def to_json(
+    sql: str,
+    dialect: str = "clickhouse",
+    indent: int = 2,
+    catalog: Optional[CatalogSource] = None,
+) -> str:
     """Serialize lineage analysis into JSON."""
 
-    return json.dumps(analyze(sql, dialect=dialect), indent=indent, ensure_ascii=False)
+    return json.dumps(
+        analyze(sql, dialect=dialect, catalog=catalog),
+        indent=indent,
+        ensure_ascii=False,
+    )
@@ -0,0 +1,369 @@
+"""Parallel batch analysis across a pool of warm worker processes."""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from sql_lineage.analyzer import analyze
+from sql_lineage.catalog import CatalogSource
+from sql_lineage.dialects import SUPPORTED_DIALECTS, normalize_dialect
+from sql_lineage.graph import build_graph
+
+BatchItem = Union[str, Tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of analyzing one item of a batch."""
+
+    index: int
+    key: str
+    result: Optional[Dict[str, object]]
+    error: Optional[str]
+    duration: float
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the item was processed without an exception."""
+
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the batch result to a dictionary."""
+
+        return {
+            "index": self.index,
+            "key": self.key,
+            "result": self.result,
+            "error": self.error,
+            "duration": self.duration,
+        }
+
+
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _warm_worker(dialects: Sequence[str]) -> None:
+    """Load sqlglot dialects once per worker process."""
+
+    from sqlglot.dialects.dialect import Dialect
+
+    for dialect in dialects:
+        try:
+            Dialect.get_or_raise(dialect)
+        except Exception:
+            continue
+
+
+def get_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return a shared process pool with ``workers`` warm worker processes.
+
+    Pools are created on first use and reused by later batches, so the sqlglot
+    import and dialect setup are paid once per worker. Submit through
+    ``_submit_job`` or ``_map_shared`` so a pool broken by a dead worker is
+    discarded and replaced.
+    """
+
+    size = workers or os.cpu_count() or 1
+    with _POOLS_LOCK:
+        pool = _POOLS.get(size)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=size,
+                initializer=_warm_worker,
+                initargs=(sorted(SUPPORTED_DIALECTS),),
+            )
+            _POOLS[size] = pool
+        return pool
+
+
+def shutdown_executors() -> None:
+    """Shut down every shared worker pool."""
+
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_executors)
+
+
+def _discard_pool(pool: Executor) -> Optional[int]:
+    """Drop a broken shared pool and return its size, or None if not shared."""
+
+    with _POOLS_LOCK:
+        size = next((key for key, shared in _POOLS.items() if shared is pool), None)
+        if size is None:
+            return None
+        del _POOLS[size]
+    pool.shutdown(wait=False)
+    return size
+
+
+def _discard_if_broken(pool: Executor, future: Future) -> None:
+    """Drop ``pool`` once a job fails because one of its workers died."""
+
+    if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+        _discard_pool(pool)
+
+
+def _submit_job(pool: Executor, function: Callable, *args: object) -> Future:
+    """Submit a job, replacing a shared pool that turns out to be broken.
+
+    A shared pool that rejects the job as broken is dropped and the job goes to
+    a new pool of the same size. A job whose worker dies drops its pool too.
+    """
+
+    try:
+        future = pool.submit(function, *args)
+    except BrokenProcessPool:
+        size = _discard_pool(pool)
+        if size is None:
+            raise
+        pool = get_executor(size)
+        future = pool.submit(function, *args)
+    future.add_done_callback(functools.partial(_discard_if_broken, pool))
+    return future
+
+
+def _map_shared(
+    workers: Optional[int], function: Callable, *iterables: Iterable, chunksize: int
+) -> List[object]:
+    """Map ``function`` over a shared pool, replacing it if it is broken.
+
+    The iterables are read twice when the pool rejects the first submission.
+    """
+
+    pool = get_executor(workers)
+    try:
+        results = pool.map(function, *iterables, chunksize=chunksize)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = get_executor(workers)
+        results = pool.map(function, *iterables, chunksize=chunksize)
+    try:
+        return list(results)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+
+
+def _run_one(
+    kind: str, index: int, key: str, sql: str, options: Dict[str, object]
+) -> BatchResult:
+    """Run a single analysis or graph build and capture failures."""
+
+    started = time.perf_counter()
+    try:
+        if kind == "graph":
+            result = build_graph(sql, **options)
+        else:
+            result = analyze(sql, **options)
+    except Exception as exc:
+        return BatchResult(
+            index=index,
+            key=key,
+            result=None,
+            error=f"{type(exc).__name__}: {exc}",
+            duration=time.perf_counter() - started,
+        )
+    return BatchResult(
+        index=index,
+        key=key,
+        result=result,
+        error=None,
+        duration=time.perf_counter() - started,
+    )
+
+
+def _run_chunk(
+    kind: str, chunk: List[Tuple[int, str, str]], options: Dict[str, object]
+) -> List[BatchResult]:
+    """Process a chunk of items inside a worker."""
+
+    return [_run_one(kind, index, key, sql, options) for index, key, sql in chunk]
+
+
+def _normalize_items(items: Iterable[BatchItem]) -> Iterator[Tuple[int, str, str]]:
+    """Attach indexes and keys to batch items."""
+
+    for index, item in enumerate(items):
+        if isinstance(item, tuple):
+            key, sql = item
+        else:
+            key, sql = str(index), item
+        yield index, key, sql
+
+
+def _chunks(
+    items: Iterator[Tuple[int, str, str]], chunksize: int
+) -> Iterator[List[Tuple[int, str, str]]]:
+    """Split items into lists of at most ``chunksize`` entries."""
+
+    while True:
+        chunk = list(itertools.islice(items, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_batch(
+    kind: str,
+    items: Iterable[BatchItem],
+    options: Dict[str, object],
+    workers: Optional[int],
+    chunksize: int,
+    ordered: bool,
+    executor: Optional[Executor],
+) -> Iterator[BatchResult]:
+    """Stream batch results, keeping a bounded number of chunks in flight."""
+
+    chunks = _chunks(_normalize_items(items), max(chunksize, 1))
+    if executor is None and workers is not None and workers <= 1:
+        for chunk in chunks:
+            yield from _run_chunk(kind, chunk, options)
+        return
+
+    max_in_flight = 4 * (workers or os.cpu_count() or 1)
+    pending: Deque[_PendingChunk] = deque()
+    for chunk in chunks:
+        # The shared pool is looked up per chunk so a broken one is replaced.
+        pool = executor if executor is not None else get_executor(workers)
+        pending.append((_submit(pool, kind, chunk, options), chunk))
+        if len(pending) >= max_in_flight:
+            yield from _drain(pending, ordered)
+    while pending:
+        yield from _drain(pending, ordered)
+
+
+_PendingChunk = Tuple[Future, List[Tuple[int, str, str]]]
+
+
+def _submit(
+    pool: Executor,
+    kind: str,
+    chunk: List[Tuple[int, str, str]],
+    options: Dict[str, object],
+) -> Future:
+    """Submit a chunk, returning a failed future if the pool rejects it."""
+
+    try:
+        return _submit_job(pool, _run_chunk, kind, chunk, options)
+    except Exception as exc:
+        future: Future = Future()
+        future.set_exception(exc)
+        return future
+
+
+def _drain(pending: Deque[_PendingChunk], ordered: bool) -> Iterator[BatchResult]:
+    """Yield the results of the next finished chunk."""
+
+    if ordered:
+        yield from _chunk_results(*pending.popleft())
+        return
+    done, _not_done = wait(
+        [future for future, _chunk in pending], return_when=FIRST_COMPLETED
+    )
+    for entry in [entry for entry in pending if entry[0] in done]:
+        pending.remove(entry)
+        yield from _chunk_results(*entry)
+
+
+def _chunk_results(
+    future: Future, chunk: List[Tuple[int, str, str]]
+) -> List[BatchResult]:
+    """Return a chunk's results, or one error per item if the chunk failed.
+
+    A chunk fails as a whole when its worker dies or its results cannot be
+    sent back; the exception is reported on every item of the chunk.
+    """
+
+    try:
+        return future.result()
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        return [
+            BatchResult(index=index, key=key, result=None, error=error, duration=0.0)
+            for index, key, _sql in chunk
+        ]
+
+
+def analyze_many(
+    items: Iterable[BatchItem],
+    dialect: str = "clickhouse",
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+    catalog: Optional[CatalogSource] = None,
+) -> Iterator[BatchResult]:
+    """Analyze many SQL texts in parallel and stream the results.
+
+    ``items`` are SQL strings or ``(key, sql)`` pairs. Results are yielded in
+    submission order when ``ordered`` is True, otherwise as chunks complete.
+    Failures are captured per item in ``BatchResult.error``. ``workers=1`` runs
+    in the calling process; otherwise a shared warm process pool is used unless
+    an ``executor`` is given. A ``catalog`` must be picklable; pass a file path
+    so each worker loads it once.
+    """
+
+    options: Dict[str, object] = {"dialect": normalize_dialect(dialect)}
+    if catalog is not None:
+        options["catalog"] = catalog
+    return _run_batch("analysis", items, options, workers, chunksize, ordered, executor)
+
+
+def build_graphs_many(
+    items: Iterable[BatchItem],
+    dialect: str = "clickhouse",
+    mode: str = "full",
+    include_timestamp: bool = True,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+    catalog: Optional[CatalogSource] = None,
+) -> Iterator[BatchResult]:
+    """Build lineage graphs for many SQL texts in parallel.
+
+    Accepts the same batching options as ``analyze_many``.
+    """
+
+    options: Dict[str, object] = {
+        "dialect": normalize_dialect(dialect),
+        "mode": mode,
+        "include_timestamp": include_timestamp,
+    }
+    if catalog is not None:
+        options["catalog"] = catalog
+    return _run_batch("graph", items, options, workers, chunksize, ordered, executor)
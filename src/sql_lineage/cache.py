@@ -0,0 +1,242 @@
+"""Content-addressed caching of analysis and graph results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Protocol, Tuple
+
+from sql_lineage.version import __version__
+
+
+class CacheBackend(Protocol):
+    """Storage backend for serialized cache entries."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored payload for a key, if present."""
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a payload for a key, evicting entries as needed."""
+
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+
+
+class MemoryCacheBackend:
+    """In-memory LRU backend bounded by entry count and payload bytes."""
+
+    def __init__(
+        self, max_entries: int = 4096, max_bytes: Optional[int] = 256 * 1024 * 1024
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored payload for a key and mark it recently used."""
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a payload and evict least recently used entries."""
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+            if self.max_bytes is not None and len(value) > self.max_bytes:
+                return
+            self._entries[key] = value
+            self.total_bytes += len(value)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _key, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk LRU backend stored in a SQLite database file."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        max_bytes: Optional[int] = 2 * 1024 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+        )
+        self._connection.commit()
+        row = self._connection.execute("SELECT MAX(accessed) FROM entries").fetchone()
+        self._clock = row[0] or 0
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored payload for a key and mark it recently used."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (self._tick(), key)
+            )
+            self._connection.commit()
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a payload and evict least recently used entries."""
+
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), self._tick()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until both bounds hold."""
+
+        count, total = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        while count > self.max_entries or (
+            self.max_bytes is not None and total > self.max_bytes
+        ):
+            row = self._connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            count -= 1
+            total -= row[1]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[
+                0
+            ]
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize line endings for hashing.
+
+    Only line endings are rewritten: any other whitespace may sit inside a
+    string literal, where changing it would change the result.
+    """
+
+    return sql.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class AnalysisCache:
+    """Cache of analysis and graph results keyed by SQL content.
+
+    Keys combine a hash of the normalized SQL with the dialect, graph mode,
+    analysis options and library version, so upgrading the library never
+    serves stale results.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None) -> None:
+        self.backend: CacheBackend = (
+            backend if backend is not None else MemoryCacheBackend()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        kind: str,
+        sql: str,
+        dialect: str,
+        mode: str = "",
+        options: Tuple[Tuple[str, object], ...] = (),
+    ) -> str:
+        """Build the content-addressed key for a cached result."""
+
+        digest = hashlib.sha256()
+        for part in (__version__, kind, dialect, mode, repr(sorted(options))):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(normalize_sql(sql).encode("utf-8"))
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, object]]:
+        """Return a cached result, counting the lookup as a hit or miss."""
+
+        payload = self.backend.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(payload)
+
+    def store(self, key: str, value: Dict[str, object]) -> None:
+        """Serialize and store a result."""
+
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        self.backend.set(key, payload.encode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of stored entries."""
+
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.backend)}
+
+    def clear(self) -> None:
+        """Drop every entry and reset counters."""
+
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,329 @@
+"""Schema catalogs used to resolve unqualified columns and expand stars."""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+INDEX_MAGIC = b"SQLLCAT1"
+
+_HEADER = struct.Struct("<8sQ")
+_OFFSET = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+
+Columns = Tuple[str, ...]
+_PATH_CATALOG_LIMIT = 32
+_PATH_CATALOGS: "OrderedDict[str, Tuple[str, SchemaCatalog]]" = OrderedDict()
+_PATH_CATALOGS_LOCK = threading.Lock()
+CatalogSource = Union[
+    "SchemaCatalog",
+    Mapping[str, object],
+    str,
+    os.PathLike,
+    Callable[[str], Optional[Iterable[str]]],
+]
+
+
+class SchemaCatalog(abc.ABC):
+    """Base class mapping full table names to their ordered column names.
+
+    Subclasses implement ``_lookup``. Results, including misses, are cached per
+    table so repeated resolution against the same catalog stays a dict lookup.
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, Optional[Columns]] = {}
+        self._column_sets: Dict[str, frozenset] = {}
+
+    @abc.abstractmethod
+    def _lookup(self, table: str) -> Optional[Iterable[str]]:
+        """Return the columns of a table, or None if it is unknown."""
+
+    def columns(self, table: str) -> Optional[Columns]:
+        """Return the ordered column names of a table, or None if unknown."""
+
+        try:
+            return self._columns[table]
+        except KeyError:
+            found = self._lookup(table)
+            columns = tuple(found) if found is not None else None
+            self._columns[table] = columns
+            return columns
+
+    def has_column(self, table: str, column: str) -> Optional[bool]:
+        """Return whether a table has a column, or None if the table is unknown."""
+
+        column_set = self._column_sets.get(table)
+        if column_set is None:
+            columns = self.columns(table)
+            if columns is None:
+                return None
+            column_set = frozenset(columns)
+            self._column_sets[table] = column_set
+        return column in column_set
+
+    def fingerprint(self) -> Optional[str]:
+        """Return a stable content identifier, or None if results are uncacheable."""
+
+        return None
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = dict(self.__dict__)
+        state["_columns"] = {}
+        state["_column_sets"] = {}
+        return state
+
+
+class DictCatalog(SchemaCatalog):
+    """Catalog backed by an in-memory mapping.
+
+    Accepts ``{"db.table": ["col", ...]}``, nested ``{"db": {"table": [...]}}``
+    mappings, and column mappings such as ``{"db.table": {"col": "type"}}``.
+    """
+
+    def __init__(self, tables: Mapping[str, object]) -> None:
+        super().__init__()
+        self.tables: Dict[str, Columns] = _flatten_tables(tables)
+
+    def _lookup(self, table: str) -> Optional[Iterable[str]]:
+        return self.tables.get(table)
+
+    def fingerprint(self) -> Optional[str]:
+        payload = json.dumps(sorted(self.tables.items()), ensure_ascii=False)
+        return "dict:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CallableCatalog(SchemaCatalog):
+    """Catalog that asks a provider callable for the columns of each table."""
+
+    def __init__(self, provider: Callable[[str], Optional[Iterable[str]]]) -> None:
+        super().__init__()
+        self.provider = provider
+
+    def _lookup(self, table: str) -> Optional[Iterable[str]]:
+        return self.provider(table)
+
+
+class FileCatalog(SchemaCatalog):
+    """Catalog read from a JSON or YAML file on first lookup."""
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self._tables: Optional[Dict[str, Columns]] = None
+
+    def _load(self) -> Dict[str, Columns]:
+        if self._tables is None:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                if self.path.endswith((".yaml", ".yml")):
+                    try:
+                        import yaml
+                    except ImportError as exc:
+                        raise ImportError(
+                            "PyYAML is required to load YAML catalogs"
+                        ) from exc
+                    data = yaml.safe_load(handle) or {}
+                else:
+                    data = json.load(handle)
+            self._tables = _flatten_tables(data)
+        return self._tables
+
+    def _lookup(self, table: str) -> Optional[Iterable[str]]:
+        return self._load().get(table)
+
+    def fingerprint(self) -> Optional[str]:
+        return _file_fingerprint(self.path)
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = super().__getstate__()
+        state["_tables"] = None
+        return state
+
+
+class IndexedCatalog(SchemaCatalog):
+    """Catalog read from a memory-mapped index written by ``write_catalog_index``.
+
+    The file is opened on first lookup and tables are found by binary search
+    over a sorted offset table, so only the pages touched by lookups are read.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self._handle = None
+        self._map: Optional[mmap.mmap] = None
+        self._count = 0
+
+    def _open(self) -> mmap.mmap:
+        if self._map is None:
+            handle = open(self.path, "rb")
+            try:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                handle.close()
+                raise ValueError(f"Empty catalog index: {self.path}")
+            magic, count = _HEADER.unpack_from(mapped, 0)
+            if magic != INDEX_MAGIC:
+                mapped.close()
+                handle.close()
+                raise ValueError(f"Not a catalog index: {self.path}")
+            self._handle = handle
+            self._map = mapped
+            self._count = count
+        return self._map
+
+    def _record(self, mapped: mmap.mmap, position: int) -> Tuple[bytes, int]:
+        """Return the key of the record at ``position`` and its payload offset."""
+
+        (offset,) = _OFFSET.unpack_from(mapped, _HEADER.size + position * _OFFSET.size)
+        (length,) = _LENGTH.unpack_from(mapped, offset)
+        start = offset + _LENGTH.size
+        return mapped[start : start + length], start + length
+
+    def _lookup(self, table: str) -> Optional[Iterable[str]]:
+        mapped = self._open()
+        key = table.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            current, payload = self._record(mapped, middle)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                (length,) = _LENGTH.unpack_from(mapped, payload)
+                start = payload + _LENGTH.size
+                text = mapped[start : start + length].decode("utf-8")
+                return text.split("\n") if text else []
+        return None
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def fingerprint(self) -> Optional[str]:
+        return _file_fingerprint(self.path)
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = super().__getstate__()
+        state["_handle"] = None
+        state["_map"] = None
+        state["_count"] = 0
+        return state
+
+
+def write_catalog_index(
+    source: Union[Mapping[str, object], str, os.PathLike],
+    path: Union[str, os.PathLike],
+) -> int:
+    """Write a catalog mapping or JSON/YAML file to a binary index file.
+
+    Returns the number of tables written.
+    """
+
+    if isinstance(source, Mapping):
+        tables = _flatten_tables(source)
+    else:
+        tables = FileCatalog(source)._load()
+    entries = sorted(
+        (name.encode("utf-8"), "\n".join(columns).encode("utf-8"))
+        for name, columns in tables.items()
+    )
+    with open(path, "wb") as handle:
+        handle.write(_HEADER.pack(INDEX_MAGIC, len(entries)))
+        offset = _HEADER.size + len(entries) * _OFFSET.size
+        for key, payload in entries:
+            handle.write(_OFFSET.pack(offset))
+            offset += 2 * _LENGTH.size + len(key) + len(payload)
+        for key, payload in entries:
+            handle.write(_LENGTH.pack(len(key)))
+            handle.write(key)
+            handle.write(_LENGTH.pack(len(payload)))
+            handle.write(payload)
+    return len(entries)
+
+
+def load_catalog(source: Optional[CatalogSource]) -> Optional[SchemaCatalog]:
+    """Return a schema catalog for a mapping, file path, callable or catalog.
+
+    Catalogs loaded from paths are shared per process until the file changes,
+    so batch workers read each catalog file once. The most recently used
+    paths are kept. A replaced or evicted catalog is only dropped from the
+    cache, since an analysis on another thread may still hold it; an index
+    catalog releases its memory map once it is garbage collected.
+    """
+
+    if source is None or isinstance(source, SchemaCatalog):
+        return source
+    if isinstance(source, Mapping):
+        return DictCatalog(source)
+    if isinstance(source, (str, os.PathLike)):
+        path = os.path.abspath(os.fspath(source))
+        fingerprint = _file_fingerprint(path)
+        with _PATH_CATALOGS_LOCK:
+            cached = _PATH_CATALOGS.get(path)
+            if cached is not None and cached[0] == fingerprint:
+                _PATH_CATALOGS.move_to_end(path)
+                return cached[1]
+            with open(path, "rb") as handle:
+                is_index = handle.read(len(INDEX_MAGIC)) == INDEX_MAGIC
+            catalog = IndexedCatalog(path) if is_index else FileCatalog(path)
+            _PATH_CATALOGS[path] = (fingerprint, catalog)
+            _PATH_CATALOGS.move_to_end(path)
+            while len(_PATH_CATALOGS) > _PATH_CATALOG_LIMIT:
+                _PATH_CATALOGS.popitem(last=False)
+        return catalog
+    if callable(source):
+        return CallableCatalog(source)
+    raise TypeError(f"Unsupported catalog source: {type(source).__name__}")
+
+
+def _flatten_tables(data: Mapping[str, object]) -> Dict[str, Columns]:
+    """Flatten nested catalog mappings into ``{"db.table": columns}``."""
+
+    tables: Dict[str, Columns] = {}
+    for name, value in data.items():
+        if (
+            isinstance(value, Mapping)
+            and value
+            and all(isinstance(item, (list, tuple, Mapping)) for item in value.values())
+        ):
+            for table, columns in value.items():
+                tables[f"{name}.{table}"] = _column_names(columns)
+        else:
+            tables[str(name)] = _column_names(value)
+    return tables
+
+
+def _column_names(value: object) -> Columns:
+    """Return column names from a list of names or a name-to-type mapping."""
+
+    if isinstance(value, Mapping):
+        return tuple(str(name) for name in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(str(name) for name in value)
+    raise TypeError(f"Unsupported catalog column list: {value!r}")
+
+
+def _file_fingerprint(path: str) -> str:
+    """Identify a catalog file by path, size and modification time."""
+
+    stat = os.stat(path)
+    return f"file:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
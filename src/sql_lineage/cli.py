@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import json
 import sys
-from typing import Sequence
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Sequence, TextIO, Tuple
 
-from sql_lineage.analyzer import to_json
+from sql_lineage.catalog import write_catalog_index
 from sql_lineage.exporters import export_graph
-from sql_lineage.graph import build_graph
+
+# Analysis modules import sqlglot, so they are imported by the commands that
+# need them and ``--help`` or argument errors stay fast.
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -19,16 +23,93 @@ def _build_parser() -> argparse.ArgumentParser:
     analyze_parser.add_argument("--sql", help="SQL string to analyze")
     analyze_parser.add_argument("--file", help="Path to SQL file")
     analyze_parser.add_argument("--dialect", default="clickhouse", help="SQL dialect")
+    analyze_parser.add_argument(
+        "--catalog", help="Schema catalog: JSON/YAML file or binary catalog index"
+    )
+    analyze_parser.add_argument(
+        "--compact", action="store_true", help="Write JSON without whitespace"
+    )
+    analyze_parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one JSON line per statement with bounded memory",
+    )
+    analyze_parser.add_argument(
+        "--dir", help="Analyze every file under a directory (NDJSON output)"
+    )
+    analyze_parser.add_argument(
+        "--glob", default="**/*.sql", help="File pattern used with --dir"
+    )
+    analyze_parser.add_argument(
+        "--stdin-ndjson",
+        action="store_true",
+        help='Read {"path": ..., "sql": ...} objects from stdin, one per line',
+    )
+    analyze_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for batch modes (0 = CPU count, 1 = in-process)",
+    )
+    analyze_parser.add_argument(
+        "--chunksize", type=int, default=1, help="Items sent to a worker at once"
+    )
+    analyze_parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Emit batch results in input order instead of completion order",
+    )
 
     graph_parser = subparsers.add_parser("graph", help="Build lineage graph")
     graph_parser.add_argument("--sql", help="SQL string to analyze")
     graph_parser.add_argument("--file", help="Path to SQL file")
     graph_parser.add_argument("--dialect", default="clickhouse", help="SQL dialect")
     graph_parser.add_argument("--mode", default="full", help="Graph mode")
+    graph_parser.add_argument(
+        "--catalog", help="Schema catalog: JSON/YAML file or binary catalog index"
+    )
     graph_parser.add_argument(
         "--format",
         default="json",
-        help="Export format: json, mermaid_flowchart, mermaid_er, graphviz_dot",
+        help=(
+            "Export format: json, ndjson, mermaid_flowchart, mermaid_er, "
+            "graphviz_dot"
+        ),
+    )
+    graph_parser.add_argument(
+        "--compact", action="store_true", help="Write JSON without whitespace"
+    )
+
+    catalog_parser = subparsers.add_parser(
+        "catalog", help="Build a binary schema catalog index"
+    )
+    catalog_parser.add_argument("source", help="JSON or YAML schema catalog")
+    catalog_parser.add_argument("output", help="Path of the index file to write")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a JSON-RPC lineage server with warm workers"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port")
+    serve_parser.add_argument("--socket", help="Listen on a Unix socket instead")
+    serve_parser.add_argument(
+        "--workers", type=int, default=0, help="Worker processes (0 = CPU count)"
+    )
+    serve_parser.add_argument(
+        "--max-queue", type=int, default=64, help="Requests allowed to wait"
+    )
+    serve_parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Per-request timeout in seconds"
+    )
+    serve_parser.add_argument(
+        "--cache-entries",
+        type=int,
+        default=4096,
+        help="Results kept in the in-memory cache (0 disables caching)",
+    )
+    serve_parser.add_argument(
+        "--catalog",
+        help="Schema catalog for requests without an inline catalog object",
     )
     return parser
 
@@ -39,22 +120,182 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
 
+    if args.command == "analyze" and (args.dir or args.stdin_ndjson):
+        return _run_batch(args, parser)
+    if args.command == "analyze" and args.ndjson:
+        return _stream_statements(args, parser)
     if args.command == "analyze":
+        from sql_lineage.analyzer import analyze_typed
+        from sql_lineage.serialization import dump_analysis
+
         sql = _read_sql(args.sql, args.file, parser)
-        sys.stdout.write(to_json(sql, dialect=args.dialect))
+        analysis = analyze_typed(sql, dialect=args.dialect, catalog=args.catalog)
+        dump_analysis(sys.stdout, analysis, style=_json_style(args))
         sys.stdout.write("\n")
         return 0
     if args.command == "graph":
+        from sql_lineage.graph import build_graph
+
         sql = _read_sql(args.sql, args.file, parser)
-        graph = build_graph(sql, dialect=args.dialect, mode=args.mode)
+        graph = build_graph(
+            sql, dialect=args.dialect, mode=args.mode, catalog=args.catalog
+        )
+        if args.format.lower() in {"json", "ndjson"}:
+            from sql_lineage.serialization import dump_graph
+
+            style = "ndjson" if args.format.lower() == "ndjson" else _json_style(args)
+            dump_graph(sys.stdout, graph, style=style)
+            if style != "ndjson":
+                sys.stdout.write("\n")
+            return 0
         sys.stdout.write(export_graph(graph, format=args.format))
         sys.stdout.write("\n")
         return 0
+    if args.command == "serve":
+        return _serve(args)
+    if args.command == "catalog":
+        count = write_catalog_index(args.source, args.output)
+        sys.stdout.write(f"Wrote {count} tables to {args.output}\n")
+        return 0
 
     parser.print_help()
     return 2
 
 
+def _json_style(args: argparse.Namespace) -> str:
+    """Return the JSON style selected by ``--compact``."""
+
+    return "compact" if args.compact else "pretty"
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Run the lineage server until interrupted."""
+
+    import asyncio
+
+    from sql_lineage.cache import AnalysisCache, MemoryCacheBackend
+    from sql_lineage.server import serve
+
+    cache = None
+    if args.cache_entries > 0:
+        cache = AnalysisCache(MemoryCacheBackend(max_entries=args.cache_entries))
+    try:
+        asyncio.run(
+            serve(
+                host=args.host,
+                port=args.port,
+                path=args.socket,
+                workers=args.workers or None,
+                max_queue=args.max_queue,
+                timeout=args.timeout,
+                cache=cache,
+                catalog=args.catalog,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _stream_statements(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> int:
+    """Write one JSON line per analyzed statement of a single input."""
+
+    from sql_lineage.analyzer import iter_analyze
+
+    if args.file:
+        source = Path(args.file)
+    elif args.sql:
+        source = args.sql
+    else:
+        parser.error("Provide a SQL string or --file path")
+    for statement in iter_analyze(source, dialect=args.dialect, catalog=args.catalog):
+        sys.stdout.write(json.dumps(statement.to_dict(), ensure_ascii=False))
+        sys.stdout.write("\n")
+    return 0
+
+
+def _run_batch(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Analyze many inputs and write one JSON line per result."""
+
+    from sql_lineage.batch import analyze_many
+
+    failures = 0
+
+    def emit(record: Dict[str, object]) -> None:
+        nonlocal failures
+        if record["error"] is not None:
+            failures += 1
+        sys.stdout.write(json.dumps(record, ensure_ascii=False))
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    if args.dir:
+        items = _iter_directory(args.dir, args.glob, emit)
+    elif args.stdin_ndjson:
+        items = _iter_ndjson(sys.stdin, emit)
+    else:
+        parser.error("Provide --dir or --stdin-ndjson")
+    results = analyze_many(
+        items,
+        dialect=args.dialect,
+        workers=args.jobs or None,
+        chunksize=args.chunksize,
+        ordered=args.ordered,
+        catalog=args.catalog,
+    )
+    for item in results:
+        emit(
+            {
+                "path": item.key,
+                "duration_ms": round(item.duration * 1000, 3),
+                "error": item.error,
+                "result": item.result,
+            }
+        )
+    return 1 if failures else 0
+
+
+def _failure_record(path: str, error: str) -> Dict[str, object]:
+    """Build an output record for an input that could not be read."""
+
+    return {"path": path, "duration_ms": 0.0, "error": error, "result": None}
+
+
+def _iter_directory(
+    directory: str, pattern: str, emit: Callable[[Dict[str, object]], None]
+) -> Iterator[Tuple[str, str]]:
+    """Yield (path, sql) pairs for files under a directory."""
+
+    for path in sorted(Path(directory).glob(pattern)):
+        if not path.is_file():
+            continue
+        try:
+            yield str(path), _read_file(str(path))
+        except (OSError, UnicodeDecodeError) as exc:
+            emit(_failure_record(str(path), f"{type(exc).__name__}: {exc}"))
+
+
+def _iter_ndjson(
+    stream: TextIO, emit: Callable[[Dict[str, object]], None]
+) -> Iterator[Tuple[str, str]]:
+    """Yield (path, sql) pairs from NDJSON lines on a text stream."""
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        key = f"<stdin>:{line_number}"
+        try:
+            payload = json.loads(line)
+            key = str(payload.get("path") or payload.get("key") or key)
+            sql = payload["sql"]
+        except (ValueError, KeyError, AttributeError) as exc:
+            emit(_failure_record(key, f"Invalid input line: {exc}"))
+            continue
+        yield key, sql
+
+
 def _read_file(path: str) -> str:
     """Read SQL from a file path."""
 
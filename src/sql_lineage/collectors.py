@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlglot import exp
 
+from sql_lineage.context import AnalysisMemo
+from sql_lineage.models import QueryAnalysis
 
-def collect_joins(select: exp.Select, dialect: str) -> List[Dict[str, object]]:
+
+def collect_joins(
+    select: exp.Select,
+    dialect: str,
+    join_nodes: Optional[Iterable[exp.Join]] = None,
+) -> List[Dict[str, object]]:
     """Collect join metadata from a Select expression."""
 
+    if join_nodes is None:
+        join_nodes = select.args.get("joins", []) or []
     joins: List[Dict[str, object]] = []
-    for join in select.args.get("joins", []) or []:
+    for join in join_nodes:
         right = join.this
         right_entry: Optional[Dict[str, str]] = None
         if isinstance(right, exp.Table):
@@ -43,14 +52,19 @@ def collect_joins(select: exp.Select, dialect: str) -> List[Dict[str, object]]:
 
 
 def collect_subqueries(
-    expression: exp.Expression, dialect: str
-) -> List[Dict[str, object]]:
+    expression: exp.Expression,
+    dialect: str,
+    memo: Optional[AnalysisMemo] = None,
+    subquery_nodes: Optional[Iterable[exp.Subquery]] = None,
+) -> List[QueryAnalysis]:
     """Collect subquery analyses from an expression."""
 
     from sql_lineage.analyzer import analyze_expression
 
-    subqueries: List[Dict[str, object]] = []
-    for subquery in expression.find_all(exp.Subquery):
+    if subquery_nodes is None:
+        subquery_nodes = expression.find_all(exp.Subquery)
+    subqueries: List[QueryAnalysis] = []
+    for subquery in subquery_nodes:
         if isinstance(subquery.this, exp.Select):
-            subqueries.append(analyze_expression(subquery.this, dialect))
+            subqueries.append(analyze_expression(subquery.this, dialect, memo=memo))
     return subqueries
@@ -0,0 +1,468 @@
+"""Columnar storage of analysis results for very large estates."""
+
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from sql_lineage.analyzer import iter_analyze
+from sql_lineage.catalog import CatalogSource
+from sql_lineage.context import DEFAULT_MAX_LINEAGE_DEPTH
+from sql_lineage.dialects import is_supported_dialect, normalize_dialect
+from sql_lineage.models import (
+    AnalysisResult,
+    ColumnRef,
+    Dependency,
+    LineageData,
+    LineageMapping,
+    OutputColumn,
+    QueryAnalysis,
+    StatementAnalysis,
+)
+
+NONE_ID = -1
+
+UNION_QUERY = 0
+SUBQUERY = 1
+
+_Note = Tuple[Tuple[str, str], ...]
+
+
+class StringTable:
+    """Bidirectional mapping between strings and dense integer ids."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the id of a string, adding it on first use."""
+
+        if value is None:
+            return NONE_ID
+        found = self._ids.get(value)
+        if found is None:
+            found = len(self.strings)
+            self._ids[value] = found
+            self.strings.append(value)
+        return found
+
+    def lookup(self, string_id: int) -> Optional[str]:
+        """Return the string for an id."""
+
+        return None if string_id == NONE_ID else self.strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class ColumnarResult:
+    """Analysis result stored as parallel integer arrays.
+
+    Every output column of every statement is one row. Names, expressions,
+    table and column references, functions and literals are ids into a shared
+    ``StringTable``; variable-length lists are stored as offset arrays into flat
+    value arrays. Statement targets, sources and joins are deduplicated records
+    referenced by id, and notes are deduplicated the same way. Nested union and
+    subquery results are rows of a query table holding their kind, the id of
+    their parent query (``NONE_ID`` for the statement itself) and their own
+    column rows, stored in pre-order after the statement's columns. Statements
+    can be appended one at a time, so results from ``iter_analyze`` never need
+    to exist as model objects all at once. ``to_analysis()`` and ``to_dict()``
+    rebuild the regular representations; record dictionaries are shared between
+    statements and must not be mutated.
+    """
+
+    def __init__(self, dialect: str = "clickhouse") -> None:
+        self.dialect = dialect
+        self.errors: List[str] = []
+        self.strings = StringTable()
+        self._notes: List[_Note] = []
+        self._note_ids: Dict[_Note, int] = {}
+        self._records: List[Dict[str, object]] = []
+        self._record_ids: Dict[str, int] = {}
+        self.statement_indexes = array("q")
+        self.statement_types = array("i")
+        self.statement_targets = array("i")
+        self.statement_source_offsets = array("q", [0])
+        self.statement_sources = array("i")
+        self.statement_join_offsets = array("q", [0])
+        self.statement_joins = array("i")
+        self.statement_error_offsets = array("q", [0])
+        self.statement_errors = array("i")
+        self.statement_offsets = array("q", [0])
+        self.statement_column_ends = array("q")
+        self.statement_query_offsets = array("q", [0])
+        self.query_kinds = array("b")
+        self.query_parents = array("i")
+        self.query_column_starts = array("q")
+        self.query_column_ends = array("q")
+        self.query_source_offsets = array("q", [0])
+        self.query_sources = array("i")
+        self.query_join_offsets = array("q", [0])
+        self.query_joins = array("i")
+        self.names = array("i")
+        self.expressions = array("i")
+        self.lineage_types = array("i")
+        self.reasons = array("i")
+        self.input_offsets = array("q", [0])
+        self.input_tables = array("i")
+        self.input_columns = array("i")
+        self.function_offsets = array("q", [0])
+        self.functions = array("i")
+        self.literal_offsets = array("q", [0])
+        self.literals = array("i")
+        self.note_offsets = array("q", [0])
+        self.notes = array("i")
+        self.dependency_offsets = array("q", [0])
+        self.dependency_tables = array("i")
+        self.dependency_column_offsets = array("q", [0])
+        self.dependency_columns = array("i")
+
+    @classmethod
+    def from_analysis(cls, analysis: AnalysisResult) -> ColumnarResult:
+        """Convert a typed analysis result."""
+
+        result = cls(analysis.dialect)
+        result.errors = list(analysis.errors)
+        result.extend(analysis.statements)
+        return result
+
+    def extend(self, statements: Iterable[StatementAnalysis]) -> None:
+        """Append statements in order."""
+
+        for statement in statements:
+            self.append(statement)
+
+    def append(self, statement: StatementAnalysis) -> None:
+        """Append one statement and its output columns."""
+
+        strings = self.strings
+        self.statement_indexes.append(statement.index)
+        self.statement_types.append(strings.intern(statement.statement_type))
+        self.statement_targets.append(
+            self._record_id(statement.target) if statement.target else NONE_ID
+        )
+        self.statement_sources.extend(
+            self._record_id(source) for source in statement.sources
+        )
+        self.statement_source_offsets.append(len(self.statement_sources))
+        self.statement_joins.extend(self._record_id(join) for join in statement.joins)
+        self.statement_join_offsets.append(len(self.statement_joins))
+        self.statement_errors.extend(
+            strings.intern(error) for error in statement.errors
+        )
+        self.statement_error_offsets.append(len(self.statement_errors))
+        for column in statement.output_columns:
+            self._append_column(column)
+        self.statement_column_ends.append(len(self.names))
+        self._append_queries(statement.unions, statement.subqueries, NONE_ID)
+        self.statement_query_offsets.append(len(self.query_kinds))
+        self.statement_offsets.append(len(self.names))
+
+    def _append_queries(
+        self,
+        unions: List[QueryAnalysis],
+        subqueries: List[QueryAnalysis],
+        parent: int,
+    ) -> None:
+        nested = [(UNION_QUERY, query) for query in unions]
+        nested.extend((SUBQUERY, query) for query in subqueries)
+        for kind, query in nested:
+            query_id = len(self.query_kinds)
+            self.query_kinds.append(kind)
+            self.query_parents.append(parent)
+            self.query_sources.extend(
+                self._record_id(source) for source in query.sources
+            )
+            self.query_source_offsets.append(len(self.query_sources))
+            self.query_joins.extend(self._record_id(join) for join in query.joins)
+            self.query_join_offsets.append(len(self.query_joins))
+            self.query_column_starts.append(len(self.names))
+            for column in query.output_columns:
+                self._append_column(column)
+            self.query_column_ends.append(len(self.names))
+            self._append_queries(query.unions, query.subqueries, query_id)
+
+    def _append_column(self, column: OutputColumn) -> None:
+        strings = self.strings
+        lineage = column.lineage
+        self.names.append(strings.intern(column.name))
+        self.expressions.append(strings.intern(column.expression))
+        self.lineage_types.append(strings.intern(lineage.lineage_type))
+        reason = lineage.mapping[0].reason if lineage.mapping else None
+        self.reasons.append(strings.intern(reason))
+        for ref in lineage.inputs:
+            self.input_tables.append(strings.intern(ref.table))
+            self.input_columns.append(strings.intern(ref.column))
+        self.input_offsets.append(len(self.input_columns))
+        self.functions.extend(strings.intern(name) for name in lineage.functions)
+        self.function_offsets.append(len(self.functions))
+        self.literals.extend(strings.intern(value) for value in lineage.literals)
+        self.literal_offsets.append(len(self.literals))
+        self.notes.extend(self._note_id(note) for note in lineage.notes)
+        self.note_offsets.append(len(self.notes))
+        for dependency in column.dependencies:
+            self.dependency_tables.append(strings.intern(dependency.table))
+            self.dependency_columns.extend(
+                strings.intern(name) for name in dependency.columns
+            )
+            self.dependency_column_offsets.append(len(self.dependency_columns))
+        self.dependency_offsets.append(len(self.dependency_tables))
+
+    def _note_id(self, note: Dict[str, str]) -> int:
+        key = tuple(note.items())
+        found = self._note_ids.get(key)
+        if found is None:
+            found = len(self._notes)
+            self._note_ids[key] = found
+            self._notes.append(key)
+        return found
+
+    def _record_id(self, record: Dict[str, object]) -> int:
+        key = json.dumps(record, ensure_ascii=False, default=str)
+        found = self._record_ids.get(key)
+        if found is None:
+            found = len(self._records)
+            self._record_ids[key] = found
+            self._records.append(record)
+        return found
+
+    def __len__(self) -> int:
+        """Return the number of column rows, including those of nested queries."""
+
+        return len(self.names)
+
+    @property
+    def statement_count(self) -> int:
+        """Return the number of stored statements."""
+
+        return len(self.statement_indexes)
+
+    def statement_columns(self, position: int) -> range:
+        """Return the column rows of the statement at ``position``."""
+
+        return range(
+            self.statement_offsets[position], self.statement_column_ends[position]
+        )
+
+    def column_name(self, row: int) -> str:
+        """Return the output name of a column row."""
+
+        return self.strings.strings[self.names[row]]
+
+    def column_inputs(self, row: int) -> List[ColumnRef]:
+        """Return the input references of a column row."""
+
+        lookup = self.strings.lookup
+        return [
+            ColumnRef(
+                table=lookup(self.input_tables[item]),
+                column=self.strings.strings[self.input_columns[item]],
+            )
+            for item in range(self.input_offsets[row], self.input_offsets[row + 1])
+        ]
+
+    def output_column(self, row: int) -> OutputColumn:
+        """Rebuild the ``OutputColumn`` model of a column row."""
+
+        strings = self.strings.strings
+        name = strings[self.names[row]]
+        inputs = self.column_inputs(row)
+        reason = self.strings.lookup(self.reasons[row])
+        mapping = []
+        if reason is not None:
+            mapping.append(
+                LineageMapping(
+                    output_column=name,
+                    sources=[item for item in inputs if item.table is not None],
+                    reason=reason,
+                )
+            )
+        dependencies: List[Dependency] = []
+        for item in range(
+            self.dependency_offsets[row], self.dependency_offsets[row + 1]
+        ):
+            start = self.dependency_column_offsets[item]
+            end = self.dependency_column_offsets[item + 1]
+            dependencies.append(
+                Dependency(
+                    table=strings[self.dependency_tables[item]],
+                    columns=[
+                        strings[value] for value in self.dependency_columns[start:end]
+                    ],
+                )
+            )
+        return OutputColumn(
+            name=name,
+            expression=strings[self.expressions[row]],
+            lineage=LineageData(
+                lineage_type=strings[self.lineage_types[row]],
+                inputs=inputs,
+                mapping=mapping,
+                functions=self._slice(self.functions, self.function_offsets, row),
+                literals=self._slice(self.literals, self.literal_offsets, row),
+                notes=[
+                    dict(self._notes[note])
+                    for note in self.notes[
+                        self.note_offsets[row] : self.note_offsets[row + 1]
+                    ]
+                ],
+            ),
+            dependencies=dependencies,
+        )
+
+    def _range(self, values: array, offsets: array, row: int) -> array:
+        return values[offsets[row] : offsets[row + 1]]
+
+    def _slice(self, values: array, offsets: array, row: int) -> List[str]:
+        strings = self.strings.strings
+        return [strings[value] for value in self._range(values, offsets, row)]
+
+    def statement(self, position: int) -> StatementAnalysis:
+        """Rebuild the ``StatementAnalysis`` stored at ``position``."""
+
+        strings = self.strings.strings
+        records = self._records
+        target = self.statement_targets[position]
+        unions, subqueries = self._queries(position)
+        return StatementAnalysis(
+            index=self.statement_indexes[position],
+            statement_type=strings[self.statement_types[position]],
+            target=records[target] if target != NONE_ID else None,
+            output_columns=[
+                self.output_column(row) for row in self.statement_columns(position)
+            ],
+            sources=[
+                records[item]
+                for item in self._range(
+                    self.statement_sources, self.statement_source_offsets, position
+                )
+            ],
+            joins=[
+                records[item]
+                for item in self._range(
+                    self.statement_joins, self.statement_join_offsets, position
+                )
+            ],
+            unions=unions,
+            subqueries=subqueries,
+            errors=self._slice(
+                self.statement_errors, self.statement_error_offsets, position
+            ),
+        )
+
+    def _queries(
+        self, position: int
+    ) -> Tuple[List[QueryAnalysis], List[QueryAnalysis]]:
+        """Rebuild the nested unions and subqueries of a statement."""
+
+        first = self.statement_query_offsets[position]
+        last = self.statement_query_offsets[position + 1]
+        records = self._records
+        # Children always follow their parent, so building in reverse order
+        # finishes every child before the query that contains it.
+        children: Dict[int, Tuple[List[QueryAnalysis], List[QueryAnalysis]]] = {
+            NONE_ID: ([], [])
+        }
+        for query_id in range(last - 1, first - 1, -1):
+            unions, subqueries = children.pop(query_id, ([], []))
+            unions.reverse()
+            subqueries.reverse()
+            query = QueryAnalysis(
+                sources=[
+                    records[item]
+                    for item in self._range(
+                        self.query_sources, self.query_source_offsets, query_id
+                    )
+                ],
+                output_columns=[
+                    self.output_column(row)
+                    for row in range(
+                        self.query_column_starts[query_id],
+                        self.query_column_ends[query_id],
+                    )
+                ],
+                joins=[
+                    records[item]
+                    for item in self._range(
+                        self.query_joins, self.query_join_offsets, query_id
+                    )
+                ],
+                unions=unions,
+                subqueries=subqueries,
+            )
+            parent = children.setdefault(self.query_parents[query_id], ([], []))
+            parent[self.query_kinds[query_id]].append(query)
+        unions, subqueries = children[NONE_ID]
+        unions.reverse()
+        subqueries.reverse()
+        return unions, subqueries
+
+    def iter_statements(self) -> Iterator[StatementAnalysis]:
+        """Rebuild statements one at a time."""
+
+        for position in range(self.statement_count):
+            yield self.statement(position)
+
+    def to_analysis(self) -> AnalysisResult:
+        """Rebuild the full typed analysis result."""
+
+        return AnalysisResult(
+            dialect=self.dialect,
+            statements=list(self.iter_statements()),
+            errors=self.errors,
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize to the ``analyze`` dictionary format."""
+
+        return {
+            "dialect": self.dialect,
+            "statements": [statement.to_dict() for statement in self.iter_statements()],
+            "errors": self.errors,
+        }
+
+    def array_bytes(self) -> int:
+        """Return the number of bytes held by the integer arrays."""
+
+        return sum(
+            value.itemsize * len(value)
+            for value in vars(self).values()
+            if isinstance(value, array)
+        )
+
+
+def to_columnar(analysis: AnalysisResult) -> ColumnarResult:
+    """Convert a typed analysis result to columnar form."""
+
+    return ColumnarResult.from_analysis(analysis)
+
+
+def analyze_columnar(
+    source: Union[str, os.PathLike, TextIO],
+    dialect: str = "clickhouse",
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+    catalog: Optional[CatalogSource] = None,
+) -> ColumnarResult:
+    """Analyze a script straight into columnar form.
+
+    Statements are streamed through ``iter_analyze`` and appended one at a
+    time, so the model objects of the whole script never exist at once.
+    """
+
+    normalized_dialect = normalize_dialect(dialect)
+    result = ColumnarResult(normalized_dialect)
+    if not is_supported_dialect(normalized_dialect):
+        result.errors.append(f"Unsupported dialect: {dialect}")
+    result.extend(
+        iter_analyze(
+            source,
+            normalized_dialect,
+            max_lineage_depth=max_lineage_depth,
+            catalog=catalog,
+        )
+    )
+    return result
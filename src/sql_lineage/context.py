@@ -7,7 +7,12 @@ from typing import Dict, List, Optional, Tuple
 
 from sqlglot import exp
 
-from sql_lineage.models import ColumnRef
+from sql_lineage.catalog import SchemaCatalog
+from sql_lineage.dialects import normalize_name
+from sql_lineage.models import ColumnRef, QueryAnalysis
+from sql_lineage.profiling import Tracer
+
+DEFAULT_MAX_LINEAGE_DEPTH = 64
 
 
 @dataclass
@@ -26,32 +31,82 @@ class SourceInfo:
         return self.alias or self.name
 
 
-@dataclass
+@dataclass(frozen=True)
 class AnalysisContext:
-    """Analysis context holding sources and derived lineage mappings."""
+    """Analysis context holding sources and derived lineage mappings.
+
+    Fields cannot be reassigned: source and identifier lists are stored as
+    tuples, and the identifier index, the unqualified-column candidates, the
+    catalog column index and the reported table names are built once on
+    construction. The one exception is ``expansions``, a memo that the lineage
+    builder fills while walking the query: it caches the complete transitive
+    CTE/subquery inputs of each ``(source, column)`` pair with the nesting
+    height of the expansion.
 
-    sources: List[SourceInfo]
-    report_sources: List[SourceInfo]
+    ``relations`` lists the FROM/JOIN relation identifiers that stars expand
+    over through ``source_columns``. With a schema ``catalog``, unqualified
+    columns that match several relations are resolved to the single FROM/JOIN
+    relation that can provide them. Table and column names are looked up in
+    the catalog as written, then normalized like unquoted identifiers of
+    ``dialect``, so ``Core.Users`` finds ``core.users`` under Postgres.
+    """
+
+    sources: Tuple[SourceInfo, ...]
+    report_sources: Tuple[SourceInfo, ...]
     dialect: str
-    active_identifiers: List[str]
+    active_identifiers: Tuple[str, ...]
+    max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH
+    catalog: Optional[SchemaCatalog] = None
+    relations: Tuple[str, ...] = ()
+    expansions: Dict[Tuple[str, str], Tuple[List[ColumnRef], int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _source_index: Dict[str, SourceInfo] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _candidates: List[SourceInfo] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _table_names: List[str] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _column_index: Dict[str, List[SourceInfo]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _open_relations: List[SourceInfo] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        for name in ("sources", "report_sources", "active_identifiers", "relations"):
+            object.__setattr__(self, name, tuple(getattr(self, name)))
+        for source in self.sources + self.report_sources:
+            self._source_index.setdefault(source.identifier(), source)
+        object.__setattr__(self, "_candidates", self._compute_candidate_sources())
+        self._table_names.extend(
+            source.name
+            for source in self.report_sources
+            if source.source_type == "table"
+        )
+        if self.catalog is not None:
+            self._index_relation_columns()
 
     def resolve_source(self, name: str) -> Optional[SourceInfo]:
         """Resolve a source by alias or name."""
 
-        for source in self.sources + self.report_sources:
-            if source.identifier() == name:
-                return source
-        return None
+        return self._source_index.get(name)
 
     def candidate_sources(self) -> List[SourceInfo]:
         """Return sources that can satisfy unqualified columns."""
 
+        return self._candidates
+
+    def _compute_candidate_sources(self) -> List[SourceInfo]:
+        """Compute the candidate sources for unqualified columns."""
+
         # Prefer relations that are active in the current FROM/JOIN scope.
-        scoped = [
-            source
-            for source in self.sources
-            if source.identifier() in set(self.active_identifiers)
-        ]
+        active = set(self.active_identifiers)
+        scoped = [source for source in self.sources if source.identifier() in active]
         if len(scoped) == 1:
             return scoped
 
@@ -62,14 +117,136 @@ class AnalysisContext:
             return non_cte_sources
         return list(scoped or self.sources)
 
-    def resolve_unqualified_column(self) -> Optional[SourceInfo]:
-        """Resolve an unqualified column if there is a single candidate source."""
+    def resolve_unqualified_column(
+        self, column: Optional[str] = None
+    ) -> Optional[SourceInfo]:
+        """Resolve an unqualified column if there is a single candidate source.
 
+        With a catalog, the column first resolves to the only FROM/JOIN relation
+        that is not known to lack it.
+        """
+
+        if self.catalog is not None and column is not None:
+            matches = self._column_index.get(column)
+            if matches is None:
+                matches = self._column_index.get(
+                    normalize_name(column, self.dialect), self._open_relations
+                )
+            if len(matches) == 1:
+                return matches[0]
         candidates = self.candidate_sources()
         if len(candidates) == 1:
             return candidates[0]
         return None
 
+    def _index_relation_columns(self) -> None:
+        """Index the FROM/JOIN relations that have or may have each column.
+
+        Relations with unknown columns may provide any column, so they are the
+        matches of every column that no relation is known to have.
+        """
+
+        relations: List[Tuple[SourceInfo, Optional[set[str]]]] = []
+        for name in self.relations:
+            source = self.resolve_source(name)
+            if source is not None:
+                columns = self.source_columns(source)
+                column_set = set(columns) if columns is not None else None
+                relations.append((source, column_set))
+        known = {
+            column
+            for _, columns in relations
+            if columns is not None
+            for column in columns
+        }
+        for column in known:
+            self._column_index[column] = [
+                source
+                for source, columns in relations
+                if columns is None or column in columns
+            ]
+        self._open_relations.extend(
+            source for source, columns in relations if columns is None
+        )
+
+    def source_columns(self, source: SourceInfo) -> Optional[List[str]]:
+        """Return the ordered output columns of a source, or None if unknown."""
+
+        if source.source_type == "table":
+            if self.catalog is None:
+                return None
+            columns = self.catalog.columns(self._catalog_table(source.name))
+            return list(columns) if columns is not None else None
+        if "*" in source.output_inputs:
+            return None
+        return list(source.output_inputs)
+
+    def source_has_column(self, source: SourceInfo, column: str) -> Optional[bool]:
+        """Return whether a source provides a column, or None if unknown."""
+
+        if source.source_type == "table":
+            if self.catalog is None:
+                return None
+            table = self._catalog_table(source.name)
+            found = self.catalog.has_column(table, column)
+            if found is False:
+                normalized = normalize_name(column, self.dialect)
+                if normalized != column:
+                    found = self.catalog.has_column(table, normalized)
+            return found
+        if column in source.output_inputs:
+            return True
+        return None if "*" in source.output_inputs else False
+
+    def _catalog_table(self, name: str) -> str:
+        """Return the name under which the catalog knows a table."""
+
+        if self.catalog.columns(name) is not None:
+            return name
+        return normalize_name(name, self.dialect)
+
+    def report_table_names(self) -> List[str]:
+        """Return names of reported table sources in report order."""
+
+        return self._table_names
+
+
+class AnalysisMemo:
+    """Per-statement cache of expression analyses keyed by AST node identity."""
+
+    def __init__(
+        self,
+        max_lineage_depth: int = DEFAULT_MAX_LINEAGE_DEPTH,
+        catalog: Optional[SchemaCatalog] = None,
+        tracer: Optional[Tracer] = None,
+        statement: Optional[int] = None,
+    ) -> None:
+        self.max_lineage_depth = max_lineage_depth
+        self.catalog = catalog
+        self.tracer = tracer
+        self.statement = statement
+        # Nodes are kept alive alongside their results so ids are never reused.
+        self._entries: Dict[int, Tuple[exp.Expression, QueryAnalysis]] = {}
+
+    def get(self, expression: exp.Expression) -> Optional[QueryAnalysis]:
+        """Return the cached analysis for an expression, if any."""
+
+        entry = self._entries.get(id(expression))
+        if entry is None or entry[0] is not expression:
+            return None
+        return entry[1]
+
+    def store(
+        self, expression: exp.Expression, analysis: QueryAnalysis
+    ) -> QueryAnalysis:
+        """Cache the analysis for an expression and return it."""
+
+        self._entries[id(expression)] = (expression, analysis)
+        return analysis
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 def build_source_info_from_table(table: exp.Table) -> SourceInfo:
     """Build source info from a table expression."""
@@ -2,60 +2,48 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from sqlglot import exp
 
 from sql_lineage.context import (
     AnalysisContext,
+    AnalysisMemo,
     SourceInfo,
     build_source_info_from_cte,
     build_source_info_from_subquery,
     build_source_info_from_table,
     merge_sources,
 )
-from sql_lineage.models import ColumnRef
+from sql_lineage.models import ColumnRef, QueryAnalysis
+from sql_lineage.scope import SelectScope, build_select_scope
 
 
 def _output_inputs_from_analysis(
-    analysis: Dict[str, object],
+    analysis: QueryAnalysis,
 ) -> Dict[str, List[ColumnRef]]:
-    """Extract output-input mappings from a lineage analysis dictionary."""
+    """Extract output-input mappings from a query analysis."""
 
-    output_inputs: Dict[str, List[ColumnRef]] = {}
-    output = analysis.get("output", {})
-    for column in output.get("columns", []):
-        name = column["name"]
-        lineage_inputs = column["lineage"]["inputs"]
-        output_inputs[name] = [
-            ColumnRef(table=item.get("table"), column=item.get("column"))
-            for item in lineage_inputs
-        ]
-    return output_inputs
+    return {column.name: column.lineage.inputs for column in analysis.output_columns}
 
 
 def _collect_cte_sources(
-    select: exp.Select, dialect: str, analyze_expression
+    ctes: List[exp.CTE], dialect: str, analyze_expression, memo: AnalysisMemo
 ) -> Tuple[List[SourceInfo], List[SourceInfo]]:
     """Collect CTE sources for resolution and reporting."""
 
     sources: List[SourceInfo] = []
     report_sources: List[SourceInfo] = []
     cte_sources: Dict[str, SourceInfo] = {}
-    with_clause = select.args.get("with") or select.args.get("with_")
-    if not isinstance(with_clause, exp.With):
-        return sources, report_sources
-    for cte in with_clause.expressions:
-        if not isinstance(cte, exp.CTE):
-            continue
+    for cte in ctes:
         alias = cte.alias_or_name
-        analysis = analyze_expression(cte.this, dialect)
+        analysis = analyze_expression(cte.this, dialect, memo=memo)
         output_inputs = _output_inputs_from_analysis(analysis)
         cte_source = build_source_info_from_cte(alias, output_inputs)
         sources.append(cte_source)
         report_sources.append(cte_source)
         cte_sources[alias] = cte_source
-        for source in analysis.get("sources", []):
+        for source in analysis.sources:
             if source.get("type") == "table":
                 report_sources.append(
                     SourceInfo(
@@ -69,22 +57,25 @@ def _collect_cte_sources(
 
 
 def _collect_subquery_sources(
-    select: exp.Select, dialect: str, analyze_expression
+    subqueries: List[exp.Subquery],
+    dialect: str,
+    analyze_expression,
+    memo: AnalysisMemo,
 ) -> Tuple[List[SourceInfo], List[SourceInfo]]:
     """Collect subquery sources for resolution and reporting."""
 
     sources: List[SourceInfo] = []
     report_sources: List[SourceInfo] = []
-    for subquery in select.find_all(exp.Subquery):
+    for subquery in subqueries:
         alias = subquery.alias_or_name
         if not alias:
             continue
-        analysis = analyze_expression(subquery.this, dialect)
+        analysis = analyze_expression(subquery.this, dialect, memo=memo)
         output_inputs = _output_inputs_from_analysis(analysis)
         subquery_source = build_source_info_from_subquery(alias, output_inputs)
         sources.append(subquery_source)
         report_sources.append(subquery_source)
-        for source in analysis.get("sources", []):
+        for source in analysis.sources:
             if source.get("type") == "table":
                 report_sources.append(
                     SourceInfo(
@@ -123,18 +114,46 @@ def _collect_immediate_tables(
     return sources
 
 
+def _relation_identifiers(select: exp.Select) -> List[str]:
+    """Return identifiers of the tables and derived tables in FROM/JOIN order."""
+
+    relations: List[exp.Expression] = []
+    from_clause = select.args.get("from") or select.args.get("from_")
+    if isinstance(from_clause, exp.From):
+        relations.append(from_clause.this)
+        relations.extend(getattr(from_clause, "expressions", []) or [])
+    relations.extend(join.this for join in select.args.get("joins", []) or [])
+    identifiers: List[str] = []
+    for relation in relations:
+        if isinstance(relation, exp.Table):
+            identifiers.append(build_source_info_from_table(relation).identifier())
+        elif isinstance(relation, exp.Subquery) and relation.alias_or_name:
+            identifiers.append(relation.alias_or_name)
+    return identifiers
+
+
 def build_context(
-    select: exp.Select, dialect: str, analyze_expression
+    select: exp.Select,
+    dialect: str,
+    analyze_expression,
+    memo: Optional[AnalysisMemo] = None,
+    scope: Optional[SelectScope] = None,
 ) -> AnalysisContext:
     """Build an analysis context for a Select expression."""
 
+    if memo is None:
+        memo = AnalysisMemo()
+    if scope is None:
+        scope = build_select_scope(select)
     sources: List[SourceInfo] = []
     report_sources: List[SourceInfo] = []
-    cte_sources, cte_reports = _collect_cte_sources(select, dialect, analyze_expression)
+    cte_sources, cte_reports = _collect_cte_sources(
+        scope.ctes, dialect, analyze_expression, memo
+    )
     sources.extend(cte_sources)
     report_sources.extend(cte_reports)
     subquery_sources, subquery_reports = _collect_subquery_sources(
-        select, dialect, analyze_expression
+        scope.subqueries, dialect, analyze_expression, memo
     )
     sources.extend(subquery_sources)
     report_sources.extend(subquery_reports)
@@ -151,8 +170,11 @@ def build_context(
             sources.append(table)
             report_sources.append(table)
     return AnalysisContext(
-        sources=merge_sources(sources),
-        report_sources=merge_sources(report_sources),
+        sources=tuple(merge_sources(sources)),
+        report_sources=tuple(merge_sources(report_sources)),
         dialect=dialect,
-        active_identifiers=active_identifiers,
+        active_identifiers=tuple(active_identifiers),
+        max_lineage_depth=memo.max_lineage_depth,
+        catalog=memo.catalog,
+        relations=tuple(_relation_identifiers(select)),
     )
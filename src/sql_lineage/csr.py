@@ -0,0 +1,636 @@
+"""Compact integer-id graph representation with CSR edge arrays."""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import re
+from array import array
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from sql_lineage.graph_utils import table_id
+from sql_lineage.lineage_graph import (
+    NODE_PREFIXES,
+    GraphTraversal,
+    LineageGraph,
+    NodeRef,
+)
+
+NONE_ID = -1
+
+# Key order of edges written by ``build_graph``; other edges are kept verbatim.
+_EDGE_KEYS = ("id", "type", "from", "to", "description", "statement_index", "details")
+_EDGE_ID = re.compile(
+    r"edge:(?P<type>[^:]+):(?P<digest>[0-9a-f]{12})(?::(?P<occurrence>\d+))?"
+)
+
+
+def _numpy():
+    """Return the NumPy module, or ``None`` when it is not installed."""
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _Json:
+    """Container value stored as JSON text and decoded into a fresh copy."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class _Values:
+    """Deduplicated attribute values addressed by integer id."""
+
+    def __init__(self) -> None:
+        self.values: List[object] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: object) -> int:
+        """Return the id of a JSON value, adding it on first use."""
+
+        key = json.dumps(value, ensure_ascii=False)
+        found = self._ids.get(key)
+        if found is None:
+            found = len(self.values)
+            self._ids[key] = found
+            self.values.append(_Json(key) if isinstance(value, (dict, list)) else value)
+        return found
+
+    def freeze(self) -> List[object]:
+        """Drop the lookup dictionary and return the value list."""
+
+        self._ids = {}
+        return self.values
+
+
+class CSRGraph(GraphTraversal):
+    """Graph with integer node ids, CSR adjacency and columnar attributes.
+
+    Node ``i`` is the ``i``-th node of the input graph. Node id strings are
+    stored as one UTF-8 buffer with offsets and looked up by binary search over
+    a sorted permutation, so no per-node string objects or hash tables are
+    kept. Node types and owning tables are integer columns; the remaining
+    attributes are ids into a deduplicated value table, laid out per node by a
+    shared key-order "shape". Edges are parallel arrays in input order;
+    ``out_offsets``/``out_positions`` and ``in_offsets``/``in_positions``
+    index them in compressed sparse row form by source and by target node.
+    Edge ids produced by ``build_graph`` are stored as their 48-bit digest and
+    occurrence number.
+
+    ``to_dict()`` rebuilds the input dictionary exactly, including key and
+    item order. Traversal yields the same nodes and distances as
+    ``LineageGraph``; the order within one distance may differ. Degree and
+    neighbor queries return NumPy arrays when NumPy is installed and ``array``
+    objects otherwise.
+    """
+
+    def __init__(self, graph: Mapping[str, object]) -> None:
+        self._build(
+            {key: value for key, value in graph.items()},
+            graph.get("nodes", []),
+            graph.get("edges", []),
+        )
+
+    @classmethod
+    def from_ndjson(cls, lines: Iterable[Union[str, bytes]]) -> CSRGraph:
+        """Build a graph from ``dump_graph`` NDJSON without loading it whole.
+
+        Node lines must precede edge lines, as ``dump_graph`` writes them.
+        """
+
+        header: Dict[str, object] = {}
+        pending: List[Dict[str, object]] = []
+        records = (json.loads(line) for line in lines if line.strip())
+
+        def nodes() -> Iterator[Dict[str, object]]:
+            for record in records:
+                ((kind, value),) = record.items()
+                if kind == "node":
+                    yield value
+                elif kind == "edge":
+                    pending.append(value)
+                    return
+                else:
+                    header.update(value)
+
+        def edges() -> Iterator[Dict[str, object]]:
+            yield from pending
+            for record in records:
+                ((kind, value),) = record.items()
+                if kind == "edge":
+                    yield value
+                elif kind == "node":
+                    raise ValueError("NDJSON graph nodes must precede edges")
+                else:
+                    header.update(value)
+
+        graph = cls.__new__(cls)
+        graph._build({}, nodes(), edges())
+        graph._header = header
+        return graph
+
+    @classmethod
+    def load(cls, source: Union[str, os.PathLike, TextIO]) -> CSRGraph:
+        """Load a graph from a JSON or NDJSON file path or text stream.
+
+        NDJSON is converted line by line.
+        """
+
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            with open(path, "r", encoding="utf-8") as handle:
+                if path.endswith((".ndjson", ".jsonl")):
+                    return cls.from_ndjson(handle)
+                return cls(json.load(handle))
+        text = source.read()
+        if text.lstrip().startswith('{"graph"'):
+            return cls.from_ndjson(text.splitlines())
+        return cls(json.loads(text))
+
+    def _build(
+        self,
+        header: Dict[str, object],
+        nodes: Iterable[Mapping[str, object]],
+        edges: Iterable[Mapping[str, object]],
+    ) -> None:
+        values = _Values()
+        indexes: Dict[str, int] = {}
+        encoded: List[bytes] = []
+        shapes: Dict[Tuple[str, ...], int] = {}
+        type_ids: Dict[str, int] = {}
+        owners: List[str] = []
+        self._header = {
+            key: value for key, value in header.items() if key not in ("nodes", "edges")
+        }
+        self._keys = list(header) if {"nodes", "edges"} & set(header) else []
+        self.shapes: List[Tuple[str, ...]] = []
+        self.node_types = array("i")
+        self.node_tables = array("i")
+        self.node_shapes = array("i")
+        self.node_value_offsets = array("q", [0])
+        self.node_values = array("i")
+        for node in nodes:
+            node_id = str(node["id"])
+            if node_id in indexes:
+                raise ValueError(f"Duplicate node id: {node_id}")
+            indexes[node_id] = len(encoded)
+            encoded.append(node_id.encode("utf-8"))
+            shape = tuple(node)
+            shape_id = shapes.get(shape)
+            if shape_id is None:
+                shape_id = shapes[shape] = len(self.shapes)
+                self.shapes.append(shape)
+            self.node_shapes.append(shape_id)
+            self.node_types.append(_intern(type_ids, str(node.get("type"))))
+            owners.append(node.get("table_id") or "")
+            self.node_values.extend(
+                values.intern(value) for key, value in node.items() if key != "id"
+            )
+            self.node_value_offsets.append(len(self.node_values))
+        self.node_count = len(encoded)
+
+        edge_type_ids: Dict[str, int] = {}
+        self._edge_records: Dict[int, Dict[str, object]] = {}
+        self.edge_sources = array("i")
+        self.edge_targets = array("i")
+        self.edge_types = array("i")
+        self.edge_descriptions = array("i")
+        self.edge_statements = array("i")
+        self.edge_details = array("i")
+        self.edge_digests = array("Q")
+        self.edge_occurrences = array("I")
+        for position, edge in enumerate(edges):
+            endpoints = []
+            for end in ("from", "to"):
+                node_id = str(edge[end])
+                found = indexes.get(node_id)
+                if found is None:
+                    # Endpoints without a node entry get an index past the
+                    # regular nodes and are never written back as nodes.
+                    found = indexes[node_id] = len(encoded)
+                    encoded.append(node_id.encode("utf-8"))
+                endpoints.append(found)
+            edge_type = str(edge["type"])
+            self.edge_sources.append(endpoints[0])
+            self.edge_targets.append(endpoints[1])
+            self.edge_types.append(_intern(edge_type_ids, edge_type))
+            digest, occurrence = _split_edge_id(edge, edge_type)
+            if digest is None:
+                self._edge_records[position] = json.loads(json.dumps(edge))
+                digest, occurrence = 0, 0
+                fields = (NONE_ID, NONE_ID, NONE_ID)
+            else:
+                fields = (
+                    values.intern(edge["description"]),
+                    values.intern(edge["statement_index"]),
+                    values.intern(edge["details"]),
+                )
+            self.edge_descriptions.append(fields[0])
+            self.edge_statements.append(fields[1])
+            self.edge_details.append(fields[2])
+            self.edge_digests.append(digest)
+            self.edge_occurrences.append(occurrence)
+
+        self.node_tables.extend(indexes.get(owner, NONE_ID) for owner in owners)
+        self.type_names = list(type_ids)
+        self.edge_type_names = list(edge_type_ids)
+        self._values = values.freeze()
+        self._type_filters: Dict[Tuple[str, ...], FrozenSet[int]] = {}
+        self._id_offsets = array("q", [0])
+        total = 0
+        for item in encoded:
+            total += len(item)
+            self._id_offsets.append(total)
+        # UTF-8 byte order matches code point order, so bytes sort like str.
+        self._sorted_ids = array(
+            "i", sorted(range(len(encoded)), key=encoded.__getitem__)
+        )
+        self._id_buffer = b"".join(encoded)
+        del encoded, indexes
+        self.out_offsets, self.out_positions = _csr(self.edge_sources, len(self))
+        self.in_offsets, self.in_positions = _csr(self.edge_targets, len(self))
+
+    def __len__(self) -> int:
+        """Return the number of node indexes, including edge-only endpoints."""
+
+        return len(self._id_offsets) - 1
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, str) and self._find(node) is not None
+
+    @property
+    def edge_count(self) -> int:
+        """Return the number of edges."""
+
+        return len(self.edge_sources)
+
+    def name(self, index: int) -> str:
+        """Return the node id string of a node index."""
+
+        offsets = self._id_offsets
+        return self._id_buffer[offsets[index] : offsets[index + 1]].decode("utf-8")
+
+    def index(self, node: NodeRef) -> int:
+        """Resolve a node reference to its integer index.
+
+        Accepts the same references as ``LineageGraph.node_id``; raises
+        ``KeyError`` for unknown nodes.
+        """
+
+        if isinstance(node, Mapping):
+            node = str(node["id"])
+        found = self._find(node)
+        if found is None:
+            raise KeyError(node)
+        return found
+
+    def node_id(self, node: NodeRef) -> str:
+        """Resolve a node reference to a node id."""
+
+        return self.name(self.index(node))
+
+    def _find(self, node: str) -> Optional[int]:
+        found = self._lookup(node)
+        if found is not None:
+            return found
+        for prefix in NODE_PREFIXES:
+            found = self._lookup(prefix + node)
+            if found is not None:
+                return found
+        return None
+
+    def _lookup(self, node_id: str) -> Optional[int]:
+        key = node_id.encode("utf-8")
+        buffer, offsets, order = self._id_buffer, self._id_offsets, self._sorted_ids
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            index = order[middle]
+            if buffer[offsets[index] : offsets[index + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order):
+            index = order[low]
+            if buffer[offsets[index] : offsets[index + 1]] == key:
+                return index
+        return None
+
+    def node(self, node: NodeRef) -> Dict[str, object]:
+        """Return a node dictionary, rebuilt from the attribute columns."""
+
+        index = self.index(node)
+        if index >= self.node_count:
+            raise KeyError(self.name(index))
+        return self._node(index)
+
+    def _node(self, index: int) -> Dict[str, object]:
+        value_ids = iter(
+            self.node_values[
+                self.node_value_offsets[index] : self.node_value_offsets[index + 1]
+            ]
+        )
+        return {
+            key: self.name(index) if key == "id" else self._value(next(value_ids))
+            for key in self.shapes[self.node_shapes[index]]
+        }
+
+    def _value(self, value_id: int) -> object:
+        value = self._values[value_id]
+        return json.loads(value.text) if isinstance(value, _Json) else value
+
+    def nodes_of_type(self, node_type: str) -> List[Dict[str, object]]:
+        """Return every node of a type."""
+
+        if node_type not in self.type_names:
+            return []
+        type_id = self.type_names.index(node_type)
+        return [
+            self._node(index)
+            for index, found in enumerate(self.node_types)
+            if found == type_id
+        ]
+
+    def columns_of(self, table: NodeRef) -> List[Dict[str, object]]:
+        """Return the column nodes of a table, given its id or full name."""
+
+        if isinstance(table, Mapping):
+            owner = self._lookup(str(table["id"]))
+        else:
+            owner = self._lookup(table)
+            if owner is None:
+                owner = self._lookup(table_id(table))
+        if owner is None:
+            return []
+        return [
+            self._node(index)
+            for index, found in enumerate(self.node_tables)
+            if found == owner
+        ]
+
+    def out_edges(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, object]]:
+        """Yield the edges leaving a node, optionally filtered by type."""
+
+        index = self.index(node)
+        for position in self._edge_positions(index, True, _types(edge_types)):
+            yield self._edge(position)
+
+    def in_edges(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, object]]:
+        """Yield the edges entering a node, optionally filtered by type."""
+
+        index = self.index(node)
+        for position in self._edge_positions(index, False, _types(edge_types)):
+            yield self._edge(position)
+
+    def _edge(self, position: int) -> Dict[str, object]:
+        record = self._edge_records.get(position)
+        if record is not None:
+            return copy.deepcopy(record)
+        edge_type = self.edge_type_names[self.edge_types[position]]
+        edge_id = f"edge:{edge_type}:{self.edge_digests[position]:012x}"
+        occurrence = self.edge_occurrences[position]
+        return {
+            "id": edge_id if occurrence == 1 else f"{edge_id}:{occurrence}",
+            "type": edge_type,
+            "from": self.name(self.edge_sources[position]),
+            "to": self.name(self.edge_targets[position]),
+            "description": self._value(self.edge_descriptions[position]),
+            "statement_index": self._value(self.edge_statements[position]),
+            "details": self._value(self.edge_details[position]),
+        }
+
+    def _edge_positions(
+        self, index: int, forward: bool, edge_types: Optional[Tuple[str, ...]]
+    ) -> Iterator[int]:
+        if forward:
+            offsets, positions = self.out_offsets, self.out_positions
+        else:
+            offsets, positions = self.in_offsets, self.in_positions
+        selected = positions[offsets[index] : offsets[index + 1]]
+        if edge_types is None:
+            return iter(selected)
+        allowed = self._type_filter(edge_types)
+        kinds = self.edge_types
+        return (position for position in selected if kinds[position] in allowed)
+
+    def _type_filter(self, edge_types: Tuple[str, ...]) -> FrozenSet[int]:
+        allowed = self._type_filters.get(edge_types)
+        if allowed is None:
+            names = set(edge_types)
+            allowed = frozenset(
+                type_id
+                for type_id, name in enumerate(self.edge_type_names)
+                if name in names
+            )
+            self._type_filters[edge_types] = allowed
+        return allowed
+
+    def _key(self, node: NodeRef) -> int:
+        return self.index(node)
+
+    def _name(self, key: int) -> str:
+        return self.name(key)
+
+    def _neighbors(
+        self, key: int, forward: bool, edge_types: Optional[Tuple[str, ...]]
+    ) -> Iterator[int]:
+        ends = self.edge_targets if forward else self.edge_sources
+        for position in self._edge_positions(key, forward, edge_types):
+            yield ends[position]
+
+    def successors(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Return the ids of the targets of edges leaving a node."""
+
+        index = self.index(node)
+        return [
+            self.name(key) for key in self._neighbors(index, True, _types(edge_types))
+        ]
+
+    def predecessors(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Return the ids of the sources of edges entering a node."""
+
+        index = self.index(node)
+        return [
+            self.name(key) for key in self._neighbors(index, False, _types(edge_types))
+        ]
+
+    def neighbor_indexes(self, index: int, forward: bool = True) -> Sequence[int]:
+        """Return the node indexes adjacent to a node index, one per edge."""
+
+        if forward:
+            offsets, positions, ends = (
+                self.out_offsets,
+                self.out_positions,
+                self.edge_targets,
+            )
+        else:
+            offsets, positions, ends = (
+                self.in_offsets,
+                self.in_positions,
+                self.edge_sources,
+            )
+        start, stop = offsets[index], offsets[index + 1]
+        numpy = _numpy()
+        if numpy is not None:
+            selected = numpy.frombuffer(positions, dtype=numpy.int32)[start:stop]
+            return numpy.frombuffer(ends, dtype=numpy.int32)[selected]
+        return array("i", (ends[position] for position in positions[start:stop]))
+
+    def out_degrees(self, edge_types: Optional[Iterable[str]] = None) -> Sequence[int]:
+        """Return the number of edges leaving every node index."""
+
+        return self._degrees(self.out_offsets, self.edge_sources, edge_types)
+
+    def in_degrees(self, edge_types: Optional[Iterable[str]] = None) -> Sequence[int]:
+        """Return the number of edges entering every node index."""
+
+        return self._degrees(self.in_offsets, self.edge_targets, edge_types)
+
+    def _degrees(
+        self, offsets: array, ends: array, edge_types: Optional[Iterable[str]]
+    ) -> Sequence[int]:
+        types = _types(edge_types)
+        numpy = _numpy()
+        if numpy is not None:
+            if types is None:
+                return numpy.diff(numpy.frombuffer(offsets, dtype=numpy.int64))
+            kinds = numpy.frombuffer(self.edge_types, dtype=numpy.int32)
+            mask = numpy.isin(kinds, list(self._type_filter(types)))
+            return numpy.bincount(
+                numpy.frombuffer(ends, dtype=numpy.int32)[mask], minlength=len(self)
+            )
+        if types is None:
+            return array("q", (offsets[i + 1] - offsets[i] for i in range(len(self))))
+        allowed = self._type_filter(types)
+        degrees = array("q", bytes(8 * len(self)))
+        for end, kind in zip(ends, self.edge_types):
+            if kind in allowed:
+                degrees[end] += 1
+        return degrees
+
+    def to_dict(self) -> Dict[str, object]:
+        """Rebuild the graph dictionary this graph was built from."""
+
+        body = {
+            "nodes": [self._node(index) for index in range(self.node_count)],
+            "edges": [self._edge(position) for position in range(self.edge_count)],
+        }
+        header = copy.deepcopy(self._header)
+        keys = self._keys or list(_with_lists(header))
+        return {key: body[key] if key in body else header[key] for key in keys}
+
+    def to_lineage_graph(self) -> LineageGraph:
+        """Return a hash-indexed ``LineageGraph`` of the same graph."""
+
+        return LineageGraph(self.to_dict())
+
+    def array_bytes(self) -> int:
+        """Return the number of bytes held by the arrays and the id buffer."""
+
+        return len(self._id_buffer) + sum(
+            value.itemsize * len(value)
+            for value in vars(self).values()
+            if isinstance(value, array)
+        )
+
+
+def to_csr(graph: Mapping[str, object]) -> CSRGraph:
+    """Convert a ``build_graph`` dictionary to CSR form."""
+
+    return CSRGraph(graph)
+
+
+def _intern(ids: Dict[str, int], value: str) -> int:
+    found = ids.get(value)
+    if found is None:
+        found = ids[value] = len(ids)
+    return found
+
+
+def _types(edge_types: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    return None if edge_types is None else tuple(edge_types)
+
+
+def _split_edge_id(
+    edge: Mapping[str, object], edge_type: str
+) -> Tuple[Optional[int], int]:
+    """Return the digest and occurrence of a ``build_graph`` edge id.
+
+    Returns ``(None, 0)`` for edges that cannot be rebuilt from the arrays.
+    """
+
+    if tuple(edge) != _EDGE_KEYS:
+        return None, 0
+    match = _EDGE_ID.fullmatch(str(edge["id"]))
+    if match is None or match.group("type") != edge_type:
+        return None, 0
+    digest = int(match.group("digest"), 16)
+    occurrence = int(match.group("occurrence") or 1)
+    rebuilt = f"edge:{edge_type}:{digest:012x}"
+    if occurrence != 1:
+        rebuilt = f"{rebuilt}:{occurrence}"
+    if rebuilt != edge["id"] or occurrence >= 2**32:
+        return None, 0
+    return digest, occurrence
+
+
+def _csr(ends: array, size: int) -> Tuple[array, array]:
+    """Return CSR offsets and edge positions grouped by ``ends``.
+
+    Edges of one node keep their input order.
+    """
+
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.frombuffer(ends, dtype=numpy.int32)
+        counts = numpy.bincount(values, minlength=size)
+        offsets = numpy.zeros(size + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=offsets[1:])
+        order = numpy.argsort(values, kind="stable").astype(numpy.int32)
+        return array("q", offsets.tobytes()), array("i", order.tobytes())
+    offsets = array("q", bytes(8 * (size + 1)))
+    for end in ends:
+        offsets[end + 1] += 1
+    for index in range(size):
+        offsets[index + 1] += offsets[index]
+    cursor = array("q", offsets)
+    positions = array("i", bytes(4 * len(ends)))
+    for position, end in enumerate(ends):
+        positions[cursor[end]] = position
+        cursor[end] += 1
+    return offsets, positions
+
+
+def _with_lists(header: Mapping[str, object]) -> Dict[str, object]:
+    """Return a header with node and edge slots in ``build_graph`` key order."""
+
+    from sql_lineage.serialization import _ordered
+
+    return _ordered({**header, "nodes": None, "edges": None})
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List
 
 
@@ -20,6 +21,27 @@ def is_supported_dialect(dialect: str) -> bool:
     return normalize_dialect(dialect) in SUPPORTED_DIALECTS
 
 
+@lru_cache(maxsize=4096)
+def normalize_name(name: str, dialect: str) -> str:
+    """Normalize a dotted name as the dialect resolves unquoted identifiers.
+
+    Case-folding dialects such as Postgres lowercase each part; unknown dialects
+    leave the name unchanged.
+    """
+
+    from sqlglot import exp
+    from sqlglot.dialects.dialect import Dialect
+
+    try:
+        resolved = Dialect.get_or_raise(dialect)
+    except ValueError:
+        return name
+    return ".".join(
+        resolved.normalize_identifier(exp.to_identifier(part)).name
+        for part in name.split(".")
+    )
+
+
 def supported_dialects() -> List[str]:
     """Return the list of supported dialects."""
 
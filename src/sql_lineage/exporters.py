@@ -3,11 +3,32 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional
 
+from sql_lineage.profiling import Tracer, traced
 
-def export_graph(graph: Dict[str, object], format: str = "json") -> str:
-    """Export a graph to the requested format."""
+
+def export_graph(
+    graph: Dict[str, object], format: str = "json", tracer: Optional[Tracer] = None
+) -> str:
+    """Export a graph to the requested format.
+
+    A ``tracer`` records the export as the ``export`` phase.
+    """
+
+    return traced(
+        tracer,
+        "export",
+        None,
+        len(graph.get("nodes", [])),
+        _export_graph,
+        graph,
+        format,
+    )
+
+
+def _export_graph(graph: Dict[str, object], format: str) -> str:
+    """Export a graph without tracing."""
 
     normalized_format = format.lower()
     mode = graph.get("mode", "full")
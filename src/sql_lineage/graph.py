@@ -3,55 +3,214 @@
 from __future__ import annotations
 
 import datetime as dt
+from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 
-from sql_lineage.analyzer import analyze
+from sql_lineage.analyzer import analyze_typed
+from sql_lineage.cache import AnalysisCache
+from sql_lineage.catalog import CatalogSource, load_catalog
+from sql_lineage.dialects import normalize_dialect
 from sql_lineage.graph_utils import (
     ResolvedTable,
     column_id,
     cte_id,
+    edge_id,
     ensure_unique_columns,
     expression_id,
+    numbered_edge_id,
     resolve_table_reference,
     split_table_name,
     subquery_id,
     table_id,
 )
+from sql_lineage.models import AnalysisResult, OutputColumn, StatementAnalysis
+from sql_lineage.profiling import Tracer, attach_timings, traced
+from sql_lineage.version import __version__
+
+GRAPH_MODES = ("full", "er_columns", "tables_only")
 
 
 def build_graph(
-    sql: str, dialect: str = "clickhouse", mode: str = "full"
+    sql: str,
+    dialect: str = "clickhouse",
+    mode: str = "full",
+    include_timestamp: bool = True,
+    cache: Optional[AnalysisCache] = None,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+) -> Dict[str, object]:
+    """Build a lineage graph from SQL.
+
+    When ``include_timestamp`` is False, ``meta.generated_at`` is omitted so the
+    same SQL always yields byte-identical output. With a ``cache``, graphs are
+    looked up by SQL content, dialect, mode and library version. A schema
+    ``catalog`` is applied as in ``analyze``, and a ``tracer`` as in ``analyze``
+    with the graph construction recorded as the ``graph`` phase.
+    """
+
+    return build_graphs(
+        sql,
+        dialect=dialect,
+        modes=[mode],
+        include_timestamp=include_timestamp,
+        cache=cache,
+        catalog=catalog,
+        tracer=tracer,
+    )[mode.lower()]
+
+
+def build_graphs(
+    sql: str,
+    dialect: str = "clickhouse",
+    modes: Iterable[str] = GRAPH_MODES,
+    include_timestamp: bool = True,
+    cache: Optional[AnalysisCache] = None,
+    catalog: Optional[CatalogSource] = None,
+    tracer: Optional[Tracer] = None,
+) -> Dict[str, Dict[str, object]]:
+    """Build lineage graphs in several modes from one analysis of the SQL.
+
+    Returns the graphs keyed by lower-cased mode, in the order requested. Each
+    graph equals ``build_graph`` output for its mode. With a ``cache``, graphs
+    are looked up under the ``build_graph`` keys, and the SQL is analyzed only
+    if one of them is missing. When both ``er_columns`` and ``tables_only``
+    are requested, ``tables_only`` reuses the column edges recorded while
+    building ``er_columns``.
+    """
+
+    wanted = list(dict.fromkeys(mode.lower() for mode in modes))
+    schema = load_catalog(catalog)
+    fingerprint = schema.fingerprint() if schema is not None else None
+    keys: Dict[str, str] = {}
+    graphs: Dict[str, Dict[str, object]] = {}
+    if cache is not None and (schema is None or fingerprint is not None):
+        options = (("catalog", fingerprint),) if fingerprint is not None else ()
+        for mode in wanted:
+            keys[mode] = cache.key(
+                "graph", sql, normalize_dialect(dialect), mode, options=options
+            )
+            graph = cache.load(keys[mode])
+            if graph is not None:
+                graphs[mode] = graph
+    missing = [mode for mode in wanted if mode not in graphs]
+    if missing:
+        analysis = analyze_typed(sql, dialect=dialect, catalog=schema, tracer=tracer)
+        for mode, graph in _graphs_from_analysis(analysis, missing, tracer).items():
+            if mode in keys:
+                cache.store(keys[mode], graph)
+            graphs[mode] = graph
+    result: Dict[str, Dict[str, object]] = {}
+    for mode in wanted:
+        graph = graphs[mode]
+        if include_timestamp:
+            _add_timestamp(graph)
+        result[mode] = attach_timings(graph, tracer)
+    return result
+
+
+def build_graph_from_analysis(
+    analysis: AnalysisResult,
+    mode: str = "full",
+    include_timestamp: bool = True,
+    tracer: Optional[Tracer] = None,
 ) -> Dict[str, object]:
-    """Build a lineage graph from SQL."""
+    """Build a lineage graph from an ``analyze_typed`` result.
+
+    The result equals ``build_graph`` output for the analyzed SQL, so one
+    analysis can back graphs in every mode.
+    """
+
+    graph = _graphs_from_analysis(analysis, [mode.lower()], tracer)[mode.lower()]
+    if include_timestamp:
+        _add_timestamp(graph)
+    return attach_timings(graph, tracer)
+
+
+def _add_timestamp(graph: Dict[str, object]) -> Dict[str, object]:
+    """Insert ``meta.generated_at`` after the statement count."""
+
+    graph["meta"] = {
+        "statements": graph["meta"]["statements"],
+        "generated_at": dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        **graph["meta"],
+    }
+    return graph
+
+
+def _graphs_from_analysis(
+    analysis: AnalysisResult, modes: List[str], tracer: Optional[Tracer] = None
+) -> Dict[str, Dict[str, object]]:
+    """Build graphs in lower-cased modes without generation timestamps."""
+
+    column_edges: Optional[List[_ColumnEdge]] = None
+    if "er_columns" in modes and "tables_only" in modes:
+        column_edges = []
+    graphs: Dict[str, Dict[str, object]] = {}
+    # ``er_columns`` goes first so ``tables_only`` can reuse its column edges.
+    for mode in sorted(modes, key=lambda mode: mode != "er_columns"):
+        graphs[mode] = traced(
+            tracer,
+            "graph",
+            None,
+            _graph_node_count,
+            _graph_from_statements,
+            analysis.dialect,
+            mode,
+            analysis.statements,
+            analysis.errors,
+            column_edges,
+        )
+    return graphs
+
+
+def _graph_node_count(graph: Dict[str, object]) -> int:
+    """Return the number of nodes of a graph."""
+
+    return len(graph.get("nodes", []))
+
+
+def _graph_from_statements(
+    dialect: str,
+    mode: str,
+    statements: List[StatementAnalysis],
+    errors: List[str],
+    column_edges: Optional[List[_ColumnEdge]] = None,
+) -> Dict[str, object]:
+    """Build a lineage graph from analyzed statements.
+
+    ``tables_only`` lineage is always aggregated from the ER column edges.
+    With ``column_edges``, ``er_columns`` mode records its column edges there
+    and ``tables_only`` mode reuses the recorded edges instead of collecting
+    them.
+    """
 
     normalized_mode = mode.lower()
-    analysis = analyze(sql, dialect=dialect)
     graph: Dict[str, object] = {
-        "dialect": analysis["dialect"],
+        "dialect": dialect,
         "mode": normalized_mode,
         "meta": {
-            "statements": len(analysis.get("statements", [])),
-            "generated_at": dt.datetime.utcnow().replace(microsecond=0).isoformat()
-            + "Z",
+            "statements": len(statements),
             "library": "sql_lineage",
-            "version": "0.2.0",
+            "version": __version__,
         },
         "nodes": [],
         "edges": [],
-        "errors": list(analysis.get("errors", [])),
+        "errors": list(errors),
         "warnings": [],
     }
-    if normalized_mode not in {"full", "er_columns", "tables_only"}:
+    for statement in statements:
+        for error in statement.errors:
+            graph["errors"].append(f"Statement {statement.index}: {error}")
+    if normalized_mode not in GRAPH_MODES:
         graph["errors"].append(f"Unsupported graph mode: {mode}")
         normalized_mode = "full"
         graph["mode"] = normalized_mode
 
     builder = _GraphBuilder(graph)
-    statements = analysis.get("statements", [])
     if normalized_mode == "tables_only":
-        _build_tables_only_graph(builder, statements)
+        _tables_only_from_column_edges(builder, statements, column_edges)
     elif normalized_mode == "er_columns":
-        _build_er_columns_graph(builder, statements)
+        _build_er_columns_graph(builder, statements, column_edges)
     else:
         _build_full_graph(builder, statements)
     return builder.finalize()
@@ -63,6 +222,17 @@ def build_er_columns(sql: str, dialect: str = "clickhouse") -> Dict[str, object]
     return build_graph(sql, dialect=dialect, mode="er_columns")
 
 
+@dataclass(frozen=True)
+class _ColumnEdge:
+    """Table-level facts of one ER ``col_lineage`` edge."""
+
+    statement_index: int
+    source: str
+    lineage_type: str
+    warning: Optional[str]
+    context: str
+
+
 class _GraphBuilder:
     """Helper for assembling graph nodes and edges."""
 
@@ -70,7 +240,7 @@ class _GraphBuilder:
         self.graph = graph
         self.nodes: Dict[str, Dict[str, object]] = {}
         self.edges: List[Dict[str, object]] = []
-        self.edge_count = 0
+        self.edge_ids: Dict[str, int] = {}
 
     def add_node(self, node: Dict[str, object]) -> None:
         """Add a node if not already present."""
@@ -91,15 +261,18 @@ class _GraphBuilder:
     ) -> None:
         """Add an edge entry."""
 
-        self.edge_count += 1
+        details = details or {}
+        base_id = edge_id(edge_type, from_node, to_node, details)
+        occurrence = self.edge_ids.get(base_id, 0) + 1
+        self.edge_ids[base_id] = occurrence
         edge = {
-            "id": f"edge:{edge_type}:{self.edge_count}",
+            "id": numbered_edge_id(base_id, occurrence),
             "type": edge_type,
             "from": from_node,
             "to": to_node,
             "description": description,
             "statement_index": statement_index,
-            "details": details or {},
+            "details": details,
         }
         self.edges.append(edge)
 
@@ -127,13 +300,13 @@ class _GraphBuilder:
 
 
 def _build_full_graph(
-    builder: _GraphBuilder, statements: Iterable[Dict[str, object]]
+    builder: _GraphBuilder, statements: Iterable[StatementAnalysis]
 ) -> None:
     """Build full dependency graph."""
 
     for statement in statements:
-        statement_index = statement["index"]
-        sources = statement.get("sources", [])
+        statement_index = statement.index
+        sources = statement.sources
         subquery_map = _build_subquery_map(statement_index, sources)
         target_table = _target_table_from_statement(statement)
         _add_source_nodes(builder, sources, statement_index, subquery_map)
@@ -142,7 +315,7 @@ def _build_full_graph(
                 builder, target_table, statement_index, "table", "Target table"
             )
         subquery_index = 0
-        for _subquery in statement.get("subqueries", []) or []:
+        for _subquery in statement.subqueries:
             subquery_index += 1
             node_id = subquery_id(statement_index, subquery_index)
             builder.add_node(
@@ -155,7 +328,7 @@ def _build_full_graph(
                 }
             )
 
-        output_columns = statement.get("output", {}).get("columns", [])
+        output_columns = statement.output_columns
         for output_column in output_columns:
             _add_output_column_graph(
                 builder,
@@ -171,13 +344,15 @@ def _build_full_graph(
 
 
 def _build_er_columns_graph(
-    builder: _GraphBuilder, statements: Iterable[Dict[str, object]]
+    builder: _GraphBuilder,
+    statements: Iterable[StatementAnalysis],
+    column_edges: Optional[List[_ColumnEdge]] = None,
 ) -> None:
-    """Build ER graph with tables and columns."""
+    """Build ER graph with tables and columns, recording column edges if asked."""
 
     for statement in statements:
-        statement_index = statement["index"]
-        sources = statement.get("sources", [])
+        statement_index = statement.index
+        sources = statement.sources
         subquery_map = _build_subquery_map(statement_index, sources)
         target_table = _target_table_from_statement(statement)
         _add_source_nodes(builder, sources, statement_index, subquery_map)
@@ -186,7 +361,7 @@ def _build_er_columns_graph(
                 builder, target_table, statement_index, "table", "Target table"
             )
 
-        output_columns = statement.get("output", {}).get("columns", [])
+        output_columns = statement.output_columns
         for output_column in output_columns:
             _add_er_column_nodes(
                 builder,
@@ -204,80 +379,112 @@ def _build_er_columns_graph(
             sources,
             target_table,
             subquery_map,
+            column_edges,
         )
         _add_fk_like_edges(builder, statement, statement_index, sources, subquery_map)
 
     _ensure_table_columns(builder)
 
 
-def _build_tables_only_graph(
-    builder: _GraphBuilder, statements: Iterable[Dict[str, object]]
+def _tables_only_from_column_edges(
+    builder: _GraphBuilder,
+    statements: Iterable[StatementAnalysis],
+    column_edges: Optional[Iterable[_ColumnEdge]] = None,
 ) -> None:
-    """Build table-level lineage graph."""
-
+    """Build the table-level graph by aggregating ER column edges.
+
+    Edges recorded by an ``er_columns`` build are reused; otherwise each
+    statement's edges are collected with ``_add_er_column_edges``.
+    """
+
+    by_statement: Optional[Dict[int, List[_ColumnEdge]]] = None
+    if column_edges is not None:
+        by_statement = {}
+        for column_edge in column_edges:
+            by_statement.setdefault(column_edge.statement_index, []).append(
+                column_edge
+            )
     for statement in statements:
-        statement_index = statement["index"]
-        sources = statement.get("sources", [])
+        statement_index = statement.index
+        sources = statement.sources
         subquery_map = _build_subquery_map(statement_index, sources)
         target_table = _target_table_from_statement(statement)
         _add_source_nodes(builder, sources, statement_index, subquery_map)
-        if target_table:
-            _add_table_node(
-                builder, target_table, statement_index, "table", "Target table"
-            )
-
         if not target_table:
             continue
+        _add_table_node(builder, target_table, statement_index, "table", "Target table")
+        if by_statement is None:
+            statement_edges: List[_ColumnEdge] = []
+            _add_er_column_edges(
+                None,
+                statement.output_columns,
+                statement_index,
+                sources,
+                target_table,
+                subquery_map,
+                statement_edges,
+            )
+        else:
+            statement_edges = by_statement.get(statement_index, [])
         dependency_map: Dict[str, Dict[str, object]] = {}
-        output_columns = statement.get("output", {}).get("columns", [])
-        for output_column in output_columns:
-            lineage = output_column.get("lineage", {})
-            inputs = lineage.get("inputs", [])
-            for input_ref in inputs:
-                resolved, warning = _resolve_with_subqueries(
-                    input_ref.get("table"), sources, statement_index, subquery_map
-                )
-                if warning:
-                    builder.add_warning(
-                        code="unresolved_table",
-                        message=warning,
-                        statement_index=statement_index,
-                        context=str(input_ref),
-                    )
-                if resolved.full_name not in dependency_map:
-                    dependency_map[resolved.full_name] = {
-                        "count": 0,
-                        "reasons": set(),
-                    }
-                dependency_map[resolved.full_name]["count"] += 1
-                dependency_map[resolved.full_name]["reasons"].add(
-                    lineage.get("type", "select")
+        for column_edge in statement_edges:
+            if column_edge.warning:
+                builder.add_warning(
+                    code="unresolved_table",
+                    message=column_edge.warning,
+                    statement_index=statement_index,
+                    context=column_edge.context,
                 )
-        for source_name, data in dependency_map.items():
-            from_id = _table_node_id_from_source_name(
-                source_name, sources, statement_index, subquery_map
-            )
-            to_id = table_id(target_table["full_name"])
-            details = {
-                "columns_count": data["count"],
-                "via": sorted(data["reasons"]),
-            }
-            builder.add_edge(
-                "table_lineage",
-                from_id,
-                to_id,
-                "Table-level lineage",
-                statement_index,
-                details,
+            data = dependency_map.setdefault(
+                column_edge.source, {"count": 0, "reasons": set()}
             )
+            data["count"] += 1
+            data["reasons"].add(column_edge.lineage_type)
+        _add_table_lineage_edges(
+            builder,
+            dependency_map,
+            sources,
+            statement_index,
+            subquery_map,
+            target_table,
+        )
+
+
+def _add_table_lineage_edges(
+    builder: _GraphBuilder,
+    dependency_map: Dict[str, Dict[str, object]],
+    sources: Iterable[Dict[str, str]],
+    statement_index: int,
+    subquery_map: Dict[str, str],
+    target_table: Dict[str, str],
+) -> None:
+    """Add one ``table_lineage`` edge per source table of a statement."""
+
+    for source_name, data in dependency_map.items():
+        from_id = _table_node_id_from_source_name(
+            source_name, sources, statement_index, subquery_map
+        )
+        to_id = table_id(target_table["full_name"])
+        details = {
+            "columns_count": data["count"],
+            "via": sorted(data["reasons"]),
+        }
+        builder.add_edge(
+            "table_lineage",
+            from_id,
+            to_id,
+            "Table-level lineage",
+            statement_index,
+            details,
+        )
 
 
 def _target_table_from_statement(
-    statement: Dict[str, object],
+    statement: StatementAnalysis,
 ) -> Optional[Dict[str, str]]:
     """Extract target table metadata from a statement."""
 
-    target = statement.get("target")
+    target = statement.target
     if not target:
         return None
     database = target.get("database", "")
@@ -386,7 +593,7 @@ def _add_table_node(
 
 def _add_output_column_graph(
     builder: _GraphBuilder,
-    output_column: Dict[str, object],
+    output_column: OutputColumn,
     statement_index: int,
     target_table: Optional[Dict[str, str]],
     sources: Iterable[Dict[str, str]],
@@ -394,8 +601,8 @@ def _add_output_column_graph(
 ) -> None:
     """Add nodes and edges for output column lineage."""
 
-    lineage = output_column.get("lineage", {})
-    output_name = output_column.get("name", "")
+    lineage = output_column.lineage
+    output_name = output_column.name
     target_full = target_table["full_name"] if target_table else "unknown"
     if target_full == "unknown":
         builder.add_node(
@@ -419,7 +626,7 @@ def _add_output_column_graph(
             "name": output_name,
             "data_type": None,
             "description": "Output column",
-            "literals": lineage.get("literals", []),
+            "literals": lineage.literals,
             "statement_index": statement_index,
         }
     )
@@ -434,7 +641,7 @@ def _add_output_column_graph(
 
     expression_node_id = None
     if _requires_expression_node(output_column):
-        expression_sql = output_column.get("expression", "")
+        expression_sql = output_column.expression
         expression_node_id = expression_id(statement_index, output_name, expression_sql)
         builder.add_node(
             {
@@ -451,28 +658,28 @@ def _add_output_column_graph(
             output_col_id,
             "Expression produces output column",
             statement_index,
-            {"function": lineage.get("type", "")},
+            {"function": lineage.lineage_type},
         )
 
-    for input_ref in lineage.get("inputs", []):
+    for input_ref in lineage.inputs:
         resolved, warning = _resolve_with_subqueries(
-            input_ref.get("table"), sources, statement_index, subquery_map
+            input_ref.table, sources, statement_index, subquery_map
         )
         if warning:
             builder.add_warning(
                 code="unresolved_table",
                 message=warning,
                 statement_index=statement_index,
-                context=str(input_ref),
+                context=str(input_ref.to_dict()),
             )
         input_table_name = _resolved_full_name(resolved)
-        input_col_id = column_id(input_table_name, input_ref.get("column", "unknown"))
+        input_col_id = column_id(input_table_name, input_ref.column)
         builder.add_node(
             {
                 "id": input_col_id,
                 "type": "column",
                 "table_id": _table_node_id_from_resolved(resolved),
-                "name": input_ref.get("column", "unknown"),
+                "name": input_ref.column,
                 "data_type": None,
                 "description": "Input column",
                 "statement_index": statement_index,
@@ -501,20 +708,20 @@ def _add_output_column_graph(
                 expression_node_id,
                 "Expression uses column",
                 statement_index,
-                {"function": lineage.get("type", "")},
+                {"function": lineage.lineage_type},
             )
 
 
-def _requires_expression_node(output_column: Dict[str, object]) -> bool:
+def _requires_expression_node(output_column: OutputColumn) -> bool:
     """Determine if an output column should have an expression node."""
 
-    lineage = output_column.get("lineage", {})
-    lineage_type = lineage.get("type", "")
+    lineage = output_column.lineage
+    lineage_type = lineage.lineage_type
     if lineage_type in {"direct", "column_rename"}:
         return False
-    functions = lineage.get("functions", [])
-    literals = lineage.get("literals", [])
-    expression_sql = output_column.get("expression", "")
+    functions = lineage.functions
+    literals = lineage.literals
+    expression_sql = output_column.expression
     return bool(
         functions
         or literals
@@ -526,7 +733,7 @@ def _requires_expression_node(output_column: Dict[str, object]) -> bool:
 def _add_join_edges(
     builder: _GraphBuilder,
     sources: Iterable[Dict[str, str]],
-    statement: Dict[str, object],
+    statement: StatementAnalysis,
     statement_index: int,
     subquery_map: Dict[str, str],
 ) -> None:
@@ -534,7 +741,7 @@ def _add_join_edges(
 
     source_tables = [src for src in sources if src.get("type") == "table"]
     left_source = source_tables[0] if source_tables else None
-    for join in statement.get("joins", []) or []:
+    for join in statement.joins:
         right = join.get("right")
         if not right:
             continue
@@ -565,13 +772,13 @@ def _add_join_edges(
 def _add_union_edges(
     builder: _GraphBuilder,
     sources: Iterable[Dict[str, str]],
-    statement: Dict[str, object],
+    statement: StatementAnalysis,
     statement_index: int,
     target_table: Optional[Dict[str, str]],
 ) -> None:
     """Add union edges between sources and target."""
 
-    if not statement.get("unions"):
+    if not statement.unions:
         return
     if not target_table:
         return
@@ -591,7 +798,7 @@ def _add_union_edges(
 
 def _add_er_column_nodes(
     builder: _GraphBuilder,
-    output_column: Dict[str, object],
+    output_column: OutputColumn,
     statement_index: int,
     target_table: Optional[Dict[str, str]],
     sources: Iterable[Dict[str, str]],
@@ -613,7 +820,7 @@ def _add_er_column_nodes(
                 "description": "Unknown target table",
             }
         )
-    output_name = output_column.get("name", "")
+    output_name = output_column.name
     output_col_id = column_id(target_full, output_name)
     builder.add_node(
         {
@@ -624,28 +831,28 @@ def _add_er_column_nodes(
             "data_type": None,
             "description": "Output column",
             "statement_index": statement_index,
-            "literals": output_column.get("lineage", {}).get("literals", []),
+            "literals": output_column.lineage.literals,
         }
     )
-    for input_ref in output_column.get("lineage", {}).get("inputs", []):
+    for input_ref in output_column.lineage.inputs:
         resolved, warning = _resolve_with_subqueries(
-            input_ref.get("table"), sources, statement_index, subquery_map
+            input_ref.table, sources, statement_index, subquery_map
         )
         if warning:
             builder.add_warning(
                 code="unresolved_table",
                 message=warning,
                 statement_index=statement_index,
-                context=str(input_ref),
+                context=str(input_ref.to_dict()),
             )
         input_table = _resolved_full_name(resolved)
-        input_col_id = column_id(input_table, input_ref.get("column", "unknown"))
+        input_col_id = column_id(input_table, input_ref.column)
         builder.add_node(
             {
                 "id": input_col_id,
                 "type": "column",
                 "table_id": _table_node_id_from_resolved(resolved),
-                "name": input_ref.get("column", "unknown"),
+                "name": input_ref.column,
                 "data_type": None,
                 "description": "Input column",
                 "statement_index": statement_index,
@@ -654,57 +861,71 @@ def _add_er_column_nodes(
 
 
 def _add_er_column_edges(
-    builder: _GraphBuilder,
-    output_columns: Iterable[Dict[str, object]],
+    builder: Optional[_GraphBuilder],
+    output_columns: Iterable[OutputColumn],
     statement_index: int,
     sources: Iterable[Dict[str, str]],
     target_table: Optional[Dict[str, str]],
     subquery_map: Dict[str, str],
+    column_edges: Optional[List[_ColumnEdge]] = None,
 ) -> None:
-    """Add lineage edges for ER mode."""
+    """Add lineage edges for ER mode and record them in ``column_edges``.
+
+    Without a ``builder`` the edges are only recorded, which is how
+    ``tables_only`` mode collects them when no ER graph is built.
+    """
 
     target_full = target_table["full_name"] if target_table else "unknown"
     for output_column in output_columns:
-        output_name = output_column.get("name", "")
-        output_col_id = column_id(target_full, output_name)
-        lineage = output_column.get("lineage", {})
-        how = lineage.get("mapping", [{}])[0].get("reason", lineage.get("type", ""))
-        for input_ref in lineage.get("inputs", []):
+        output_col_id = column_id(target_full, output_column.name)
+        lineage = output_column.lineage
+        how = lineage.mapping[0].reason if lineage.mapping else lineage.lineage_type
+        for input_ref in lineage.inputs:
             resolved, warning = _resolve_with_subqueries(
-                input_ref.get("table"), sources, statement_index, subquery_map
+                input_ref.table, sources, statement_index, subquery_map
             )
-            if warning:
-                builder.add_warning(
-                    code="unresolved_table",
-                    message=warning,
-                    statement_index=statement_index,
-                    context=str(input_ref),
+            if builder is not None:
+                if warning:
+                    builder.add_warning(
+                        code="unresolved_table",
+                        message=warning,
+                        statement_index=statement_index,
+                        context=str(input_ref.to_dict()),
+                    )
+                input_table = _resolved_full_name(resolved)
+                builder.add_edge(
+                    "col_lineage",
+                    column_id(input_table, input_ref.column),
+                    output_col_id,
+                    "Column lineage",
+                    statement_index,
+                    {
+                        "how": how,
+                        "expression_sql": output_column.expression,
+                    },
+                )
+            if column_edges is not None and target_table:
+                column_edges.append(
+                    _ColumnEdge(
+                        statement_index=statement_index,
+                        source=resolved.full_name,
+                        lineage_type=lineage.lineage_type,
+                        warning=warning,
+                        context=str(input_ref.to_dict()),
+                    )
                 )
-            input_table = _resolved_full_name(resolved)
-            input_col_id = column_id(input_table, input_ref.get("column", "unknown"))
-            builder.add_edge(
-                "col_lineage",
-                input_col_id,
-                output_col_id,
-                "Column lineage",
-                statement_index,
-                {
-                    "how": how,
-                    "expression_sql": output_column.get("expression", ""),
-                },
-            )
 
 
 def _add_fk_like_edges(
     builder: _GraphBuilder,
-    statement: Dict[str, object],
+    statement: StatementAnalysis,
     statement_index: int,
     sources: Iterable[Dict[str, str]],
     subquery_map: Dict[str, str],
 ) -> None:
     """Add FK-like edges derived from join conditions."""
 
-    for join in statement.get("joins", []) or []:
+    for join in statement.joins:
         condition = join.get("condition", "")
         if "=" not in condition:
             continue
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import json
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -55,6 +56,35 @@ def expression_id(statement_index: int, output_name: str, expression: str) -> st
     return f"expr:{statement_index}:{output_name}:{digest}"
 
 
+def edge_id(
+    edge_type: str,
+    from_node: str,
+    to_node: str,
+    details: Dict[str, object],
+) -> str:
+    """Create a content-derived edge identifier.
+
+    The statement index is left out so that ids survive statements being added
+    or removed earlier in a script.
+    """
+
+    payload = json.dumps([from_node, to_node, details], sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+    return f"edge:{edge_type}:{digest}"
+
+
+def edge_base_id(edge_id_value: str) -> str:
+    """Strip the ``:<n>`` occurrence suffix from an edge id."""
+
+    return ":".join(edge_id_value.split(":", 3)[:3])
+
+
+def numbered_edge_id(base_id: str, occurrence: int) -> str:
+    """Return the id of the ``occurrence``-th edge sharing a base id."""
+
+    return base_id if occurrence == 1 else f"{base_id}:{occurrence}"
+
+
 def resolve_table_reference(
     table_ref: Optional[str], sources: Iterable[Dict[str, str]]
 ) -> Tuple[ResolvedTable, Optional[str]]:
@@ -0,0 +1,304 @@
+"""Incrementally maintained lineage graphs keyed by statement."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Set
+
+from sql_lineage.analyzer import analyze_typed
+from sql_lineage.dialects import normalize_dialect
+from sql_lineage.graph import GRAPH_MODES, _graph_from_statements
+from sql_lineage.graph_utils import (
+    edge_base_id,
+    ensure_unique_columns,
+    numbered_edge_id,
+)
+from sql_lineage.version import __version__
+
+
+@dataclass(eq=False)
+class _GraphUnit:
+    """Nodes, edges and diagnostics contributed by one keyed statement."""
+
+    key: str
+    sql: str
+    statement_index: int
+    nodes: Dict[str, Dict[str, object]]
+    edges: List[Dict[str, object]]
+    edge_counts: Dict[str, int]
+    errors: List[str]
+    warnings: List[Dict[str, object]]
+
+
+@dataclass(frozen=True)
+class GraphDelta:
+    """Node and edge identifiers changed by an incremental update."""
+
+    added_nodes: List[str] = field(default_factory=list)
+    updated_nodes: List[str] = field(default_factory=list)
+    removed_nodes: List[str] = field(default_factory=list)
+    added_edges: List[str] = field(default_factory=list)
+    removed_edges: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Serialize the delta to a dictionary."""
+
+        return {
+            "added_nodes": self.added_nodes,
+            "updated_nodes": self.updated_nodes,
+            "removed_nodes": self.removed_nodes,
+            "added_edges": self.added_edges,
+            "removed_edges": self.removed_edges,
+        }
+
+
+class IncrementalGraph:
+    """Lineage graph that is updated one keyed statement at a time.
+
+    Each key holds the SQL of one statement (typically one model); SQL with
+    several statements is rejected with ``ValueError``. Adding, replacing or
+    removing a key re-analyzes only that statement. Keys keep the statement
+    index they were first added with, and edge ids are derived from edge
+    content, so unchanged parts of the graph keep their ids across updates.
+    Identical edges of several keys are numbered in statement index order, as
+    ``build_graph`` does. Adding keys in script order yields the same graph as
+    ``build_graph`` on the concatenated script.
+    """
+
+    def __init__(self, dialect: str = "clickhouse", mode: str = "full") -> None:
+        normalized_mode = mode.lower()
+        if normalized_mode not in GRAPH_MODES:
+            raise ValueError(f"Unsupported graph mode: {mode}")
+        self.dialect = normalize_dialect(dialect)
+        self.mode = normalized_mode
+        self._units: Dict[str, _GraphUnit] = {}
+        self._next_index = 1
+        self._node_owners: Dict[str, List[_GraphUnit]] = {}
+        self._edge_counts: Dict[str, int] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._units
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def keys(self) -> List[str]:
+        """Return statement keys in statement index order."""
+
+        return list(self._units)
+
+    def add(self, key: str, sql: str) -> GraphDelta:
+        """Add a statement under a new key."""
+
+        if key in self._units:
+            raise KeyError(f"Statement key already present: {key}")
+        unit = self._build_unit(key, sql, self._next_index)
+        self._next_index += 1
+        return self._swap(None, unit)
+
+    def replace(self, key: str, sql: str) -> GraphDelta:
+        """Replace the SQL of an existing key, keeping its statement index."""
+
+        previous = self._units[key]
+        if previous.sql == sql:
+            return GraphDelta()
+        unit = self._build_unit(key, sql, previous.statement_index)
+        return self._swap(previous, unit)
+
+    def upsert(self, key: str, sql: str) -> GraphDelta:
+        """Add a key or replace its SQL if it already exists."""
+
+        if key in self._units:
+            return self.replace(key, sql)
+        return self.add(key, sql)
+
+    def remove(self, key: str) -> GraphDelta:
+        """Remove a key and everything only it contributed."""
+
+        return self._swap(self._units[key], None)
+
+    def _build_unit(self, key: str, sql: str, statement_index: int) -> _GraphUnit:
+        """Analyze one keyed statement into its graph contribution."""
+
+        analysis = analyze_typed(sql, dialect=self.dialect)
+        if len(analysis.statements) > 1:
+            raise ValueError(
+                f"Statement key {key!r} holds {len(analysis.statements)} "
+                "statements; add each statement under its own key"
+            )
+        statements = [
+            replace(statement, index=statement_index)
+            for statement in analysis.statements
+        ]
+        graph = _graph_from_statements(
+            analysis.dialect, self.mode, statements, analysis.errors
+        )
+        edge_counts: Dict[str, int] = {}
+        for edge in graph["edges"]:
+            base_id = edge_base_id(edge["id"])
+            edge_counts[base_id] = edge_counts.get(base_id, 0) + 1
+        return _GraphUnit(
+            key=key,
+            sql=sql,
+            statement_index=statement_index,
+            nodes={node["id"]: node for node in graph["nodes"]},
+            edges=graph["edges"],
+            edge_counts=edge_counts,
+            errors=graph["errors"],
+            warnings=graph["warnings"],
+        )
+
+    def _owner(self, node_id: str) -> Optional[_GraphUnit]:
+        """Return the unit whose copy of a node is reported."""
+
+        owners = self._node_owners.get(node_id)
+        return owners[0] if owners else None
+
+    def _swap(
+        self, previous: Optional[_GraphUnit], unit: Optional[_GraphUnit]
+    ) -> GraphDelta:
+        """Replace one unit's contribution and report what changed."""
+
+        touched: Set[str] = set()
+        if previous is not None:
+            touched.update(previous.nodes)
+        if unit is not None:
+            touched.update(unit.nodes)
+        before = {node_id: self._owner(node_id) for node_id in touched}
+        before_nodes = {
+            node_id: owner.nodes[node_id]
+            for node_id, owner in before.items()
+            if owner is not None
+        }
+
+        if previous is not None:
+            for node_id in previous.nodes:
+                owners = self._node_owners[node_id]
+                owners.remove(previous)
+                if not owners:
+                    del self._node_owners[node_id]
+            if unit is None:
+                del self._units[previous.key]
+        if unit is not None:
+            for node_id in unit.nodes:
+                _insert_owner(self._node_owners.setdefault(node_id, []), unit)
+            # New keys get the highest index and replacements keep their slot,
+            # so the unit mapping stays in statement index order.
+            self._units[unit.key] = unit
+
+        added_nodes: List[str] = []
+        updated_nodes: List[str] = []
+        removed_nodes: List[str] = []
+        for node_id in sorted(touched):
+            owner = self._owner(node_id)
+            if owner is None:
+                if node_id in before_nodes:
+                    removed_nodes.append(node_id)
+            elif node_id not in before_nodes:
+                added_nodes.append(node_id)
+            elif owner.nodes[node_id] != before_nodes[node_id]:
+                updated_nodes.append(node_id)
+        # An id only depends on how many edges share its base id, so the ids
+        # that appear or disappear follow from the changed counts.
+        added_edges: List[str] = []
+        removed_edges: List[str] = []
+        for base_id in _touched_bases(previous, unit):
+            before_count = self._edge_counts.get(base_id, 0)
+            after_count = (
+                before_count
+                - (previous.edge_counts.get(base_id, 0) if previous else 0)
+                + (unit.edge_counts.get(base_id, 0) if unit else 0)
+            )
+            if after_count:
+                self._edge_counts[base_id] = after_count
+            else:
+                self._edge_counts.pop(base_id, None)
+            for occurrence in range(before_count + 1, after_count + 1):
+                added_edges.append(numbered_edge_id(base_id, occurrence))
+            for occurrence in range(after_count + 1, before_count + 1):
+                removed_edges.append(numbered_edge_id(base_id, occurrence))
+        return GraphDelta(
+            added_nodes=added_nodes,
+            updated_nodes=updated_nodes,
+            removed_nodes=removed_nodes,
+            added_edges=sorted(added_edges),
+            removed_edges=sorted(removed_edges),
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return the graph in the ``build_graph`` dictionary format."""
+
+        nodes: Dict[str, Dict[str, object]] = {}
+        edges: List[Dict[str, object]] = []
+        occurrences: Dict[str, int] = {}
+        errors: List[str] = []
+        warnings: List[Dict[str, object]] = []
+        for unit in self._units.values():
+            for node_id in unit.nodes:
+                if node_id not in nodes:
+                    nodes[node_id] = self._owner(node_id).nodes[node_id]
+            for edge in unit.edges:
+                base_id = edge_base_id(edge["id"])
+                occurrence = occurrences.get(base_id, 0) + 1
+                occurrences[base_id] = occurrence
+                numbered = numbered_edge_id(base_id, occurrence)
+                if edge["id"] != numbered:
+                    edge = dict(edge, id=numbered)
+                edges.append(edge)
+            errors.extend(unit.errors)
+            warnings.extend(unit.warnings)
+        node_list = list(nodes.values())
+        if self.mode == "er_columns":
+            node_list = _with_table_columns(node_list)
+        return {
+            "dialect": self.dialect,
+            "mode": self.mode,
+            "meta": {
+                "statements": len(self._units),
+                "library": "sql_lineage",
+                "version": __version__,
+            },
+            "nodes": node_list,
+            "edges": edges,
+            "errors": errors,
+            "warnings": warnings,
+        }
+
+
+def _touched_bases(
+    previous: Optional[_GraphUnit], unit: Optional[_GraphUnit]
+) -> List[str]:
+    """Return the edge base ids of the replaced and the new unit."""
+
+    bases: Dict[str, None] = {}
+    for item in (previous, unit):
+        if item is not None:
+            bases.update(dict.fromkeys(item.edge_counts))
+    return list(bases)
+
+
+def _insert_owner(owners: List[_GraphUnit], unit: _GraphUnit) -> None:
+    """Insert a unit into an owner list kept sorted by statement index."""
+
+    position = len(owners)
+    while position and owners[position - 1].statement_index > unit.statement_index:
+        position -= 1
+    owners.insert(position, unit)
+
+
+def _with_table_columns(nodes: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Return nodes with table column lists computed across all statements."""
+
+    table_columns: Dict[str, List[str]] = {}
+    for node in nodes:
+        if node.get("type") == "column":
+            table_columns.setdefault(node.get("table_id", ""), []).append(
+                node.get("name", "")
+            )
+    result: List[Dict[str, object]] = []
+    for node in nodes:
+        if node.get("type") in {"table", "cte", "subquery"}:
+            columns = ensure_unique_columns(table_columns.get(node["id"], []))
+            node = dict(node, columns=columns)
+        result.append(node)
+    return result
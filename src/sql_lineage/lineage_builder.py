@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from sqlglot import exp
 
 from sql_lineage.context import AnalysisContext
 from sql_lineage.models import ColumnRef, Dependency, LineageData, LineageMapping
+from sql_lineage.scope import ExpressionScope, scan_expression
 
 
 def _unique_column_refs(inputs: List[ColumnRef]) -> List[ColumnRef]:
@@ -35,22 +36,26 @@ def _function_name(func: exp.Expression) -> str:
     return func.__class__.__name__.lower()
 
 
-def extract_functions(expression: exp.Expression, dialect: str) -> List[str]:
+def extract_functions(
+    expression: exp.Expression,
+    dialect: str,
+    scope: Optional[ExpressionScope] = None,
+) -> List[str]:
     """Extract function names from an expression."""
 
-    functions = [
-        _function_name(func) for func in expression.find_all((exp.Func, exp.Anonymous))
-    ]
+    if scope is None:
+        scope = scan_expression(expression)
+    functions = [_function_name(func) for func in scope.functions]
     if "coalesce" in functions and dialect == "mysql":
         # sqlglot normalizes IFNULL to COALESCE; expose the mysql alias for tests.
         functions.append("ifnull")
     return sorted(set(functions))
 
 
-def _extract_literals(expression: exp.Expression) -> List[str]:
-    """Extract literal values from an expression."""
+def _extract_literals(scope: ExpressionScope) -> List[str]:
+    """Extract literal values from a collected expression scope."""
 
-    return [str(literal.this) for literal in expression.find_all(exp.Literal)]
+    return [str(literal.this) for literal in scope.literals]
 
 
 def _resolve_column_ref(
@@ -61,7 +66,7 @@ def _resolve_column_ref(
     notes: List[Dict[str, str]] = []
     if column.table:
         return [ColumnRef(table=column.table, column=column.name)], notes
-    resolved = context.resolve_unqualified_column()
+    resolved = context.resolve_unqualified_column(column.name)
     if resolved is None:
         notes.append({"ambiguous_column": column.name})
         return [ColumnRef(table=None, column=column.name)], notes
@@ -69,24 +74,75 @@ def _resolve_column_ref(
 
 
 def _expand_cte_or_subquery_inputs(
-    column: ColumnRef, context: AnalysisContext
-) -> List[ColumnRef]:
-    """Expand a column reference through CTE or subquery lineage."""
+    column: ColumnRef,
+    context: AnalysisContext,
+) -> Tuple[List[ColumnRef], List[Dict[str, str]]]:
+    """Expand a column reference through CTE or subquery lineage.
+
+    Self-referencing sources and chains deeper than ``max_lineage_depth`` stop
+    expanding and are reported through notes.
+    """
+
+    inputs, notes, _height = _expand_column(column, context, set(), 0)
+    return inputs, notes
+
+
+def _expand_column(
+    column: ColumnRef,
+    context: AnalysisContext,
+    stack: Set[Tuple[str, str]],
+    depth: int,
+) -> Tuple[List[ColumnRef], List[Dict[str, str]], int]:
+    """Return the expansion of a column, its notes and its expansion height.
+
+    The height is the number of nested expansions below this one, or -1 when
+    the column does not expand. Only expansions that were not cut short are
+    memoized on the context per ``(source, column)`` pair, together with their
+    height, and a memoized expansion is reused only where the remaining depth
+    still covers it, so results do not depend on expansion order.
+    """
 
     if column.table is None:
-        return [column]
+        return [column], [], -1
+    key = (column.table, column.column)
+    cached = context.expansions.get(key)
+    if cached is not None and depth + cached[1] < context.max_lineage_depth:
+        return cached[0], [], cached[1]
     source = context.resolve_source(column.table)
-    if source is None:
-        return [column]
-    if source.source_type not in {"cte", "subquery"}:
-        return [column]
+    if source is None or source.source_type not in {"cte", "subquery"}:
+        return [column], [], -1
     expanded = source.output_inputs.get(column.column)
     if not expanded:
-        return [column]
+        return [column], [], -1
+    if key in stack:
+        return [column], [{"lineage_cycle": f"{column.table}.{column.column}"}], -1
+    if depth >= context.max_lineage_depth:
+        note = {"lineage_depth_limit": f"{column.table}.{column.column}"}
+        return [column], [note], -1
+    stack.add(key)
     results: List[ColumnRef] = [column]
+    notes: List[Dict[str, str]] = []
+    height = 0
     for item in expanded:
-        results.extend(_expand_cte_or_subquery_inputs(item, context))
-    return results
+        item_inputs, item_notes, item_height = _expand_column(
+            item, context, stack, depth + 1
+        )
+        results.extend(item_inputs)
+        _extend_notes(notes, item_notes)
+        height = max(height, item_height + 1)
+    stack.discard(key)
+    inputs = _unique_column_refs(results)
+    if not notes:
+        context.expansions[key] = (inputs, height)
+    return inputs, notes, height
+
+
+def _extend_notes(notes: List[Dict[str, str]], extra: List[Dict[str, str]]) -> None:
+    """Append notes that are not already present."""
+
+    for note in extra:
+        if note not in notes:
+            notes.append(note)
 
 
 def extract_lineage_data(
@@ -95,19 +151,24 @@ def extract_lineage_data(
     context: AnalysisContext,
     lineage_type: str,
     mapping_reason: str,
+    scope: Optional[ExpressionScope] = None,
 ) -> LineageData:
     """Extract lineage data for an expression with context-aware resolution."""
 
+    if scope is None:
+        scope = scan_expression(expression)
     inputs: List[ColumnRef] = []
     notes: List[Dict[str, str]] = []
-    for column in expression.find_all(exp.Column):
+    for column in scope.columns:
         resolved, column_notes = _resolve_column_ref(column, context)
         notes.extend(column_notes)
         for item in resolved:
-            inputs.extend(_expand_cte_or_subquery_inputs(item, context))
+            expanded, expansion_notes = _expand_cte_or_subquery_inputs(item, context)
+            inputs.extend(expanded)
+            _extend_notes(notes, expansion_notes)
     inputs = _unique_column_refs(inputs)
-    functions = extract_functions(expression, context.dialect)
-    literals = _extract_literals(expression)
+    functions = extract_functions(expression, context.dialect, scope)
+    literals = _extract_literals(scope)
     mapping_sources = [item for item in inputs if item.table is not None]
     mapping = [
         LineageMapping(
@@ -145,9 +206,8 @@ def build_dependencies(
         if item.column not in grouped[table_name]:
             grouped[table_name].append(item.column)
     if context is not None:
-        for source in context.report_sources:
-            if source.source_type == "table":
-                grouped.setdefault(source.name, [])
+        for table_name in context.report_table_names():
+            grouped.setdefault(table_name, [])
     return [
         Dependency(table=table, columns=columns) for table, columns in grouped.items()
     ]
@@ -0,0 +1,324 @@
+"""Indexed lineage graph with upstream, downstream and path traversal."""
+
+from __future__ import annotations
+
+import abc
+import json
+import os
+from collections import deque
+from typing import (
+    Container,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from sql_lineage.graph_utils import table_id
+
+# Edge types followed by traversal unless ``edge_types`` is given. ``contains``
+# links tables to their columns and is structural rather than lineage.
+LINEAGE_EDGE_TYPES = (
+    "lineage",
+    "uses",
+    "produces",
+    "union_with",
+    "col_lineage",
+    "table_lineage",
+)
+
+# Prefixes tried when a node is given by bare table or column name.
+NODE_PREFIXES = ("column:", "table:", "cte:")
+
+NodeRef = Union[str, Mapping[str, object]]
+_EdgeIndex = Dict[str, Dict[str, List[int]]]
+
+
+class GraphTraversal(abc.ABC):
+    """Breadth-first upstream, downstream and path traversal.
+
+    Subclasses resolve node references to internal keys with ``_key``, turn
+    keys back into node ids with ``_name`` and list the neighbor keys of a node
+    along or against edge direction with ``_neighbors``.
+    """
+
+    @abc.abstractmethod
+    def _key(self, node: NodeRef) -> Hashable:
+        """Return the internal key of a node reference."""
+
+    @abc.abstractmethod
+    def _name(self, key: Hashable) -> str:
+        """Return the node id of an internal key."""
+
+    @abc.abstractmethod
+    def _neighbors(
+        self, key: Hashable, forward: bool, edge_types: Optional[Tuple[str, ...]]
+    ) -> Iterable[Hashable]:
+        """Return the keys of a node's successors, or predecessors if not forward."""
+
+    def upstream(
+        self,
+        node: NodeRef,
+        depth: Optional[int] = None,
+        edge_types: Optional[Iterable[str]] = LINEAGE_EDGE_TYPES,
+    ) -> Iterator[Tuple[str, int]]:
+        """Yield ``(node_id, distance)`` for nodes the given node derives from.
+
+        Nodes are yielded in breadth-first order, nearest first, each once.
+        ``depth`` limits the number of hops; ``edge_types=None`` follows every
+        edge type including ``contains``.
+        """
+
+        return self._named(self._bfs(self._key(node), False, depth, edge_types))
+
+    def downstream(
+        self,
+        node: NodeRef,
+        depth: Optional[int] = None,
+        edge_types: Optional[Iterable[str]] = LINEAGE_EDGE_TYPES,
+    ) -> Iterator[Tuple[str, int]]:
+        """Yield ``(node_id, distance)`` for nodes derived from the given node.
+
+        Accepts the same options as ``upstream``.
+        """
+
+        return self._named(self._bfs(self._key(node), True, depth, edge_types))
+
+    def _named(
+        self, reached: Iterator[Tuple[Hashable, int]]
+    ) -> Iterator[Tuple[str, int]]:
+        for key, distance in reached:
+            yield self._name(key), distance
+
+    def _bfs(
+        self,
+        start: Hashable,
+        forward: bool,
+        depth: Optional[int],
+        edge_types: Optional[Iterable[str]],
+    ) -> Iterator[Tuple[Hashable, int]]:
+        types = None if edge_types is None else tuple(edge_types)
+        seen: Set[Hashable] = {start}
+        queue: Deque[Tuple[Hashable, int]] = deque([(start, 0)])
+        while queue:
+            current, distance = queue.popleft()
+            if depth is not None and distance >= depth:
+                continue
+            for neighbor in self._neighbors(current, forward, types):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append((neighbor, distance + 1))
+                    yield neighbor, distance + 1
+
+    def paths(
+        self,
+        source: NodeRef,
+        target: NodeRef,
+        depth: Optional[int] = None,
+        edge_types: Optional[Iterable[str]] = LINEAGE_EDGE_TYPES,
+    ) -> Iterator[List[str]]:
+        """Yield the simple paths from ``source`` down to ``target``, shortest first.
+
+        Each path is a list of node ids starting with ``source``. Only nodes
+        upstream of ``target`` are expanded, so no work is spent on branches
+        that cannot reach it.
+        """
+
+        return self._paths(self._key(source), self._key(target), depth, edge_types)
+
+    def _paths(
+        self,
+        start: Hashable,
+        goal: Hashable,
+        depth: Optional[int],
+        edge_types: Optional[Iterable[str]],
+    ) -> Iterator[List[str]]:
+        types = None if edge_types is None else tuple(edge_types)
+        reaches_goal = {key for key, _ in self._bfs(goal, False, depth, types)}
+        reaches_goal.add(goal)
+        if start not in reaches_goal:
+            return
+        if start == goal:
+            yield [self._name(start)]
+            return
+        queue: Deque[List[Hashable]] = deque([[start]])
+        while queue:
+            path = queue.popleft()
+            if depth is not None and len(path) > depth:
+                continue
+            expanded: Set[Hashable] = set()
+            for neighbor in self._neighbors(path[-1], True, types):
+                # Parallel edges of different types lead to the same path.
+                if neighbor in expanded or neighbor not in reaches_goal:
+                    continue
+                expanded.add(neighbor)
+                if neighbor in path:
+                    continue
+                if neighbor == goal:
+                    yield [self._name(key) for key in path + [neighbor]]
+                else:
+                    queue.append(path + [neighbor])
+
+
+class LineageGraph(GraphTraversal):
+    """Lineage graph dictionary with hash indexes over nodes and edges.
+
+    Nodes are indexed by id, type and owning table; edges by source and target
+    node and edge type. Traversal methods are generators that only touch the
+    edges of the nodes they reach. Node and edge dictionaries are shared with
+    the input graph, not copied.
+    """
+
+    def __init__(self, graph: Mapping[str, object]) -> None:
+        self.graph = graph
+        self.nodes: Dict[str, Dict[str, object]] = {}
+        self.edges: List[Dict[str, object]] = list(graph.get("edges", []))
+        self._by_type: Dict[str, List[str]] = {}
+        self._by_table: Dict[str, List[str]] = {}
+        self._out: _EdgeIndex = {}
+        self._in: _EdgeIndex = {}
+        for node in graph.get("nodes", []):
+            node_id = node["id"]
+            self.nodes[node_id] = node
+            self._by_type.setdefault(node["type"], []).append(node_id)
+            owner = node.get("table_id")
+            if owner:
+                self._by_table.setdefault(owner, []).append(node_id)
+        for position, edge in enumerate(self.edges):
+            edge_type = edge["type"]
+            self._out.setdefault(edge["from"], {}).setdefault(edge_type, []).append(
+                position
+            )
+            self._in.setdefault(edge["to"], {}).setdefault(edge_type, []).append(
+                position
+            )
+
+    @classmethod
+    def load(cls, source: Union[str, os.PathLike, TextIO]) -> LineageGraph:
+        """Load a graph from a JSON or NDJSON file path or text stream."""
+
+        from sql_lineage.serialization import load_ndjson
+
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            with open(path, "r", encoding="utf-8") as handle:
+                if path.endswith((".ndjson", ".jsonl")):
+                    return cls(load_ndjson(handle))
+                return cls(json.load(handle))
+        text = source.read()
+        first = text.lstrip()[:12]
+        if first.startswith('{"graph"'):
+            return cls(load_ndjson(text.splitlines()))
+        return cls(json.loads(text))
+
+    def to_dict(self) -> Mapping[str, object]:
+        """Return the underlying graph dictionary."""
+
+        return self.graph
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, str) and self._find(node) is not None
+
+    def node(self, node: NodeRef) -> Dict[str, object]:
+        """Return a node by id, table or column name, or node dictionary.
+
+        Raises ``KeyError`` for unknown nodes.
+        """
+
+        return self.nodes[self.node_id(node)]
+
+    def node_id(self, node: NodeRef) -> str:
+        """Resolve a node reference to a node id.
+
+        Accepts node ids, node dictionaries and bare names such as
+        ``"db.table"`` or ``"db.table.column"``.
+        """
+
+        if isinstance(node, Mapping):
+            node = str(node["id"])
+        found = self._find(node)
+        if found is None:
+            raise KeyError(node)
+        return found
+
+    def _find(self, node: str) -> Optional[str]:
+        return find_node_id(node, self.nodes)
+
+    def nodes_of_type(self, node_type: str) -> List[Dict[str, object]]:
+        """Return every node of a type."""
+
+        return [self.nodes[node_id] for node_id in self._by_type.get(node_type, [])]
+
+    def columns_of(self, table: NodeRef) -> List[Dict[str, object]]:
+        """Return the column nodes of a table, given its id or full name."""
+
+        if isinstance(table, Mapping):
+            owner = str(table["id"])
+        elif table in self.nodes:
+            owner = table
+        else:
+            owner = table_id(table)
+        return [self.nodes[node_id] for node_id in self._by_table.get(owner, [])]
+
+    def out_edges(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, object]]:
+        """Yield the edges leaving a node, optionally filtered by type."""
+
+        yield from self._edges(self._out, self.node_id(node), edge_types)
+
+    def in_edges(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict[str, object]]:
+        """Yield the edges entering a node, optionally filtered by type."""
+
+        yield from self._edges(self._in, self.node_id(node), edge_types)
+
+    def _edges(
+        self, index: _EdgeIndex, node_id: str, edge_types: Optional[Iterable[str]]
+    ) -> Iterator[Dict[str, object]]:
+        by_type = index.get(node_id)
+        if not by_type:
+            return
+        types = by_type if edge_types is None else edge_types
+        for edge_type in types:
+            for position in by_type.get(edge_type, ()):
+                yield self.edges[position]
+
+    def _key(self, node: NodeRef) -> str:
+        return self.node_id(node)
+
+    def _name(self, key: str) -> str:
+        return key
+
+    def _neighbors(
+        self, key: str, forward: bool, edge_types: Optional[Tuple[str, ...]]
+    ) -> Iterator[str]:
+        if forward:
+            for edge in self._edges(self._out, key, edge_types):
+                yield edge["to"]
+        else:
+            for edge in self._edges(self._in, key, edge_types):
+                yield edge["from"]
+
+
+def find_node_id(node: str, known: Container[str]) -> Optional[str]:
+    """Return the id of a node given by id or bare name, if it is known."""
+
+    if node in known:
+        return node
+    for prefix in NODE_PREFIXES:
+        if prefix + node in known:
+            return prefix + node
+    return None
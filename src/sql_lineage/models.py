@@ -2,23 +2,63 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
 
+_ModelT = TypeVar("_ModelT")
 
+
+def _slotted(cls: Type[_ModelT]) -> Type[_ModelT]:
+    """Rebuild a frozen dataclass with ``__slots__`` and no instance ``__dict__``.
+
+    ``dataclass(slots=True)`` needs Python 3.10. Pickling goes through
+    ``__getstate__``/``__setstate__`` because frozen instances reject setattr.
+    """
+
+    names = tuple(item.name for item in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    namespace["__getstate__"] = _slotted_getstate
+    namespace["__setstate__"] = _slotted_setstate
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _slotted_getstate(self) -> Tuple[object, ...]:
+    return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def _slotted_setstate(self, state: Tuple[object, ...]) -> None:
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+@_slotted
 @dataclass(frozen=True)
 class ColumnRef:
-    """Reference to a column with an optional table qualifier."""
+    """Reference to a column with an optional table qualifier.
+
+    Table and column names are interned, so references to the same column share
+    their strings across statements.
+    """
 
     table: Optional[str]
     column: str
 
+    def __post_init__(self) -> None:
+        if self.table is not None:
+            object.__setattr__(self, "table", sys.intern(self.table))
+        object.__setattr__(self, "column", sys.intern(self.column))
+
     def to_dict(self) -> Dict[str, Optional[str]]:
         """Serialize the column reference to a dictionary."""
 
         return {"table": self.table, "column": self.column}
 
 
+@_slotted
 @dataclass(frozen=True)
 class LineageMapping:
     """Mapping from an output column to its input sources."""
@@ -37,6 +77,7 @@ class LineageMapping:
         }
 
 
+@_slotted
 @dataclass(frozen=True)
 class LineageData:
     """Lineage metadata for an output column."""
@@ -61,6 +102,7 @@ class LineageData:
         }
 
 
+@_slotted
 @dataclass(frozen=True)
 class Dependency:
     """Dependency mapping for a column grouped by table."""
@@ -74,6 +116,7 @@ class Dependency:
         return {"table": self.table, "columns": self.columns}
 
 
+@_slotted
 @dataclass(frozen=True)
 class OutputColumn:
     """Metadata for an output column produced by a statement."""
@@ -94,18 +137,42 @@ class OutputColumn:
         }
 
 
+@_slotted
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """Result of analyzing a query expression (Select or Union)."""
+
+    sources: List[Dict[str, str]] = field(default_factory=list)
+    output_columns: List[OutputColumn] = field(default_factory=list)
+    joins: List[Dict[str, object]] = field(default_factory=list)
+    unions: List[QueryAnalysis] = field(default_factory=list)
+    subqueries: List[QueryAnalysis] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the query analysis to a dictionary."""
+
+        return {
+            "sources": self.sources,
+            "output": {"columns": [col.to_dict() for col in self.output_columns]},
+            "joins": self.joins,
+            "unions": [union.to_dict() for union in self.unions],
+            "subqueries": [subquery.to_dict() for subquery in self.subqueries],
+        }
+
+
+@_slotted
 @dataclass(frozen=True)
 class StatementAnalysis:
     """Result of analyzing a single SQL statement."""
 
     index: int
     statement_type: str
-    target: Optional[Dict[str, str]]
+    target: Optional[Dict[str, object]]
     output_columns: List[OutputColumn]
     sources: List[Dict[str, str]]
     joins: List[Dict[str, object]]
-    unions: List[Dict[str, object]]
-    subqueries: List[Dict[str, object]]
+    unions: List[QueryAnalysis]
+    subqueries: List[QueryAnalysis]
     errors: List[str]
 
     def to_dict(self) -> Dict[str, object]:
@@ -118,7 +185,26 @@ class StatementAnalysis:
             "output": {"columns": [col.to_dict() for col in self.output_columns]},
             "sources": self.sources,
             "joins": self.joins,
-            "unions": self.unions,
-            "subqueries": self.subqueries,
+            "unions": [union.to_dict() for union in self.unions],
+            "subqueries": [subquery.to_dict() for subquery in self.subqueries],
+            "errors": self.errors,
+        }
+
+
+@_slotted
+@dataclass(frozen=True)
+class AnalysisResult:
+    """Result of analyzing a SQL script."""
+
+    dialect: str
+    statements: List[StatementAnalysis]
+    errors: List[str]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the analysis result to a dictionary."""
+
+        return {
+            "dialect": self.dialect,
+            "statements": [statement.to_dict() for statement in self.statements],
             "errors": self.errors,
         }
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, TextIO, Tuple
 
 from sqlglot import exp, parse
+from sqlglot.dialects.dialect import Dialect
+from sqlglot.tokens import TokenType
 
 
 @dataclass(frozen=True)
@@ -15,6 +18,7 @@ class StatementParseResult:
     expression: exp.Expression
     target: Optional[exp.Table]
     statement_type: str
+    target_columns: Tuple[str, ...] = ()
 
 
 def _statement_type(expression: exp.Expression) -> str:
@@ -32,20 +36,286 @@ def _statement_type(expression: exp.Expression) -> str:
 
 
 def parse_sql(sql: str, dialect: str) -> List[StatementParseResult]:
-    """Parse SQL into AST statements and extract metadata."""
+    """Parse SQL into AST statements and extract metadata.
+
+    Comment-only SQL parses to ``None`` and yields no statement.
+    """
 
     expressions = parse(sql, read=dialect)
     statements: List[StatementParseResult] = []
     for expression in expressions:
+        if expression is None:
+            continue
         target: Optional[exp.Table] = None
+        target_columns: Tuple[str, ...] = ()
         if isinstance(expression, exp.Create):
             if isinstance(expression.this, exp.Table):
                 target = expression.this
+        elif isinstance(expression, exp.Insert):
+            destination = expression.this
+            if isinstance(destination, exp.Schema):
+                target_columns = tuple(
+                    column.name for column in destination.expressions
+                )
+                destination = destination.this
+            if isinstance(destination, exp.Table):
+                target = destination
         statements.append(
             StatementParseResult(
                 expression=expression,
                 target=target,
                 statement_type=_statement_type(expression),
+                target_columns=target_columns,
             )
         )
     return statements
+
+
+DEFAULT_MAX_STATEMENT_SIZE = 64 * 1024 * 1024
+
+_CODE_PATTERN = re.compile(r"[;'\"`]|--|/\*")
+_QUOTE_PATTERNS = {quote: re.compile(re.escape(quote)) for quote in "'\"`"}
+
+
+@dataclass(frozen=True)
+class StatementChunk:
+    """Source text of a single statement within a script.
+
+    A chunk with an ``error`` could not be split out, for example because the
+    statement exceeded the streaming size limit, and carries no SQL.
+    """
+
+    sql: str
+    start: int
+    end: int
+    error: Optional[str] = None
+
+
+def _tokenize(sql: str, dialect: str):
+    """Tokenize SQL with the dialect tokenizer, falling back to the default."""
+
+    try:
+        return Dialect.get_or_raise(dialect).tokenize(sql)
+    except ValueError:
+        return Dialect().tokenize(sql)
+
+
+def _chunk_tokens(
+    sql: str, tokens, offset: int, final: bool
+) -> Tuple[List[StatementChunk], int]:
+    """Group tokens into statement chunks.
+
+    Returns the chunks and the position in ``sql`` where the unterminated tail
+    starts. The tail is only emitted as a chunk when ``final`` is True.
+    """
+
+    chunks: List[StatementChunk] = []
+    first = None
+    last = None
+    tail = 0
+    for token in tokens:
+        if token.token_type == TokenType.SEMICOLON:
+            if first is not None:
+                chunks.append(
+                    StatementChunk(
+                        sql=sql[first.start : last.end + 1],
+                        start=offset + first.start,
+                        end=offset + last.end + 1,
+                    )
+                )
+            first = last = None
+            tail = token.end + 1
+            continue
+        if first is None:
+            first = token
+        last = token
+    if final and first is not None:
+        chunks.append(
+            StatementChunk(
+                sql=sql[first.start : last.end + 1],
+                start=offset + first.start,
+                end=offset + last.end + 1,
+            )
+        )
+    return chunks, tail
+
+
+def _scan_boundaries(
+    sql: str, position: int, state: str, final: bool
+) -> Tuple[List[int], int, str]:
+    """Find top-level semicolons without the tokenizer.
+
+    Single, double and backtick quotes with doubled-quote escapes, ``--`` line
+    comments and ``/* */`` block comments are skipped. Scanning starts at
+    ``position`` in ``state`` (``""`` for code, a quote character, ``"--"`` or
+    ``"/*"``) and returns the semicolon positions with the position and state
+    to resume from once more text is appended. Unless ``final`` is True,
+    scanning stops before a trailing character whose meaning depends on the
+    next one.
+    """
+
+    boundaries: List[int] = []
+    size = len(sql)
+    while position < size:
+        if state == "":
+            match = _CODE_PATTERN.search(sql, position)
+            if match is None:
+                partial = not final and sql[-1] in "-/"
+                position = size - 1 if partial else size
+                break
+            token = match.group()
+            if token == ";":
+                boundaries.append(match.start())
+            else:
+                state = token
+            position = match.end()
+        elif state == "--":
+            found = sql.find("\n", position)
+            if found == -1:
+                position = size
+                break
+            state = ""
+            position = found + 1
+        elif state == "/*":
+            found = sql.find("*/", position)
+            if found == -1:
+                partial = not final and sql[-1] == "*"
+                position = size - 1 if partial else size
+                break
+            state = ""
+            position = found + 2
+        else:
+            match = _QUOTE_PATTERNS[state].search(sql, position)
+            if match is None:
+                position = size
+                break
+            found = match.start()
+            if found + 1 == size and not final:
+                position = found
+                break
+            if found + 1 < size and sql[found + 1] == state:
+                position = found + 2
+                continue
+            state = ""
+            position = found + 1
+    return boundaries, position, state
+
+
+def _scan_chunks(sql: str, offset: int) -> List[StatementChunk]:
+    """Split SQL on semicolons found by ``_scan_boundaries``."""
+
+    boundaries, _position, _state = _scan_boundaries(sql, 0, "", final=True)
+    chunks: List[StatementChunk] = []
+    start = 0
+    for end in boundaries + [len(sql)]:
+        text = sql[start:end]
+        stripped = text.strip()
+        if stripped:
+            first = start + len(text) - len(text.lstrip())
+            chunks.append(
+                StatementChunk(
+                    sql=stripped,
+                    start=offset + first,
+                    end=offset + first + len(stripped),
+                )
+            )
+        start = end + 1
+    return chunks
+
+
+def _iter_chunks(sql: str, dialect: str, offset: int) -> Iterator[StatementChunk]:
+    """Split complete SQL text into chunks, starting offsets at ``offset``."""
+
+    try:
+        tokens = _tokenize(sql, dialect)
+    except Exception:
+        yield from _scan_chunks(sql, offset)
+        return
+    chunks, _tail = _chunk_tokens(sql, tokens, offset, final=True)
+    yield from chunks
+
+
+def iter_statement_chunks(sql: str, dialect: str) -> Iterator[StatementChunk]:
+    """Split a script into statement chunks on top-level semicolons.
+
+    Splitting uses the tokenizer only, so strings and comments containing
+    semicolons are handled without building ASTs. If the script cannot be
+    tokenized, it is split on semicolons outside of quotes and comments.
+    """
+
+    return _iter_chunks(sql, dialect, 0)
+
+
+def iter_stream_chunks(
+    stream: TextIO,
+    dialect: str,
+    block_size: int = 1024 * 1024,
+    max_statement_size: int = DEFAULT_MAX_STATEMENT_SIZE,
+) -> Iterator[StatementChunk]:
+    """Incrementally split a text stream into statement chunks.
+
+    Each block is scanned once for candidate semicolons outside of quotes and
+    comments, and only the text up to the last candidate is tokenized; the
+    tokenizer decides the actual boundaries. Only the unterminated tail is
+    buffered. A statement longer than ``max_statement_size`` characters is
+    skipped up to the next candidate semicolon and reported as an error chunk,
+    so memory stays bounded by the block size and the size limit.
+    """
+
+    buffer = ""
+    offset = 0
+    position = 0
+    state = ""
+    skipped: Optional[int] = None
+    while True:
+        block = stream.read(block_size)
+        final = not block
+        buffer += block
+        boundaries, position, state = _scan_boundaries(buffer, position, state, final)
+        if skipped is not None:
+            if not boundaries and not final:
+                buffer = buffer[position:]
+                offset += position
+                position = 0
+                continue
+            end = boundaries[0] if boundaries else len(buffer)
+            yield StatementChunk(
+                sql="",
+                start=skipped,
+                end=offset + end,
+                error=f"Statement exceeds {max_statement_size} characters",
+            )
+            cut = min(end + 1, len(buffer))
+            buffer = buffer[cut:]
+            offset += cut
+            position -= cut
+            boundaries = [boundary - cut for boundary in boundaries[1:]]
+            skipped = None
+        if final:
+            break
+        if boundaries:
+            complete = buffer[: boundaries[-1] + 1]
+            try:
+                tokens = _tokenize(complete, dialect)
+            except Exception:
+                # The tokenizer disagrees with the scan, for example inside a
+                # dialect-specific string; wait for the next candidate.
+                tokens = None
+            if tokens is not None:
+                chunks, tail = _chunk_tokens(complete, tokens, offset, final=False)
+                yield from chunks
+                buffer = buffer[tail:]
+                offset += tail
+                position -= tail
+        if len(buffer) > max_statement_size:
+            skipped = offset + len(buffer) - len(buffer.lstrip())
+            buffer = buffer[position:]
+            offset += position
+            position = 0
+    yield from _iter_chunks(buffer, dialect, offset)
+
+
+def split_statements(sql: str, dialect: str) -> List[StatementChunk]:
+    """Split a script into statement chunks."""
+
+    return list(iter_statement_chunks(sql, dialect))
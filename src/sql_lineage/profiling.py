@@ -0,0 +1,162 @@
+"""Opt-in per-phase timing of the analysis and graph pipeline."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List, Optional, Protocol, TypeVar
+
+PHASES = ("split", "parse", "context", "lineage", "graph", "export")
+
+_ResultT = TypeVar("_ResultT")
+
+
+class Tracer(Protocol):
+    """Receives the start and end of every instrumented phase.
+
+    ``statement`` is the 1-based statement index, or None for phases that span
+    the whole script. ``nodes`` is the number of AST nodes the phase worked on,
+    or the number of graph nodes for the ``graph`` and ``export`` phases.
+    Phases nest: ``context`` analyzes CTEs and derived tables, which record
+    their own ``context`` and ``lineage`` phases.
+    """
+
+    def enter(self, phase: str, statement: Optional[int]) -> None:
+        """Called before a phase starts."""
+
+    def exit(
+        self, phase: str, statement: Optional[int], seconds: float, nodes: int
+    ) -> None:
+        """Called after a phase ends, including when it raised."""
+
+
+class PhaseStats:
+    """Accumulated calls, wall time and node counts of one phase."""
+
+    __slots__ = ("calls", "seconds", "self_seconds", "nodes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.self_seconds = 0.0
+        self.nodes = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the statistics to a dictionary."""
+
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "self_seconds": round(self.self_seconds, 6),
+            "nodes": self.nodes,
+        }
+
+
+class TimingCollector:
+    """Tracer aggregating phase statistics per script and per statement.
+
+    ``seconds`` includes nested phases; ``self_seconds`` excludes them, so the
+    self times of all phases add up to the traced wall time. Passing a collector
+    as ``tracer`` to ``analyze`` or ``build_graph`` attaches ``to_dict()`` to the
+    result under ``meta.timings``.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseStats] = {}
+        self.statements: Dict[int, Dict[str, PhaseStats]] = {}
+        # Time spent in nested phases of each open phase.
+        self._children: List[float] = []
+
+    def enter(self, phase: str, statement: Optional[int]) -> None:
+        self._children.append(0.0)
+
+    def exit(
+        self, phase: str, statement: Optional[int], seconds: float, nodes: int
+    ) -> None:
+        children = self._children.pop()
+        if self._children:
+            self._children[-1] += seconds
+        targets = [self.phases]
+        if statement is not None:
+            targets.append(self.statements.setdefault(statement, {}))
+        for phases in targets:
+            stats = phases.get(phase)
+            if stats is None:
+                stats = phases[phase] = PhaseStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.self_seconds += seconds - children
+            stats.nodes += nodes
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the collected timings to a dictionary."""
+
+        return {
+            "phases": _phases_dict(self.phases),
+            "statements": [
+                {"index": index, "phases": _phases_dict(phases)}
+                for index, phases in sorted(self.statements.items())
+            ],
+        }
+
+
+def _phases_dict(phases: Dict[str, PhaseStats]) -> Dict[str, object]:
+    """Serialize phases in pipeline order."""
+
+    order = {name: position for position, name in enumerate(PHASES)}
+    return {
+        name: phases[name].to_dict()
+        for name in sorted(phases, key=lambda name: (order.get(name, len(order)), name))
+    }
+
+
+def count_nodes(expression: object) -> int:
+    """Return the number of AST nodes under a sqlglot expression."""
+
+    if expression is None:
+        return 0
+    return sum(1 for _node in expression.walk())
+
+
+def traced(
+    tracer: Optional[Tracer],
+    phase: str,
+    statement: Optional[int],
+    nodes: object,
+    function: Callable[..., _ResultT],
+    *args: object,
+    **kwargs: object,
+) -> _ResultT:
+    """Call ``function`` and report it to ``tracer`` as ``phase``.
+
+    ``nodes`` is a node count, an AST expression or a callable that counts the
+    nodes of the result. Nodes are counted outside the timed call and only when
+    tracing; without a tracer this is a plain call.
+    """
+
+    if tracer is None:
+        return function(*args, **kwargs)
+    tracer.enter(phase, statement)
+    started = time.perf_counter()
+    result = None
+    try:
+        result = function(*args, **kwargs)
+        return result
+    finally:
+        seconds = time.perf_counter() - started
+        if callable(nodes):
+            node_count = nodes(result) if result is not None else 0
+        elif isinstance(nodes, int):
+            node_count = nodes
+        else:
+            node_count = count_nodes(nodes)
+        tracer.exit(phase, statement, seconds, node_count)
+
+
+def attach_timings(
+    result: Dict[str, object], tracer: Optional[Tracer]
+) -> Dict[str, object]:
+    """Add a collector's timings to ``result["meta"]["timings"]``."""
+
+    if isinstance(tracer, TimingCollector):
+        result["meta"] = {**result.get("meta", {}), "timings": tracer.to_dict()}
+    return result
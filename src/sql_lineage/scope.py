@@ -0,0 +1,80 @@
+"""Single-pass scope collection for SQL lineage analysis."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Tuple
+
+from sqlglot import exp
+
+
+@dataclass
+class ExpressionScope:
+    """Columns, functions, and literals referenced by one expression."""
+
+    columns: List[exp.Column] = field(default_factory=list)
+    functions: List[exp.Expression] = field(default_factory=list)
+    literals: List[exp.Literal] = field(default_factory=list)
+
+
+@dataclass
+class SelectScope:
+    """Nodes collected from a Select expression in a single traversal."""
+
+    select: exp.Select
+    items: List[ExpressionScope]
+    subqueries: List[exp.Subquery] = field(default_factory=list)
+    joins: List[exp.Join] = field(default_factory=list)
+    ctes: List[exp.CTE] = field(default_factory=list)
+
+
+def _record(scope: ExpressionScope, node: exp.Expression) -> None:
+    """Record a node in an expression scope if it is of interest."""
+
+    if isinstance(node, exp.Column):
+        scope.columns.append(node)
+    elif isinstance(node, exp.Literal):
+        scope.literals.append(node)
+    elif isinstance(node, (exp.Func, exp.Anonymous)):
+        scope.functions.append(node)
+
+
+def scan_expression(expression: exp.Expression) -> ExpressionScope:
+    """Collect columns, functions, and literals from an expression in one pass."""
+
+    scope = ExpressionScope()
+    for node in expression.bfs():
+        _record(scope, node)
+    return scope
+
+
+def build_select_scope(select: exp.Select) -> SelectScope:
+    """Walk a Select once and collect everything the analyzer consumes.
+
+    Nodes are visited breadth-first, so every list preserves the order that
+    ``find_all`` would produce for the same expression.
+    """
+
+    items = [ExpressionScope() for _ in select.expressions]
+    scope = SelectScope(select=select, items=items)
+    with_clause = select.args.get("with") or select.args.get("with_")
+    queue: Deque[Tuple[exp.Expression, Optional[ExpressionScope]]] = deque()
+    for child in select.iter_expressions():
+        item: Optional[ExpressionScope] = None
+        if child.arg_key == "expressions":
+            item = items[child.index]
+        queue.append((child, item))
+    while queue:
+        node, item = queue.popleft()
+        if item is not None:
+            _record(item, node)
+        if isinstance(node, exp.Subquery):
+            scope.subqueries.append(node)
+        elif isinstance(node, exp.Join) and node.parent is select:
+            scope.joins.append(node)
+        elif isinstance(node, exp.CTE) and node.parent is with_clause:
+            scope.ctes.append(node)
+        for child in node.iter_expressions():
+            queue.append((child, item))
+    return scope
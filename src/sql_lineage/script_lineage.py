@@ -0,0 +1,284 @@
+"""Cross-statement column lineage for multi-statement scripts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sql_lineage.graph_utils import normalize_full_name, split_table_name
+from sql_lineage.models import ColumnRef, StatementAnalysis
+
+
+@dataclass(frozen=True)
+class ResolvedColumn:
+    """Output column lineage resolved through earlier statements."""
+
+    name: str
+    sources: List[ColumnRef]
+    via: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the resolved column to a dictionary."""
+
+        return {
+            "name": self.name,
+            "sources": [source.to_dict() for source in self.sources],
+            "via": self.via,
+        }
+
+
+@dataclass(frozen=True)
+class ResolvedStatement:
+    """Resolved lineage for every output column of one statement."""
+
+    index: int
+    target: Optional[str]
+    columns: List[ResolvedColumn]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the resolved statement to a dictionary."""
+
+        return {
+            "index": self.index,
+            "target": self.target,
+            "columns": [column.to_dict() for column in self.columns],
+        }
+
+
+class ScriptLineage:
+    """Index of statement targets used to resolve lineage across statements.
+
+    Statements are added in script order. Each target table maps to its
+    resolved columns, and references to a target in later statements are
+    resolved through that index. ``CREATE`` replaces a table's columns, while
+    ``INSERT`` merges into them, matching output columns to the explicit column
+    list or, without one, to the known columns by position. Lookups are
+    dictionary based, so resolution is linear in the size of the script.
+    """
+
+    def __init__(self) -> None:
+        self.statements: List[ResolvedStatement] = []
+        self._tables: Dict[str, Tuple[int, Dict[str, ResolvedColumn]]] = {}
+        # Statements that wrote each column of each target table.
+        self._writers: Dict[str, Dict[str, List[int]]] = {}
+
+    def add_statement(self, statement: StatementAnalysis) -> ResolvedStatement:
+        """Resolve a statement against earlier ones and index its target."""
+
+        aliases: Dict[str, Dict[str, str]] = {}
+        names: Dict[str, Dict[str, str]] = {}
+        for source in statement.sources:
+            name = source.get("name", "")
+            names[name] = source
+            # An alias equal to the table name is not recorded, so fall back to
+            # the unqualified table name.
+            aliases[source.get("alias") or split_table_name(name)[1]] = source
+
+        columns: List[ResolvedColumn] = []
+        for output_column in statement.output_columns:
+            if output_column.name == "*":
+                # The analyzer leaves only stars over relations with unknown
+                # columns, recorded as one ``t.*`` input per outer relation.
+                tables = [
+                    _ref_table(ref, aliases, names)
+                    for ref in output_column.lineage.inputs
+                    if ref.column == "*"
+                ]
+                columns.extend(self._expand_star(_unique_tables(tables)))
+                continue
+            sources: List[ColumnRef] = []
+            via: List[int] = []
+            for ref in output_column.lineage.inputs:
+                table = _ref_table(ref, aliases, names)
+                if table is not None:
+                    self._resolve_ref(table, ref.column, sources, via)
+            columns.append(
+                ResolvedColumn(
+                    name=output_column.name,
+                    sources=_unique_refs(sources),
+                    via=_unique_ints(via),
+                )
+            )
+
+        target = None
+        if statement.target:
+            target = normalize_full_name(
+                statement.target.get("database", ""), statement.target.get("name", "")
+            )
+            columns = self._index_target(target, statement, columns)
+        resolved = ResolvedStatement(
+            index=statement.index, target=target, columns=columns
+        )
+        self.statements.append(resolved)
+        return resolved
+
+    def _index_target(
+        self, table: str, statement: StatementAnalysis, columns: List[ResolvedColumn]
+    ) -> List[ResolvedColumn]:
+        """Record the columns a statement writes to ``table`` and return them."""
+
+        entry = self._tables.get(table)
+        if statement.statement_type != "insert" or entry is None:
+            names = statement.target.get("columns") or []
+            if names:
+                columns = _rename_columns(columns, names)
+            self._tables[table] = (
+                statement.index,
+                {column.name: column for column in columns},
+            )
+            self._writers[table] = {
+                column.name: [statement.index] for column in columns
+            }
+            return columns
+        _index, existing = entry
+        names = statement.target.get("columns") or list(existing)
+        columns = _rename_columns(columns, names)
+        merged = dict(existing)
+        writers = self._writers[table]
+        for column in columns:
+            previous = merged.get(column.name)
+            if previous is not None:
+                column = ResolvedColumn(
+                    name=column.name,
+                    sources=_unique_refs(previous.sources + column.sources),
+                    via=_unique_ints(previous.via + column.via),
+                )
+            merged[column.name] = column
+            writers.setdefault(column.name, []).append(statement.index)
+        self._tables[table] = (statement.index, merged)
+        return columns
+
+    def _resolve_ref(
+        self, table: str, column: str, sources: List[ColumnRef], via: List[int]
+    ) -> None:
+        """Append the base columns behind ``table.column`` to ``sources``."""
+
+        entry = self._tables.get(table)
+        if entry is None:
+            sources.append(ColumnRef(table=table, column=column))
+            return
+        _index, table_columns = entry
+        writers = self._writers[table]
+        if column == "*":
+            resolved = list(table_columns.values())
+        else:
+            found = table_columns.get(column)
+            resolved = [found] if found is not None else []
+        if not resolved:
+            sources.append(ColumnRef(table=table, column=column))
+            return
+        for item in resolved:
+            sources.extend(item.sources)
+            via.extend(writers[item.name])
+            via.extend(item.via)
+
+    def _expand_star(self, tables: Iterable[str]) -> List[ResolvedColumn]:
+        """Expand a star over tables produced by earlier statements."""
+
+        columns: List[ResolvedColumn] = []
+        for name in tables:
+            entry = self._tables.get(name)
+            if entry is None:
+                columns.append(
+                    ResolvedColumn(
+                        name="*", sources=[ColumnRef(table=name, column="*")]
+                    )
+                )
+                continue
+            writers = self._writers[name]
+            for column in entry[1].values():
+                columns.append(
+                    ResolvedColumn(
+                        name=column.name,
+                        sources=column.sources,
+                        via=_unique_ints(writers[column.name] + column.via),
+                    )
+                )
+        return columns
+
+    def table_columns(self, table: str) -> Optional[Dict[str, ResolvedColumn]]:
+        """Return the resolved columns of a table written by earlier statements."""
+
+        entry = self._tables.get(table)
+        return entry[1] if entry else None
+
+    def column_sources(self, table: str, column: str) -> List[ColumnRef]:
+        """Return the base columns a target column ultimately derives from."""
+
+        columns = self.table_columns(table) or {}
+        found = columns.get(column)
+        return list(found.sources) if found else []
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize resolved statements and the target index."""
+
+        return {
+            "statements": [statement.to_dict() for statement in self.statements],
+            "tables": {
+                table: {
+                    "statement_index": index,
+                    "columns": [column.to_dict() for column in columns.values()],
+                }
+                for table, (index, columns) in self._tables.items()
+            },
+        }
+
+
+def resolve_script_lineage(statements: Iterable[StatementAnalysis]) -> ScriptLineage:
+    """Resolve column lineage across the statements of a script."""
+
+    lineage = ScriptLineage()
+    for statement in statements:
+        lineage.add_statement(statement)
+    return lineage
+
+
+def _rename_columns(
+    columns: List[ResolvedColumn], names: List[str]
+) -> List[ResolvedColumn]:
+    """Name output columns after the target columns they fill, by position.
+
+    Columns are kept as they are when an unexpanded star makes positions unknown.
+    """
+
+    if any(column.name == "*" for column in columns):
+        return columns
+    return [
+        ResolvedColumn(name=name, sources=column.sources, via=column.via)
+        for name, column in zip(names, columns)
+    ]
+
+
+def _ref_table(
+    ref: ColumnRef,
+    aliases: Dict[str, Dict[str, str]],
+    names: Dict[str, Dict[str, str]],
+) -> Optional[str]:
+    """Return the table a reference reads from, or None for derived relations."""
+
+    if ref.table is None:
+        return None
+    source = aliases.get(ref.table) or names.get(ref.table)
+    if source is None:
+        return ref.table
+    if source.get("type") != "table":
+        return None
+    return source.get("name", ref.table)
+
+
+def _unique_tables(tables: List[Optional[str]]) -> List[str]:
+    """Drop missing tables and duplicates while preserving order."""
+
+    return [table for table in dict.fromkeys(tables) if table is not None]
+
+
+def _unique_refs(refs: List[ColumnRef]) -> List[ColumnRef]:
+    """Deduplicate column references while preserving order."""
+
+    return list(dict.fromkeys(refs))
+
+
+def _unique_ints(values: List[int]) -> List[int]:
+    """Deduplicate integers while preserving order."""
+
+    return list(dict.fromkeys(values))
@@ -0,0 +1,224 @@
+"""Streaming JSON writers for analysis results and graphs."""
+
+from __future__ import annotations
+
+import io
+import json
+from typing import (
+    Callable,
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from sql_lineage.models import AnalysisResult
+
+STYLES = ("pretty", "compact", "ndjson")
+BACKENDS = ("json", "orjson")
+
+_NDJSON_LISTS = {"statement": "statements", "node": "nodes", "edge": "edges"}
+
+_Encoder = Callable[[object], str]
+_Writer = Callable[[str], object]
+
+
+def dump_analysis(
+    fp: IO,
+    analysis: Union[AnalysisResult, Mapping[str, object]],
+    style: str = "pretty",
+    backend: Optional[str] = None,
+) -> None:
+    """Write an analysis result to a text or binary stream.
+
+    ``analysis`` is a typed ``AnalysisResult`` or an ``analyze`` dictionary.
+    Typed statements are converted to dictionaries one at a time, so the full
+    result dictionary is never built. ``pretty`` output is identical to
+    ``json.dumps(result, indent=2, ensure_ascii=False)``, ``compact`` has no
+    whitespace, and ``ndjson`` writes one ``{"analysis": ...}`` header line
+    followed by one ``{"statement": ...}`` line per statement.
+    """
+
+    if isinstance(analysis, AnalysisResult):
+        fields: List[Tuple[str, object]] = [
+            ("dialect", analysis.dialect),
+            (
+                "statements",
+                (statement.to_dict() for statement in analysis.statements),
+            ),
+            ("errors", analysis.errors),
+        ]
+    else:
+        fields = list(analysis.items())
+    _dump(fp, fields, style, backend, "analysis", {"statements": "statement"})
+
+
+def dump_graph(
+    fp: IO,
+    graph: Mapping[str, object],
+    style: str = "pretty",
+    backend: Optional[str] = None,
+) -> None:
+    """Write a graph to a text or binary stream, one node or edge at a time.
+
+    ``pretty`` output is identical to ``export_graph(graph, "json")``. The
+    ``ndjson`` style writes a ``{"graph": ...}`` header line holding every key
+    except nodes and edges, then one ``{"node": ...}`` or ``{"edge": ...}`` line
+    per item.
+    """
+
+    _dump(
+        fp,
+        list(graph.items()),
+        style,
+        backend,
+        "graph",
+        {"nodes": "node", "edges": "edge"},
+    )
+
+
+def load_ndjson(fp: Iterable[Union[str, bytes]]) -> Dict[str, object]:
+    """Rebuild an analysis or graph dictionary from NDJSON written here."""
+
+    result: Dict[str, object] = {}
+    for line in fp:
+        if not line.strip():
+            continue
+        ((kind, value),) = json.loads(line).items()
+        if kind == "analysis":
+            result = {**value, "statements": []}
+        elif kind == "graph":
+            result = {**value, "nodes": [], "edges": []}
+        else:
+            result[_NDJSON_LISTS[kind]].append(value)
+    return _ordered(result)
+
+
+def _ordered(result: Dict[str, object]) -> Dict[str, object]:
+    """Restore the key order used by ``analyze`` and ``build_graph``."""
+
+    if "mode" in result:
+        order = ["dialect", "mode", "meta", "nodes", "edges", "errors", "warnings"]
+    else:
+        order = ["dialect", "statements", "errors"]
+    known = [key for key in order if key in result]
+    return {
+        **{key: result[key] for key in known},
+        **{key: value for key, value in result.items() if key not in known},
+    }
+
+
+def _dump(
+    fp: IO,
+    fields: List[Tuple[str, object]],
+    style: str,
+    backend: Optional[str],
+    header: str,
+    streamed: Dict[str, str],
+) -> None:
+    if style not in STYLES:
+        raise ValueError(f"Unsupported JSON style: {style}")
+    write = _writer(fp)
+    if style == "ndjson":
+        encode = _encoder(backend, indent=False)
+        head = {key: value for key, value in fields if key not in streamed}
+        write(encode({header: head}) + "\n")
+        for key, value in fields:
+            if key in streamed:
+                for item in value:
+                    write(encode({streamed[key]: item}) + "\n")
+        return
+    encode = _encoder(backend, indent=style == "pretty")
+    for chunk in _object_chunks(fields, set(streamed), encode, style == "pretty"):
+        write(chunk)
+
+
+def _object_chunks(
+    fields: List[Tuple[str, object]],
+    streamed: Iterable[str],
+    encode: _Encoder,
+    pretty: bool,
+) -> Iterator[str]:
+    """Yield the JSON text of an object, streaming the items of some lists."""
+
+    if not fields:
+        yield "{}"
+        return
+    separator = ",\n  " if pretty else ","
+    colon = ": " if pretty else ":"
+    yield "{\n  " if pretty else "{"
+    for position, (key, value) in enumerate(fields):
+        if position:
+            yield separator
+        yield encode(key) + colon
+        if key in streamed:
+            yield from _array_chunks(value, encode, pretty)
+        else:
+            yield _indent(encode(value), "  ") if pretty else encode(value)
+    yield "\n}" if pretty else "}"
+
+
+def _array_chunks(
+    items: Iterable[object], encode: _Encoder, pretty: bool
+) -> Iterator[str]:
+    """Yield the JSON text of an array one item at a time."""
+
+    empty = True
+    for item in items:
+        if empty:
+            yield "[\n    " if pretty else "["
+            empty = False
+        else:
+            yield ",\n    " if pretty else ","
+        yield _indent(encode(item), "    ") if pretty else encode(item)
+    if empty:
+        yield "[]"
+    else:
+        yield "\n  ]" if pretty else "]"
+
+
+def _indent(text: str, prefix: str) -> str:
+    """Indent the continuation lines of pretty JSON by ``prefix``.
+
+    Encoded strings never contain raw newlines, so every newline is a line
+    break between JSON tokens.
+    """
+
+    return text.replace("\n", "\n" + prefix)
+
+
+def _encoder(backend: Optional[str], indent: bool) -> _Encoder:
+    """Return a function encoding one value to JSON text."""
+
+    if backend is None:
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            backend = "json"
+        else:
+            backend = "orjson"
+    if backend == "orjson":
+        import orjson
+
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return lambda value: orjson.dumps(value, option=option).decode("utf-8")
+    if backend != "json":
+        raise ValueError(f"Unsupported JSON backend: {backend}")
+    if indent:
+        return lambda value: json.dumps(value, indent=2, ensure_ascii=False)
+    return lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _writer(fp: IO) -> _Writer:
+    """Return a function writing text to a text or binary stream."""
+
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(
+        fp, "mode", ""
+    ):
+        return lambda text: fp.write(text.encode("utf-8"))
+    return fp.write
@@ -0,0 +1,547 @@
+"""Long-running JSON-RPC lineage server on asyncio."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sql_lineage.cache import AnalysisCache
+from sql_lineage.catalog import CatalogSource, SchemaCatalog, load_catalog
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_BUSY = -32000
+REQUEST_TIMEOUT = -32001
+
+_STRING_PARAMS = ("sql", "dialect", "mode", "format")
+
+
+def _run_analyze(params: Dict[str, object]) -> Dict[str, object]:
+    from sql_lineage.analyzer import analyze
+
+    return analyze(
+        params["sql"],
+        dialect=params.get("dialect", "clickhouse"),
+        catalog=params.get("catalog"),
+    )
+
+
+def _run_graph(params: Dict[str, object]) -> Dict[str, object]:
+    from sql_lineage.graph import build_graph
+
+    # The timestamp is added by the server so cached graphs get a fresh one.
+    return build_graph(
+        params["sql"],
+        dialect=params.get("dialect", "clickhouse"),
+        mode=params.get("mode", "full"),
+        include_timestamp=False,
+        catalog=params.get("catalog"),
+    )
+
+
+def _run_export(params: Dict[str, object]) -> str:
+    from sql_lineage.exporters import export_graph
+
+    return export_graph(_run_graph(params), format=params.get("format", "json"))
+
+
+METHODS: Dict[str, Callable[[Dict[str, object]], object]] = {
+    "analyze": _run_analyze,
+    "graph": _run_graph,
+    "export": _run_export,
+}
+
+
+class RPCError(Exception):
+    """JSON-RPC error returned to the caller."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class ServerMetrics:
+    """Request counters and latency histograms in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.latency_buckets: Dict[str, List[int]] = {}
+        self.latency_sum: Dict[str, float] = {}
+        self.latency_count: Dict[str, int] = {}
+        self.in_flight = 0
+        self.queued = 0
+
+    def observe(self, method: str, status: str, seconds: float) -> None:
+        """Record one finished request."""
+
+        key = (method, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        buckets = self.latency_buckets.setdefault(method, [0] * len(LATENCY_BUCKETS))
+        for position, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                buckets[position] += 1
+        self.latency_sum[method] = self.latency_sum.get(method, 0.0) + seconds
+        self.latency_count[method] = self.latency_count.get(method, 0) + 1
+
+    def render(self, cache: Optional[AnalysisCache] = None) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+
+        lines = [
+            "# TYPE sql_lineage_requests_total counter",
+            *(
+                f'sql_lineage_requests_total{{method="{method}",status="{status}"}} '
+                f"{count}"
+                for (method, status), count in sorted(self.requests.items())
+            ),
+            "# TYPE sql_lineage_request_seconds histogram",
+        ]
+        for method in sorted(self.latency_count):
+            for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets[method]):
+                lines.append(
+                    f'sql_lineage_request_seconds_bucket{{method="{method}",'
+                    f'le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'sql_lineage_request_seconds_bucket{{method="{method}",le="+Inf"}} '
+                f"{self.latency_count[method]}"
+            )
+            lines.append(
+                f'sql_lineage_request_seconds_sum{{method="{method}"}} '
+                f"{self.latency_sum[method]:.6f}"
+            )
+            lines.append(
+                f'sql_lineage_request_seconds_count{{method="{method}"}} '
+                f"{self.latency_count[method]}"
+            )
+        lines += [
+            "# TYPE sql_lineage_in_flight gauge",
+            f"sql_lineage_in_flight {self.in_flight}",
+            "# TYPE sql_lineage_queued gauge",
+            f"sql_lineage_queued {self.queued}",
+        ]
+        if cache is not None:
+            stats = cache.stats()
+            lines += [
+                "# TYPE sql_lineage_cache_hits_total counter",
+                f"sql_lineage_cache_hits_total {stats['hits']}",
+                "# TYPE sql_lineage_cache_misses_total counter",
+                f"sql_lineage_cache_misses_total {stats['misses']}",
+                "# TYPE sql_lineage_cache_entries gauge",
+                f"sql_lineage_cache_entries {stats['entries']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class LineageServer:
+    """JSON-RPC server dispatching lineage work to a bounded worker pool.
+
+    At most ``workers`` requests run at once; up to ``max_queue`` more wait for
+    a slot and further requests are rejected as busy. Each request is bounded
+    by ``timeout`` seconds including queueing. Work that times out while running
+    in a worker process still finishes there and holds its slot until then, but
+    its result is discarded.
+    With a ``cache``, results are cached in the server process by method, SQL
+    content and parameters. ``catalog`` is the schema catalog used when a
+    request carries none; it is sent to the workers, so pass a path or a
+    mapping. Requests may only carry inline catalog objects, never paths.
+    Catalogs are loaded and fingerprinted off the event loop, once per request;
+    a mapping passed as ``catalog`` is loaded once for the server's lifetime.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: int = 64,
+        timeout: float = 30.0,
+        cache: Optional[AnalysisCache] = None,
+        executor: Optional[Executor] = None,
+        catalog: Optional[CatalogSource] = None,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.cache = cache
+        self.catalog = catalog
+        self.metrics = ServerMetrics()
+        self._executor = executor
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._servers: List[asyncio.AbstractServer] = []
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._default_catalog: Optional[Tuple[object, Optional[str]]] = None
+
+    @property
+    def executor(self) -> Executor:
+        """Return the executor running lineage work."""
+
+        if self._executor is not None:
+            return self._executor
+        from sql_lineage.batch import get_executor
+
+        return get_executor(self.workers)
+
+    async def call(self, method: str, params: Dict[str, object]) -> object:
+        """Run one method with queueing, timeout and caching."""
+
+        function = METHODS.get(method)
+        if function is None:
+            raise RPCError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+        _validate_params(params)
+        fingerprint = None
+        if params.get("catalog") is not None:
+            catalog, fingerprint = await _off_loop(
+                _load_request_catalog, params["catalog"]
+            )
+            params = dict(params, catalog=catalog)
+        elif self.catalog is not None:
+            catalog, fingerprint = await self._load_default_catalog()
+            params = dict(params, catalog=catalog)
+        value = await self._cached_call(method, function, params, fingerprint)
+        if method == "graph" and params.get("include_timestamp", True):
+            from sql_lineage.graph import _add_timestamp
+
+            value = _add_timestamp(dict(value))
+        return value
+
+    async def _load_default_catalog(self) -> Tuple[object, Optional[str]]:
+        """Return the server catalog to send to workers and its fingerprint.
+
+        Catalog paths are sent as is so workers reuse their per-process catalog
+        cache, and are fingerprinted on every call to notice file changes.
+        """
+
+        if self._default_catalog is not None:
+            return self._default_catalog
+        catalog, fingerprint = await _off_loop(_load_catalog, self.catalog)
+        if isinstance(self.catalog, (str, os.PathLike)):
+            return self.catalog, fingerprint
+        self._default_catalog = (catalog, fingerprint)
+        return self._default_catalog
+
+    async def _cached_call(
+        self,
+        method: str,
+        function: Callable[[Dict[str, object]], object],
+        params: Dict[str, object],
+        fingerprint: Optional[str] = None,
+    ) -> object:
+        """Return a cached result or compute it within the request timeout.
+
+        ``fingerprint`` identifies the catalog in ``params``; results computed
+        with an unfingerprinted catalog are not cached.
+        """
+
+        uncacheable = params.get("catalog") is not None and fingerprint is None
+        if self.cache is None or uncacheable:
+            return await asyncio.wait_for(
+                self._dispatch(function, params), self.timeout
+            )
+        options = tuple(
+            sorted(
+                (key, repr(value))
+                for key, value in params.items()
+                if key not in {"sql", "include_timestamp", "catalog"}
+            )
+        )
+        if fingerprint is not None:
+            options += (("catalog", fingerprint),)
+        key = self.cache.key(
+            f"rpc:{method}", params["sql"], str(params.get("dialect", "")), "", options
+        )
+        task = self._pending.get(key)
+        if task is None:
+            cached = self.cache.load(key)
+            if cached is not None:
+                return cached["value"]
+            # Identical concurrent requests share one computation.
+            task = asyncio.ensure_future(self._dispatch(function, params))
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.cache.hits += 1
+        return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        """Cache a finished computation and forget it as pending."""
+
+        self._pending.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.cache.store(key, {"value": task.result()})
+
+    async def _dispatch(
+        self, function: Callable[[Dict[str, object]], object], params: Dict[str, object]
+    ) -> object:
+        """Wait for a worker slot and run the function in the executor.
+
+        The slot is released when the executor job finishes, not when the
+        caller stops waiting, so timed-out jobs still count against ``workers``.
+        """
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        if self._slots.locked() and self.metrics.queued >= self.max_queue:
+            raise RPCError(SERVER_BUSY, "Server busy, request queue is full")
+        self.metrics.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.metrics.queued -= 1
+        self.metrics.in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            if self._executor is None:
+                from sql_lineage.batch import _submit_job
+
+                job = _submit_job(self.executor, function, params)
+            else:
+                job = self._executor.submit(function, params)
+        except BaseException:
+            self._release_slot()
+            raise
+        job.add_done_callback(lambda _job: _call_soon(loop, self._release_slot))
+        return await asyncio.wrap_future(job)
+
+    def _release_slot(self) -> None:
+        """Return the worker slot of a finished executor job."""
+
+        self.metrics.in_flight -= 1
+        self._slots.release()
+
+    async def handle_rpc(self, payload: object) -> Optional[object]:
+        """Handle a decoded JSON-RPC request or batch and return the response."""
+
+        if isinstance(payload, list):
+            if not payload:
+                return _error_response(None, INVALID_REQUEST, "Empty batch")
+            responses = await asyncio.gather(*(self._handle_one(p) for p in payload))
+            answered = [response for response in responses if response is not None]
+            return answered or None
+        return await self._handle_one(payload)
+
+    async def _handle_one(self, request: object) -> Optional[Dict[str, object]]:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = request["method"]
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            result = await self.call(method, request.get("params") or {})
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as exc:
+            status = "busy" if exc.code == SERVER_BUSY else "error"
+            response = _error_response(request_id, exc.code, exc.message)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            response = _error_response(
+                request_id, REQUEST_TIMEOUT, f"Request timed out after {self.timeout}s"
+            )
+        except Exception as exc:
+            status = "error"
+            response = _error_response(
+                request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}"
+            )
+        label = method if method in METHODS else "unknown"
+        self.metrics.observe(label, status, time.perf_counter() - started)
+        return response if "id" in request else None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, content_type, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_http_response(status, content_type, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[int, str, bytes]:
+        """Dispatch an HTTP request to the RPC handler or an endpoint."""
+
+        if path == "/metrics" and method == "GET":
+            text = self.metrics.render(self.cache)
+            return 200, "text/plain; version=0.0.4", text.encode("utf-8")
+        if path == "/health" and method == "GET":
+            return 200, "application/json", b'{"status":"ok"}'
+        if path not in {"/", "/rpc"}:
+            return 404, "application/json", b'{"error":"not found"}'
+        if method != "POST":
+            return 405, "application/json", b'{"error":"method not allowed"}'
+        try:
+            payload = json.loads(body)
+        except ValueError as exc:
+            response: Optional[object] = _error_response(
+                None, PARSE_ERROR, f"Parse error: {exc}"
+            )
+        else:
+            response = await self.handle_rpc(payload)
+        if response is None:
+            return 204, "application/json", b""
+        return (
+            200,
+            "application/json",
+            json.dumps(response, ensure_ascii=False).encode("utf-8"),
+        )
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None
+    ) -> asyncio.AbstractServer:
+        """Start listening on a TCP port, or on a Unix socket if ``path`` is set."""
+
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port)
+        self._servers.append(server)
+        return server
+
+    async def close(self) -> None:
+        """Stop accepting connections."""
+
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+
+
+def _validate_params(params: object) -> None:
+    """Raise ``INVALID_PARAMS`` unless ``params`` is a valid method call."""
+
+    if not isinstance(params, dict):
+        raise RPCError(INVALID_PARAMS, "params must be an object")
+    for name in _STRING_PARAMS:
+        value = params.get(name)
+        if (name == "sql" or value is not None) and not isinstance(value, str):
+            raise RPCError(INVALID_PARAMS, f"params.{name} must be a string")
+    if not isinstance(params.get("include_timestamp", True), bool):
+        raise RPCError(INVALID_PARAMS, "params.include_timestamp must be a boolean")
+    catalog = params.get("catalog")
+    if catalog is not None and not isinstance(catalog, dict):
+        raise RPCError(INVALID_PARAMS, "params.catalog must be an object")
+
+
+def _load_catalog(source: CatalogSource) -> Tuple[SchemaCatalog, Optional[str]]:
+    """Load a catalog and return it with its fingerprint."""
+
+    catalog = load_catalog(source)
+    return catalog, catalog.fingerprint()
+
+
+def _load_request_catalog(
+    source: Dict[str, object]
+) -> Tuple[SchemaCatalog, Optional[str]]:
+    """Load an inline request catalog, raising ``INVALID_PARAMS`` if malformed."""
+
+    try:
+        return _load_catalog(source)
+    except TypeError as exc:
+        raise RPCError(INVALID_PARAMS, f"Invalid params.catalog: {exc}") from exc
+
+
+async def _off_loop(function: Callable[..., object], *args: object) -> object:
+    """Run blocking catalog work in the loop's default thread pool."""
+
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    """Schedule a callback on a loop from any thread unless the loop is closed."""
+
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+def _error_response(request_id: object, code: int, message: str) -> Dict[str, object]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Read one HTTP request, or return None when the connection is closed."""
+
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _version = line.decode("latin-1").split(" ", 2)
+    headers: Dict[str, str] = {}
+    while True:
+        header = await reader.readline()
+        if header in {b"\r\n", b"\n", b""}:
+            break
+        name, _sep, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0") or 0)
+    if length > MAX_BODY_BYTES:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+_REASONS = {
+    200: "OK",
+    204: "No Content",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def _http_response(
+    status: int, content_type: str, body: bytes, keep_alive: bool
+) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    path: Optional[str] = None,
+    **options: object,
+) -> None:
+    """Run a lineage server until cancelled.
+
+    ``options`` are passed to ``LineageServer``.
+    """
+
+    server = LineageServer(**options)
+    listener = await server.start(host=host, port=port, path=path)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
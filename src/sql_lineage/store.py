@@ -0,0 +1,413 @@
+"""Persistent lineage graph store backed by SQLite."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import deque
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from sql_lineage.graph_utils import table_id
+from sql_lineage.lineage_graph import LINEAGE_EDGE_TYPES, NODE_PREFIXES, NodeRef
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS fields ("
+    "position INTEGER PRIMARY KEY, key TEXT NOT NULL, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS statements ("
+    "statement_index INTEGER PRIMARY KEY, "
+    "nodes INTEGER NOT NULL, edges INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS nodes ("
+    "position INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, type TEXT NOT NULL, "
+    "table_id TEXT, statement_index INTEGER REFERENCES statements, "
+    "data TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS edges ("
+    "position INTEGER PRIMARY KEY, id TEXT NOT NULL, type TEXT NOT NULL, "
+    "from_id TEXT NOT NULL, to_id TEXT NOT NULL, "
+    "statement_index INTEGER REFERENCES statements, data TEXT NOT NULL)",
+)
+# Secondary indexes are dropped during ``write`` and rebuilt after the inserts.
+_INDEXES = {
+    "nodes_type": "nodes (type)",
+    "nodes_table_id": "nodes (table_id)",
+    "edges_id": "edges (id)",
+    "edges_type": "edges (type)",
+    "edges_from": "edges (from_id, type)",
+    "edges_to": "edges (to_id, type)",
+}
+
+_Row = Tuple[object, ...]
+
+
+class GraphStore:
+    """Lineage graph persisted in a SQLite database with indexed lookups.
+
+    ``write`` stores a ``build_graph`` dictionary in normalized ``nodes``,
+    ``edges`` and ``statements`` tables, and ``read`` rebuilds it exactly.
+    Queries touch only the rows they need, so a large graph never has to be
+    loaded to answer a few lookups. Traversal uses recursive common table
+    expressions over the ``(from_id, type)`` and ``(to_id, type)`` indexes.
+    A database holds one graph; ``write`` replaces it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+            self._create_indexes()
+
+    def _create_indexes(self) -> None:
+        for name, columns in _INDEXES.items():
+            self._connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+
+    def write(self, graph: Mapping[str, object]) -> None:
+        """Replace the stored graph in one transaction.
+
+        Rows are inserted with ``executemany`` straight from the node and edge
+        lists, and the secondary indexes are rebuilt once at the end.
+        """
+
+        nodes = graph.get("nodes", [])
+        edges = graph.get("edges", [])
+        counts: Dict[object, List[int]] = {}
+        for items, slot in ((nodes, 0), (edges, 1)):
+            for item in items:
+                counts.setdefault(item.get("statement_index"), [0, 0])[slot] += 1
+        with self._lock, self._connection:
+            execute = self._connection.execute
+            for name in _INDEXES:
+                execute(f"DROP INDEX IF EXISTS {name}")
+            for table in ("edges", "nodes", "statements", "fields"):
+                execute(f"DELETE FROM {table}")
+            self._connection.executemany(
+                "INSERT INTO fields (position, key, value) VALUES (?, ?, ?)",
+                (
+                    (
+                        position,
+                        key,
+                        None if key in ("nodes", "edges") else _dumps(value),
+                    )
+                    for position, (key, value) in enumerate(graph.items())
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO statements (statement_index, nodes, edges) "
+                "VALUES (?, ?, ?)",
+                sorted(
+                    (index, node_count, edge_count)
+                    for index, (node_count, edge_count) in counts.items()
+                    if isinstance(index, int)
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO nodes "
+                "(position, id, type, table_id, statement_index, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        position,
+                        node["id"],
+                        node["type"],
+                        node.get("table_id"),
+                        _statement_index(node),
+                        _dumps(node),
+                    )
+                    for position, node in enumerate(nodes)
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO edges "
+                "(position, id, type, from_id, to_id, statement_index, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        position,
+                        edge["id"],
+                        edge["type"],
+                        edge["from"],
+                        edge["to"],
+                        _statement_index(edge),
+                        _dumps(edge),
+                    )
+                    for position, edge in enumerate(edges)
+                ),
+            )
+            self._create_indexes()
+        with self._lock:
+            self._connection.execute("ANALYZE")
+
+    def read(self) -> Dict[str, object]:
+        """Rebuild the stored graph dictionary."""
+
+        with self._lock:
+            fields = self._connection.execute(
+                "SELECT key, value FROM fields ORDER BY position"
+            ).fetchall()
+            nodes = self._data("SELECT data FROM nodes ORDER BY position")
+            edges = self._data("SELECT data FROM edges ORDER BY position")
+        lists = {"nodes": nodes, "edges": edges}
+        return {
+            key: lists[key] if key in lists else json.loads(value)
+            for key, value in fields
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._scalar("SELECT COUNT(*) FROM nodes")
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, str) and self._find(node) is not None
+
+    def statements(self) -> List[Dict[str, int]]:
+        """Return the node and edge counts of every statement."""
+
+        return [
+            {"statement_index": index, "nodes": nodes, "edges": edges}
+            for index, nodes, edges in self._rows(
+                "SELECT statement_index, nodes, edges FROM statements "
+                "ORDER BY statement_index"
+            )
+        ]
+
+    def node_id(self, node: NodeRef) -> str:
+        """Resolve a node id, bare table or column name, or node dictionary."""
+
+        if isinstance(node, Mapping):
+            node = str(node["id"])
+        found = self._find(node)
+        if found is None:
+            raise KeyError(node)
+        return found
+
+    def _find(self, node: str) -> Optional[str]:
+        candidates = [node] + [prefix + node for prefix in NODE_PREFIXES]
+        found = {
+            row[0]
+            for row in self._rows(
+                "SELECT id FROM nodes WHERE id IN (?, ?, ?, ?)", candidates
+            )
+        }
+        return next((item for item in candidates if item in found), None)
+
+    def node(self, node: NodeRef) -> Dict[str, object]:
+        """Return a node by id, table or column name, or node dictionary."""
+
+        (found,) = self._data(
+            "SELECT data FROM nodes WHERE id = ?", [self.node_id(node)]
+        )
+        return found
+
+    def nodes_of_type(self, node_type: str) -> List[Dict[str, object]]:
+        """Return every node of a type."""
+
+        return self._data(
+            "SELECT data FROM nodes WHERE type = ? ORDER BY position", [node_type]
+        )
+
+    def columns_of(self, table: NodeRef) -> List[Dict[str, object]]:
+        """Return the column nodes of a table, given its id or full name."""
+
+        if isinstance(table, Mapping):
+            owner = str(table["id"])
+        elif self._scalar("SELECT COUNT(*) FROM nodes WHERE id = ?", [table]):
+            owner = table
+        else:
+            owner = table_id(table)
+        return self._data(
+            "SELECT data FROM nodes WHERE table_id = ? ORDER BY position", [owner]
+        )
+
+    def tables(self, pattern: str = "*") -> List[Dict[str, object]]:
+        """Return table nodes whose full name matches a GLOB pattern."""
+
+        return self._data(
+            "SELECT data FROM nodes WHERE type = 'table' AND id GLOB ? "
+            "ORDER BY position",
+            ["table:" + pattern],
+        )
+
+    def out_edges(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, object]]:
+        """Return the edges leaving a node, optionally filtered by type."""
+
+        return self._edges("from_id", self.node_id(node), edge_types)
+
+    def in_edges(
+        self, node: NodeRef, edge_types: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, object]]:
+        """Return the edges entering a node, optionally filtered by type."""
+
+        return self._edges("to_id", self.node_id(node), edge_types)
+
+    def _edges(
+        self, end: str, node_id: str, edge_types: Optional[Iterable[str]]
+    ) -> List[Dict[str, object]]:
+        types, parameters = _type_filter("type", edge_types)
+        return self._data(
+            f"SELECT data FROM edges WHERE {end} = ?{types} ORDER BY position",
+            [node_id, *parameters],
+        )
+
+    def neighbors(
+        self,
+        node: NodeRef,
+        direction: str = "out",
+        edge_types: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Return the ids of adjacent nodes, each once, in edge order.
+
+        ``direction`` is ``out`` for edge targets, ``in`` for edge sources or
+        ``both``.
+        """
+
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unsupported direction: {direction}")
+        node_id = self.node_id(node)
+        types, parameters = _type_filter("type", edge_types)
+        queries = []
+        if direction in ("out", "both"):
+            queries.append(("to_id", "from_id"))
+        if direction in ("in", "both"):
+            queries.append(("from_id", "to_id"))
+        found: Dict[str, None] = {}
+        for other, end in queries:
+            for (neighbor,) in self._rows(
+                f"SELECT {other} FROM edges WHERE {end} = ?{types} "
+                "ORDER BY position",
+                [node_id, *parameters],
+            ):
+                found.setdefault(neighbor)
+        return list(found)
+
+    def upstream(
+        self,
+        node: NodeRef,
+        depth: Optional[int] = None,
+        edge_types: Optional[Iterable[str]] = LINEAGE_EDGE_TYPES,
+    ) -> List[Tuple[str, int]]:
+        """Return ``(node_id, distance)`` for nodes the given node derives from.
+
+        Results are ordered by distance, then id, and match
+        ``LineageGraph.upstream`` with the same options.
+        """
+
+        return self._walk(self.node_id(node), "to_id", "from_id", depth, edge_types)
+
+    def downstream(
+        self,
+        node: NodeRef,
+        depth: Optional[int] = None,
+        edge_types: Optional[Iterable[str]] = LINEAGE_EDGE_TYPES,
+    ) -> List[Tuple[str, int]]:
+        """Return ``(node_id, distance)`` for nodes derived from the given node.
+
+        Accepts the same options as ``upstream``.
+        """
+
+        return self._walk(self.node_id(node), "from_id", "to_id", depth, edge_types)
+
+    def _walk(
+        self,
+        start: str,
+        near: str,
+        far: str,
+        depth: Optional[int],
+        edge_types: Optional[Iterable[str]],
+    ) -> List[Tuple[str, int]]:
+        types, parameters = _type_filter("e.type", edge_types)
+        if depth is not None:
+            # Bounded walks are finite even on cycles, so the distance can be
+            # carried along and minimized per node.
+            rows = self._rows(
+                "WITH RECURSIVE walk(node, distance) AS ("
+                "SELECT ?, 0 UNION "
+                f"SELECT e.{far}, w.distance + 1 FROM walk w "
+                f"JOIN edges e ON e.{near} = w.node "
+                f"WHERE w.distance < ?{types}) "
+                "SELECT node, MIN(distance) FROM walk WHERE node != ? "
+                "GROUP BY node",
+                [start, depth, *parameters, start],
+            )
+            return sorted(rows, key=lambda row: (row[1], row[0]))
+        # Unbounded walks collect the reachable nodes as a set, which stops on
+        # cycles, and fetch the edges between them to measure distances.
+        rows = self._rows(
+            "WITH RECURSIVE walk(node) AS ("
+            "SELECT ? UNION "
+            f"SELECT e.{far} FROM walk w JOIN edges e ON e.{near} = w.node "
+            f"WHERE 1{types}) "
+            f"SELECT e.{near}, e.{far} FROM walk w "
+            f"JOIN edges e ON e.{near} = w.node WHERE 1{types}",
+            [start, *parameters, *parameters],
+        )
+        adjacent: Dict[str, List[str]] = {}
+        for source, target in rows:
+            adjacent.setdefault(source, []).append(target)
+        return sorted(_distances(adjacent, start), key=lambda row: (row[1], row[0]))
+
+    def _rows(self, query: str, parameters: Sequence[object] = ()) -> List[_Row]:
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+    def _scalar(self, query: str, parameters: Sequence[object] = ()) -> int:
+        return self._rows(query, parameters)[0][0]
+
+    def _data(
+        self, query: str, parameters: Sequence[object] = ()
+    ) -> List[Dict[str, object]]:
+        return [json.loads(row[0]) for row in self._rows(query, parameters)]
+
+
+def _dumps(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _statement_index(item: Mapping[str, object]) -> Optional[int]:
+    index = item.get("statement_index")
+    return index if isinstance(index, int) else None
+
+
+def _type_filter(
+    column: str, edge_types: Optional[Iterable[str]]
+) -> Tuple[str, List[str]]:
+    """Return an ``AND column IN (...)`` clause and its parameters."""
+
+    if edge_types is None:
+        return "", []
+    types = list(edge_types)
+    return f" AND {column} IN ({', '.join('?' * len(types))})", types
+
+
+def _distances(
+    adjacent: Mapping[str, List[str]], start: str
+) -> Iterator[Tuple[str, int]]:
+    """Yield breadth-first distances from ``start``, excluding itself."""
+
+    seen: Set[str] = {start}
+    queue: Deque[Tuple[str, int]] = deque([(start, 0)])
+    while queue:
+        current, distance = queue.popleft()
+        for neighbor in adjacent.get(current, ()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append((neighbor, distance + 1))
+                yield neighbor, distance + 1
@@ -0,0 +1,5 @@
+"""Version information for sql_lineage."""
+
+from __future__ import annotations
+
+__version__ = "0.2.0"
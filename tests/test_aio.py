@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sql_lineage import aio, analyze, build_graph, export_graph
+
+SQL = "SELECT u.id, o.total FROM core.users u JOIN sales.orders o ON o.user_id = u.id"
+
+
+def test_coroutines_match_sync_api() -> None:
+    async def scenario() -> tuple:
+        executor = ThreadPoolExecutor(max_workers=2)
+        analysis = await aio.analyze(SQL, dialect="postgres", executor=executor)
+        graph = await aio.build_graph(
+            SQL, dialect="postgres", include_timestamp=False, executor=executor
+        )
+        exported = await aio.export_graph(graph, format="mermaid_flowchart")
+        return analysis, graph, exported
+
+    analysis, graph, exported = asyncio.run(scenario())
+    expected_graph = build_graph(SQL, dialect="postgres", include_timestamp=False)
+    assert analysis == analyze(SQL, dialect="postgres")
+    assert graph == expected_graph
+    assert exported == export_graph(expected_graph, format="mermaid_flowchart")
+
+
+def test_timeout_keeps_event_loop_responsive() -> None:
+    release = threading.Event()
+
+    async def scenario() -> float:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.ensure_future(ticker())
+        with pytest.raises(asyncio.TimeoutError):
+            await aio.run(release.wait, 5, timeout=0.2)
+        ticking.cancel()
+        release.set()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 5
+
+
+def test_gather_bounds_concurrency_and_cancels_on_failure() -> None:
+    running = 0
+    peak = 0
+    finished = []
+
+    def work(value: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        time.sleep(0.02)
+        running -= 1
+        if value == 3:
+            raise ValueError("boom")
+        finished.append(value)
+        return value * 2
+
+    async def scenario() -> None:
+        executor = ThreadPoolExecutor(max_workers=8)
+        results = await aio.gather(
+            (aio.run(work, value, executor=executor) for value in range(3)), limit=2
+        )
+        assert results == [0, 2, 4]
+        outcomes = await aio.gather(
+            [aio.run(work, value, executor=executor) for value in (1, 3)],
+            return_exceptions=True,
+        )
+        assert outcomes[0] == 2 and isinstance(outcomes[1], ValueError)
+        finished.clear()
+        with pytest.raises(ValueError):
+            await aio.gather(
+                [aio.run(work, value, executor=executor) for value in range(3, 20)],
+                limit=1,
+            )
+
+    asyncio.run(scenario())
+    assert peak <= 2
+    assert finished == []
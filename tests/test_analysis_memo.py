@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from sql_lineage import analyze, analyzer
+
+NESTED_SQL = """
+CREATE TABLE analytics.nested AS
+SELECT l3.id AS id, l3.total AS total
+FROM (
+    SELECT l2.id, l2.total
+    FROM (
+        SELECT l1.id, l1.total
+        FROM (
+            SELECT o.id, SUM(o.amount) AS total
+            FROM core.orders o
+            GROUP BY o.id
+        ) l1
+    ) l2
+) l3;
+"""
+
+
+def test_each_subquery_analyzed_once(monkeypatch) -> None:
+    calls: Counter = Counter()
+    original = analyzer._analyze_select
+
+    def counting(select, dialect, memo):
+        calls[id(select)] += 1
+        return original(select, dialect, memo)
+
+    monkeypatch.setattr(analyzer, "_analyze_select", counting)
+    result = analyze(NESTED_SQL, dialect="postgres")
+
+    assert result["errors"] == []
+    assert len(calls) == 4
+    assert set(calls.values()) == {1}
+
+
+def test_nested_subquery_lineage_is_preserved() -> None:
+    result = analyze(NESTED_SQL, dialect="postgres")
+    statement = result["statements"][0]
+    total = next(
+        col for col in statement["output"]["columns"] if col["name"] == "total"
+    )
+    assert {"table": "o", "column": "amount"} in total["lineage"]["inputs"]
+    assert len(statement["subqueries"]) == 3
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sql_lineage import analyze, analyze_typed
+from sql_lineage.models import ColumnRef, StatementAnalysis
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_analyze_typed_returns_models() -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    result = analyze_typed(sql, dialect="postgres")
+    assert result.errors == []
+    assert all(isinstance(item, StatementAnalysis) for item in result.statements)
+    assert [item.index for item in result.statements] == list(
+        range(1, len(result.statements) + 1)
+    )
+    inputs = result.statements[0].output_columns[0].lineage.inputs
+    assert all(isinstance(item, ColumnRef) for item in inputs)
+
+
+def test_analyze_typed_serializes_like_analyze() -> None:
+    sql = _load_fixture("spark_complex.sql")
+    assert analyze_typed(sql, dialect="spark").to_dict() == analyze(
+        sql, dialect="spark"
+    )
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import analyze, batch
+from sql_lineage.batch import analyze_many, build_graphs_many
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_analyze_many_in_pool_preserves_order() -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    items = [(f"model_{index}", sql) for index in range(6)]
+    results = list(analyze_many(items, dialect="postgres", workers=2, chunksize=2))
+    assert [item.key for item in results] == [key for key, _sql in items]
+    assert all(item.ok for item in results)
+    assert results[0].result == analyze(sql, dialect="postgres")
+
+
+def test_build_graphs_many_completion_order() -> None:
+    sqls = ["SELECT a FROM t", "SELECT b FROM u", "SELECT c FROM v"]
+    results = list(
+        build_graphs_many(
+            sqls, mode="tables_only", include_timestamp=False, ordered=False, workers=2
+        )
+    )
+    assert sorted(item.index for item in results) == [0, 1, 2]
+    assert all(item.result["mode"] == "tables_only" for item in results)
+
+
+def test_analyze_many_captures_errors_per_item(monkeypatch) -> None:
+    original = batch.analyze
+
+    def failing(sql, **options):
+        if "boom" in sql:
+            raise RuntimeError("boom")
+        return original(sql, **options)
+
+    monkeypatch.setattr(batch, "analyze", failing)
+    results = list(analyze_many(["SELECT 1", "SELECT boom", "SELECT 2"], workers=1))
+    assert [item.ok for item in results] == [True, False, True]
+    assert results[1].error == "RuntimeError: boom"
+    assert results[1].result is None
+
+
+def test_broken_shared_pool_is_replaced() -> None:
+    pool = batch.get_executor(2)
+    with pytest.raises(BrokenProcessPool):
+        batch._submit_job(pool, os._exit, 1).result()
+    assert batch.get_executor(2) is not pool
+    results = list(analyze_many(["SELECT a FROM t"], workers=2))
+    assert results[0].ok
+
+
+def test_pool_found_broken_on_submit_is_replaced() -> None:
+    pool = batch.get_executor(2)
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+    assert batch.get_executor(2) is pool
+    results = list(analyze_many(["SELECT a FROM t"], workers=2))
+    assert results[0].ok
+    assert batch.get_executor(2) is not pool
+
+
+def test_failed_chunks_become_item_errors() -> None:
+    unpicklable = list(
+        analyze_many(
+            ["SELECT 1", "SELECT 2"], workers=2, chunksize=2, catalog=lambda: None
+        )
+    )
+    assert [item.index for item in unpicklable] == [0, 1]
+    assert not any(item.ok for item in unpicklable)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    rejected = list(analyze_many(["SELECT 1"], ordered=False, executor=executor))
+    assert rejected[0].error.startswith("RuntimeError")
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.generators import GENERATORS, QUICK_SIZES, dialects, generate
+from benchmarks.runner import CaseResult, compare, run_benchmarks, scaling
+from sql_lineage import analyze
+
+
+@pytest.mark.parametrize("case", sorted(GENERATORS))
+def test_generated_sql_is_deterministic_and_analyzable(case: str) -> None:
+    size = QUICK_SIZES[case][0]
+    for dialect in dialects():
+        sql = generate(case, size, dialect)
+        assert sql == generate(case, size, dialect)
+        result = analyze(sql, dialect=dialect)
+        expected = size if case == "script" else 1
+        assert len(result["statements"]) == expected
+        assert result["errors"] == []
+        assert all(not statement["errors"] for statement in result["statements"])
+
+
+def test_runner_reports_throughput_scaling_and_regressions() -> None:
+    results = run_benchmarks(
+        cases=["wide_select"],
+        dialect_names=["postgres"],
+        sizes={"wide_select": (5, 20)},
+        repeat=1,
+        isolate=False,
+    )
+    assert [result.size for result in results] == [5, 20]
+    assert all(result.error is None for result in results)
+    assert all(result.statements_per_second > 0 for result in results)
+    curve = scaling(results)["wide_select/postgres/analyze"]
+    assert [point[0] for point in curve["points"]] == [5, 20]
+    assert curve["exponent"] is not None
+
+    baseline = [
+        CaseResult(**{**result.to_dict(), "statements_per_second": 1e9})
+        for result in results
+    ]
+    regressions = compare(results, baseline, threshold=0.5)
+    assert [item.size for item in regressions] == [5, 20]
+    assert compare(results, results) == []
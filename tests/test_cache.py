@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from sql_lineage import (
+    AnalysisCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    analyze,
+    build_graph,
+)
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_analysis_cache_hits_for_normalized_sql() -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    cache = AnalysisCache()
+    first = analyze(sql, dialect="postgres", cache=cache)
+    second = analyze(sql.replace("\n", "\r\n"), dialect="postgres", cache=cache)
+    assert first == second == analyze(sql, dialect="postgres")
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    analyze(sql, dialect="mysql", cache=cache)
+    assert cache.misses == 2
+
+
+def test_cache_keeps_whitespace_inside_literals() -> None:
+    cache = AnalysisCache()
+    first = analyze("SELECT 'a\nb' AS x FROM t", cache=cache)
+    second = analyze("SELECT 'a  \nb' AS x FROM t", cache=cache)
+    literals = [
+        result["statements"][0]["output"]["columns"][0]["lineage"]["literals"]
+        for result in (first, second)
+    ]
+    assert literals == [["a\nb"], ["a  \nb"]]
+    assert cache.stats()["entries"] == 2
+
+
+def test_cached_graph_is_byte_identical(tmp_path) -> None:
+    sql = _load_fixture("clickhouse_complex.sql")
+    cache = AnalysisCache(SQLiteCacheBackend(str(tmp_path / "cache.db")))
+    first = build_graph(sql, mode="er_columns", include_timestamp=False, cache=cache)
+    second = build_graph(sql, mode="er_columns", include_timestamp=False, cache=cache)
+    assert "generated_at" not in first["meta"]
+    assert json.dumps(first) == json.dumps(second)
+    assert cache.hits == 1
+
+    stamped = build_graph(sql, mode="er_columns", cache=cache)
+    assert "generated_at" in stamped["meta"]
+    assert cache.hits == 2
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    backend = MemoryCacheBackend(max_entries=2, max_bytes=10)
+    backend.set("a", b"1234")
+    backend.set("b", b"1234")
+    assert backend.get("a") == b"1234"
+    backend.set("c", b"1234")
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    backend.set("d", b"123456")
+    assert backend.get("c") is None
+    assert backend.total_bytes == 10
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path) -> None:
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    assert backend.get("a") == b"1"
+    backend.set("c", b"3")
+    assert backend.get("b") is None
+    assert len(backend) == 2
+    backend.close()
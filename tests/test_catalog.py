@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+
+import pytest
+
+from sql_lineage import analyze, build_graph, load_catalog, write_catalog_index
+from sql_lineage.catalog import IndexedCatalog, SchemaCatalog
+from sql_lineage.cli import main
+
+CATALOG = {
+    "core": {
+        "users": ["id", "name", "email"],
+        "orders": {"order_id": "int", "user_id": "int", "amount": "decimal"},
+    }
+}
+JOIN = "FROM core.users u JOIN core.orders o ON u.id = o.user_id"
+
+
+def _columns(result: dict, index: int = 0) -> list:
+    return [
+        (
+            column["name"],
+            [(item["table"], item["column"]) for item in column["lineage"]["inputs"]],
+            column["lineage"]["notes"],
+        )
+        for column in result["statements"][index]["output"]["columns"]
+    ]
+
+
+def test_catalog_resolves_ambiguous_unqualified_columns() -> None:
+    sql = f"SELECT name, amount, missing {JOIN}"
+    without = _columns(analyze(sql, dialect="postgres"))
+    assert without[0] == ("name", [(None, "name")], [{"ambiguous_column": "name"}])
+    resolved = _columns(analyze(sql, dialect="postgres", catalog=CATALOG))
+    assert resolved == [
+        ("name", [("u", "name")], []),
+        ("amount", [("o", "amount")], []),
+        ("missing", [(None, "missing")], [{"ambiguous_column": "missing"}]),
+    ]
+
+
+def test_catalog_lookups_follow_dialect_case_folding() -> None:
+    catalog = {"core.users": ["id", "name"], "core.orders": ["id", "total"]}
+    star = "SELECT * FROM Core.Users"
+    folded = _columns(analyze(star, dialect="postgres", catalog=catalog))
+    assert [name for name, _inputs, _notes in folded] == ["id", "name"]
+    exact = _columns(analyze(star, dialect="clickhouse", catalog=catalog))
+    assert [name for name, _inputs, _notes in exact] == ["*"]
+    sql = "SELECT NAME FROM core.users u JOIN core.orders o ON u.id = o.id"
+    resolved = _columns(analyze(sql, dialect="postgres", catalog=catalog))
+    assert resolved == [("NAME", [("u", "NAME")], [])]
+
+
+def test_catalog_expands_stars_through_ctes() -> None:
+    sql = (
+        f"SELECT * {JOIN};\n"
+        "WITH c AS (SELECT * FROM core.users) SELECT c.* FROM c;\n"
+        "SELECT * FROM unknown_table"
+    )
+    result = analyze(sql, dialect="postgres", catalog=CATALOG)
+    assert [name for name, _inputs, _notes in _columns(result)] == [
+        "id",
+        "name",
+        "email",
+        "order_id",
+        "user_id",
+        "amount",
+    ]
+    assert _columns(result, 1)[1] == (
+        "name",
+        [("c", "name"), ("core.users", "name")],
+        [],
+    )
+    assert _columns(result, 2) == [("*", [("unknown_table", "*")], [])]
+
+
+def test_catalog_star_applies_except_and_replace() -> None:
+    catalog = {"db.t": ["a", "b", "c"]}
+    result = analyze("SELECT * EXCEPT (b) FROM db.t", dialect="spark", catalog=catalog)
+    assert [name for name, _inputs, _notes in _columns(result)] == ["a", "c"]
+    result = analyze(
+        "SELECT x.* REPLACE (x.a + 1 AS a) FROM db.t x",
+        dialect="bigquery",
+        catalog=catalog,
+    )
+    assert _columns(result)[0] == ("a", [("x", "a")], [])
+    assert [name for name, _inputs, _notes in _columns(result)] == ["a", "b", "c"]
+    result = analyze("SELECT * EXCEPT (b) FROM db.u", dialect="spark", catalog=catalog)
+    assert len(_columns(result)) == 1
+
+
+def test_catalog_files_and_index_give_the_same_result(tmp_path) -> None:
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(CATALOG), encoding="utf-8")
+    index_path = tmp_path / "catalog.idx"
+    assert write_catalog_index(json_path, index_path) == 2
+    catalog = load_catalog(index_path)
+    assert isinstance(catalog, IndexedCatalog)
+    assert catalog.columns("core.orders") == ("order_id", "user_id", "amount")
+    assert catalog.columns("core.missing") is None
+    assert pickle.loads(pickle.dumps(catalog)).has_column("core.users", "email")
+    sql = f"SELECT * {JOIN}"
+    expected = build_graph(sql, "postgres", include_timestamp=False, catalog=CATALOG)
+    for source in (
+        json_path,
+        str(index_path),
+        lambda table: CATALOG["core"].get(table.split(".")[-1]),
+    ):
+        graph = build_graph(sql, "postgres", include_timestamp=False, catalog=source)
+        assert graph == expected
+
+
+def test_cli_builds_catalog_index(tmp_path, capsys) -> None:
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(CATALOG), encoding="utf-8")
+    index_path = tmp_path / "catalog.idx"
+    assert main(["catalog", str(json_path), str(index_path)]) == 0
+    capsys.readouterr()
+    sql = f"SELECT name {JOIN}"
+    main(
+        ["analyze", "--sql", sql, "--dialect", "postgres", "--catalog", str(index_path)]
+    )
+    output = json.loads(capsys.readouterr().out)
+    assert output["statements"][0]["output"]["columns"][0]["lineage"]["notes"] == []
+
+
+def test_schema_catalog_requires_lookup() -> None:
+    with pytest.raises(TypeError):
+        SchemaCatalog()
+
+
+def test_path_catalog_cache_replaces_changed_files(tmp_path, monkeypatch) -> None:
+    from sql_lineage import catalog as catalog_module
+
+    monkeypatch.setattr(catalog_module, "_PATH_CATALOGS", catalog_module.OrderedDict())
+    monkeypatch.setattr(catalog_module, "_PATH_CATALOG_LIMIT", 2)
+    index_path = tmp_path / "catalog.idx"
+    write_catalog_index(CATALOG, index_path)
+    first = load_catalog(index_path)
+    assert load_catalog(str(index_path)) is first
+    assert first.columns("core.users") == ("id", "name", "email")
+
+    write_catalog_index({"core.users": ["id"], "core.x": ["a"]}, index_path)
+    os.utime(index_path, ns=(0, 0))
+    second = load_catalog(index_path)
+    assert second is not first and first._map is not None
+    assert second.columns("core.users") == ("id",)
+
+    for name in ("a.json", "b.json"):
+        (tmp_path / name).write_text(json.dumps(CATALOG), encoding="utf-8")
+        load_catalog(tmp_path / name)
+    assert len(catalog_module._PATH_CATALOGS) == 2
+    assert second.columns("core.x") == ("a",)
+    mapped = second._map
+    del second
+    assert mapped.closed
+
+
+def test_workers_accept_unpicklable_and_path_catalogs(tmp_path) -> None:
+    sql = f"SELECT * {JOIN};\nSELECT name {JOIN};\nSELECT amount {JOIN}"
+    expected = analyze(sql, dialect="postgres", catalog=CATALOG)
+
+    def provider(table: str) -> list:
+        return CATALOG["core"].get(table.split(".")[-1])
+
+    assert analyze(sql, dialect="postgres", catalog=provider, workers=2) == expected
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(CATALOG), encoding="utf-8")
+    assert analyze(sql, dialect="postgres", catalog=json_path, workers=2) == expected
+
+
+def test_path_catalog_cache_is_shared_across_threads(tmp_path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    index_path = tmp_path / "catalog.idx"
+    write_catalog_index(CATALOG, index_path)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        catalogs = list(executor.map(load_catalog, [index_path] * 64))
+    assert all(catalog is catalogs[0] for catalog in catalogs)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+from sql_lineage.cli import main
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_cli_analyze_directory_emits_ndjson(tmp_path, capsys) -> None:
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "a.sql").write_text(
+        _load_fixture("postgres_complex.sql"), encoding="utf-8"
+    )
+    (tmp_path / "models" / "bad.sql").write_bytes(b"\xff\xfe")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    code = main(
+        ["analyze", "--dir", str(tmp_path), "--dialect", "postgres", "--jobs", "1"]
+    )
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    by_path = {Path(line["path"]).name: line for line in lines}
+
+    assert code == 1
+    assert set(by_path) == {"a.sql", "bad.sql"}
+    assert by_path["a.sql"]["error"] is None
+    assert by_path["a.sql"]["result"]["statements"]
+    assert by_path["bad.sql"]["error"].startswith("UnicodeDecodeError")
+
+
+def test_cli_analyze_stdin_ndjson(monkeypatch, capsys) -> None:
+    stdin = io.StringIO(
+        json.dumps({"path": "models/x.sql", "sql": "SELECT a FROM t"}) + "\n\n"
+    )
+    monkeypatch.setattr("sys.stdin", stdin)
+    code = main(["analyze", "--stdin-ndjson", "--jobs", "1"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert [line["path"] for line in lines] == ["models/x.sql"]
+    assert "duration_ms" in lines[0]
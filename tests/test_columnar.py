@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import gc
+import pickle
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import analyze, analyze_typed
+from sql_lineage.columnar import ColumnarResult, analyze_columnar
+from sql_lineage.models import ColumnRef
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("dialect", ["clickhouse", "mysql", "postgres", "spark"])
+def test_columnar_round_trips_fixtures(dialect: str) -> None:
+    sql = _load_fixture(f"{dialect}_complex.sql")
+    columnar = analyze_columnar(sql, dialect=dialect)
+    assert columnar.to_dict() == analyze(sql, dialect=dialect)
+    typed = analyze_typed(sql, dialect=dialect)
+    assert ColumnarResult.from_analysis(typed).to_analysis() == typed
+
+
+def test_columnar_rows_and_string_table() -> None:
+    sql = "SELECT u.id, u.id AS user_id FROM core.users u; SELECT o.id FROM o"
+    columnar = analyze_columnar(sql, dialect="postgres")
+    assert len(columnar) == 3
+    assert columnar.statement_count == 2
+    assert list(columnar.statement_columns(1)) == [2]
+    assert columnar.column_name(1) == "user_id"
+    assert columnar.column_inputs(0) == [ColumnRef(table="u", column="id")]
+    assert columnar.strings.strings.count("id") == 1
+    assert columnar.input_columns[0] == columnar.input_columns[1]
+
+
+def test_columnar_round_trips_nested_queries() -> None:
+    sql = (
+        "SELECT a.id FROM a UNION ALL SELECT b.id FROM b "
+        "WHERE b.id IN (SELECT c.id FROM c WHERE c.k IN (SELECT z.k FROM z)); "
+        "SELECT f.id FROM f"
+    )
+    typed = analyze_typed(sql, dialect="postgres")
+    columnar = ColumnarResult.from_analysis(typed)
+    assert columnar.to_analysis() == typed
+    assert list(columnar.query_parents[:3]) == [-1, -1, 1]
+    assert list(columnar.statement_columns(1)) == [len(columnar) - 1]
+
+
+def test_models_are_slotted_and_picklable() -> None:
+    typed = analyze_typed(_load_fixture("postgres_complex.sql"), dialect="postgres")
+    column = typed.statements[0].output_columns[0]
+    assert not hasattr(column, "__dict__")
+    assert not hasattr(column.lineage.inputs[0], "__dict__")
+    assert pickle.loads(pickle.dumps(typed)) == typed
+
+
+def test_columnar_is_much_smaller_than_dicts() -> None:
+    sql = "".join(
+        f"CREATE TABLE s.t{i} AS SELECT u.id, u.name AS n{i}, "
+        "coalesce(o.amount, 0) AS amount, lower(u.email) AS email "
+        "FROM core.users u JOIN (SELECT p.user_id, p.amount FROM core.payments p "
+        "UNION ALL SELECT r.user_id, r.amount FROM core.refunds r) o "
+        "ON u.id = o.user_id "
+        "WHERE u.id IN (SELECT b.user_id FROM core.blocked b);\n"
+        for i in range(200)
+    )
+
+    payload = pickle.dumps(analyze_typed(sql, dialect="postgres"))
+
+    def retained(convert) -> int:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            value = convert(pickle.loads(payload))
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del value
+        return size
+
+    dict_size = retained(lambda typed: typed.to_dict())
+    columnar_size = retained(ColumnarResult.from_analysis)
+    assert dict_size >= 5 * columnar_size
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from sql_lineage.catalog import load_catalog
+from sql_lineage.context import AnalysisContext, SourceInfo
+
+
+def _table(name: str, alias: str = "") -> SourceInfo:
+    return SourceInfo(name=name, alias=alias, database="core", source_type="table")
+
+
+def test_resolve_source_uses_index_and_prefers_sources() -> None:
+    users = _table("core.users", "u")
+    reported = _table("core.users_report", "u")
+    context = AnalysisContext(
+        sources=[users],
+        report_sources=[reported, _table("core.orders")],
+        dialect="postgres",
+        active_identifiers=["u"],
+    )
+    assert context.resolve_source("u") is users
+    assert context.resolve_source("core.orders").name == "core.orders"
+    assert context.resolve_source("missing") is None
+    assert context.resolve_unqualified_column() is users
+    assert context.report_table_names() == ["core.users_report", "core.orders"]
+
+
+def test_context_is_immutable_after_indexing() -> None:
+    users = _table("core.users", "u")
+    orders = _table("core.orders", "o")
+    sources = [users]
+    context = AnalysisContext(
+        sources=sources,
+        report_sources=[],
+        dialect="postgres",
+        active_identifiers=["u"],
+    )
+    assert context.resolve_unqualified_column() is users
+
+    sources.append(orders)
+    assert context.sources == (users,)
+    assert context.resolve_source("o") is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        context.sources = (users, orders)
+    wider = dataclasses.replace(
+        context, sources=(users, orders), active_identifiers=("u", "o")
+    )
+    assert wider.resolve_source("o") is orders
+    assert wider.expansions is not context.expansions
+    assert wider.resolve_unqualified_column() is None
+
+
+def test_catalog_column_index_is_built_on_construction() -> None:
+    users = _table("core.users", "u")
+    orders = _table("core.orders", "o")
+    events = _table("core.events", "e")
+    catalog = load_catalog({"core.users": ["id", "name"], "core.orders": ["id"]})
+    context = AnalysisContext(
+        sources=[users, orders, events],
+        report_sources=[],
+        dialect="postgres",
+        active_identifiers=["u", "o", "e"],
+        catalog=catalog,
+        relations=["u", "o", "e"],
+    )
+    index = dict(context._column_index)
+    assert index == {"id": [users, orders, events], "name": [users, events]}
+    assert context.resolve_unqualified_column("total") is events
+    assert context.resolve_unqualified_column("id") is None
+    assert context._column_index == index
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import gc
+import io
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import CSRGraph, LineageGraph, build_graph
+from sql_lineage.serialization import dump_graph
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("dialect", ["clickhouse", "mysql", "postgres", "spark"])
+@pytest.mark.parametrize("mode", ["full", "er_columns", "tables_only"])
+def test_csr_round_trips_and_matches_traversal(dialect: str, mode: str) -> None:
+    graph = build_graph(_load_fixture(f"{dialect}_complex.sql"), dialect, mode=mode)
+    csr = CSRGraph(graph)
+    assert json.dumps(csr.to_dict()) == json.dumps(graph)
+
+    stream = io.StringIO()
+    dump_graph(stream, graph, style="ndjson")
+    streamed = CSRGraph.load(io.StringIO(stream.getvalue()))
+    assert json.dumps(streamed.to_dict()) == json.dumps(graph)
+
+    indexed = LineageGraph(graph)
+    for node in graph["nodes"]:
+        node_id = node["id"]
+        assert csr.node(node_id) == node
+        assert sorted(csr.upstream(node_id)) == sorted(indexed.upstream(node_id))
+        assert sorted(csr.downstream(node_id, depth=2)) == sorted(
+            indexed.downstream(node_id, depth=2)
+        )
+        assert sorted(map(json.dumps, csr.out_edges(node_id))) == sorted(
+            map(json.dumps, indexed.out_edges(node_id))
+        )
+
+
+def test_degrees_neighbors_and_irregular_edges() -> None:
+    graph = {
+        "nodes": [
+            {"id": "table:db.t", "type": "table"},
+            {"id": "column:db.t.a", "type": "column", "table_id": "table:db.t"},
+            {"id": "column:db.t.b", "type": "column", "table_id": "table:db.t"},
+        ],
+        "edges": [
+            {
+                "id": "e1",
+                "type": "contains",
+                "from": "table:db.t",
+                "to": "column:db.t.a",
+            },
+            {
+                "id": "e2",
+                "type": "contains",
+                "from": "table:db.t",
+                "to": "column:db.t.b",
+            },
+            {
+                "id": "e3",
+                "type": "lineage",
+                "from": "column:db.t.a",
+                "to": "column:db.t.b",
+            },
+            {"id": "e4", "type": "lineage", "from": "column:db.t.b", "to": "ext:x"},
+        ],
+    }
+    csr = CSRGraph(graph)
+    assert csr.to_dict() == graph
+    assert len(csr) == 4 and csr.node_count == 3
+    assert "ext:x" in csr and "db.t.a" in csr
+    with pytest.raises(KeyError):
+        csr.node("ext:x")
+    assert list(csr.out_degrees()) == [2, 1, 1, 0]
+    assert list(csr.in_degrees(["lineage"])) == [0, 0, 1, 1]
+    assert list(csr.neighbor_indexes(csr.index("table:db.t"))) == [1, 2]
+    assert csr.successors("db.t.b") == ["ext:x"]
+    assert csr.predecessors("db.t.b", ["contains"]) == ["table:db.t"]
+    assert [node["id"] for node in csr.columns_of("db.t")] == [
+        "column:db.t.a",
+        "column:db.t.b",
+    ]
+    assert list(csr.paths("db.t.a", "ext:x")) == [
+        ["column:db.t.a", "column:db.t.b", "ext:x"]
+    ]
+
+
+def test_csr_uses_a_tenth_of_the_dict_memory() -> None:
+    sql = ";\n".join(
+        f"INSERT INTO mart.t{index % 50} SELECT s.id, s.a{index % 7} + 1 AS x, "
+        f"l.name FROM stage.s{index % 30} s JOIN stage.l{index % 9} l ON l.id = s.id"
+        for index in range(300)
+    )
+    payload = json.dumps(build_graph(sql, dialect="postgres"))
+
+    def retained(convert) -> int:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            value = convert(json.loads(payload))
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del value
+        return size
+
+    dict_size = retained(lambda graph: graph)
+    csr_size = retained(CSRGraph)
+    assert dict_size >= 10 * csr_size
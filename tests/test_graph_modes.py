@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import (
+    AnalysisCache,
+    analyze_typed,
+    build_graph,
+    build_graph_from_analysis,
+    build_graphs,
+)
+from sql_lineage.profiling import TimingCollector
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("dialect", ["clickhouse", "mysql", "postgres", "spark"])
+def test_build_graphs_matches_build_graph(dialect: str) -> None:
+    sql = _load_fixture(f"{dialect}_complex.sql") + (
+        ";\nINSERT INTO mart.t SELECT x.id, o.total FROM core.users x "
+        "JOIN core.orders o ON o.user_id = x.id"
+    )
+    graphs = build_graphs(sql, dialect, include_timestamp=False)
+    assert list(graphs) == ["full", "er_columns", "tables_only"]
+    for mode, graph in graphs.items():
+        assert graph == build_graph(sql, dialect, mode=mode, include_timestamp=False)
+
+    analysis = analyze_typed(sql, dialect=dialect)
+    assert build_graph_from_analysis(
+        analysis, "TABLES_ONLY", include_timestamp=False
+    ) == build_graph(sql, dialect, mode="tables_only", include_timestamp=False)
+
+
+def test_build_graphs_analyzes_once_and_uses_the_cache() -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    cache = AnalysisCache()
+    collector = TimingCollector()
+    graphs = build_graphs(
+        sql,
+        "postgres",
+        modes=["tables_only", "ER_COLUMNS"],
+        cache=cache,
+        tracer=collector,
+    )
+    assert list(graphs) == ["tables_only", "er_columns"]
+    phases = collector.to_dict()["phases"]
+    assert phases["split"]["calls"] == 1
+    assert phases["graph"]["calls"] == 2
+    assert "generated_at" in graphs["er_columns"]["meta"]
+
+    cached = TimingCollector()
+    build_graphs(
+        sql, "postgres", modes=["er_columns", "full"], cache=cache, tracer=cached
+    )
+    assert cached.to_dict()["phases"]["graph"]["calls"] == 1
+    assert build_graph(sql, "postgres", mode="tables_only", cache=cache)["mode"] == (
+        "tables_only"
+    )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+# Extra seconds `sql-lineage --help` may take over a bare interpreter start.
+# Wall-clock budgets are machine dependent, so the check only runs when set.
+HELP_BUDGET = os.environ.get("SQL_LINEAGE_HELP_BUDGET")
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _best_time(args: List[str], runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        _run(args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def test_package_and_cli_import_without_sqlglot() -> None:
+    script = (
+        "import sys, sql_lineage, sql_lineage.cli\n"
+        "assert 'sqlglot' not in sys.modules, 'sqlglot imported eagerly'\n"
+        "sql_lineage.analyze\n"
+        "assert 'sqlglot' in sys.modules\n"
+    )
+    _run(["-c", script])
+
+
+@pytest.mark.skipif(HELP_BUDGET is None, reason="SQL_LINEAGE_HELP_BUDGET not set")
+def test_cli_help_stays_within_budget() -> None:
+    baseline = _best_time(["-c", "pass"])
+    elapsed = _best_time(["-m", "sql_lineage.cli", "--help"])
+    assert elapsed - baseline < float(
+        HELP_BUDGET
+    ), f"--help took {elapsed:.3f}s ({baseline:.3f}s interpreter start)"
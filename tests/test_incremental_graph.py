@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from sql_lineage.graph import build_graph
+from sql_lineage.incremental import IncrementalGraph
+from sql_lineage.parser import split_statements
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("mode", ["full", "er_columns", "tables_only"])
+def test_incremental_graph_matches_build_graph(mode: str) -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    graph = IncrementalGraph(dialect="postgres", mode=mode)
+    for number, chunk in enumerate(split_statements(sql, "postgres")):
+        graph.add(f"model_{number}", chunk.sql)
+    expected = build_graph(sql, dialect="postgres", mode=mode, include_timestamp=False)
+    assert graph.to_dict() == expected
+
+
+def test_replace_and_remove_only_touch_affected_ids() -> None:
+    graph = IncrementalGraph(dialect="postgres", mode="full")
+    graph.add("a", "CREATE TABLE s.a AS SELECT u.id AS id FROM core.users u")
+    graph.add("b", "CREATE TABLE s.b AS SELECT o.id AS id FROM core.orders o")
+    edges_b = {
+        edge["id"] for edge in graph.to_dict()["edges"] if edge["statement_index"] == 2
+    }
+
+    delta = graph.replace(
+        "a", "CREATE TABLE s.a AS SELECT u.id AS id, u.name AS name FROM core.users u"
+    )
+    assert "column:s.a.name" in delta.added_nodes
+    assert delta.removed_edges == []
+    assert not any(edge in edges_b for edge in delta.added_edges)
+    after = graph.to_dict()
+    assert edges_b <= {edge["id"] for edge in after["edges"]}
+    assert graph.keys() == ["a", "b"]
+
+    delta = graph.remove("b")
+    assert "table:core.orders" in delta.removed_nodes
+    assert set(delta.removed_edges) == edges_b
+    assert "table:core.orders" not in {node["id"] for node in graph.to_dict()["nodes"]}
+
+
+def test_multi_statement_sql_is_rejected_per_key() -> None:
+    graph = IncrementalGraph(dialect="postgres")
+    graph.add("a", "CREATE TABLE s.a AS SELECT u.id AS id FROM core.users u")
+    with pytest.raises(ValueError, match="2 statements"):
+        graph.add("b", "SELECT 1 AS x; SELECT 2 AS y")
+    with pytest.raises(ValueError):
+        graph.replace("a", "SELECT 1 AS x; SELECT 2 AS y")
+    assert graph.keys() == ["a"]
+    graph.add("b", "SELECT 1 AS x")
+    indexes = {edge["statement_index"] for edge in graph.to_dict()["edges"]}
+    assert indexes == {1, 2}
+
+
+def _edge_ids(graph: dict) -> set:
+    return {edge["id"] for edge in graph["edges"]}
+
+
+def test_edge_ids_survive_statements_added_in_front() -> None:
+    sql = (
+        "CREATE TABLE s.a AS SELECT u.id AS id FROM core.users u;\n"
+        "CREATE TABLE s.b AS SELECT u.id AS id FROM core.users u"
+    )
+    before = _edge_ids(build_graph(sql, include_timestamp=False))
+    prefixed = build_graph("SELECT 1;\n" + sql, include_timestamp=False)
+    assert before <= _edge_ids(prefixed)
+
+
+def test_identical_edges_of_several_keys_are_numbered() -> None:
+    statement = "CREATE TABLE s.a AS SELECT u.id AS id FROM core.users u"
+    graph = IncrementalGraph()
+    graph.add("a", statement)
+    graph.add("b", statement)
+    expected = build_graph(f"{statement};\n{statement}", include_timestamp=False)
+    assert graph.to_dict() == expected
+    delta = graph.remove("a")
+    assert delta.removed_edges
+    assert all(edge_id.count(":") == 3 for edge_id in delta.removed_edges)
+    single = build_graph(statement, include_timestamp=False)
+    assert _edge_ids(graph.to_dict()) == _edge_ids(single)
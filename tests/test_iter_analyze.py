@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+from sql_lineage import analyze, iter_analyze, parser
+from sql_lineage.cli import main
+from sql_lineage.parser import iter_stream_chunks
+
+FIXTURE = Path(__file__).parent.joinpath("fixtures", "postgres_complex.sql")
+
+
+def test_iter_analyze_stream_matches_analyze() -> None:
+    sql = FIXTURE.read_text(encoding="utf-8") + "\nSELECT 'a;b' AS c FROM t;\n"
+    expected = analyze(sql, dialect="postgres")["statements"]
+    stream = io.StringIO(sql)
+    streamed = [
+        item.to_dict() for item in iter_analyze(stream, "postgres", block_size=7)
+    ]
+    assert streamed == expected
+
+
+def test_stream_splitting_tokenizes_each_statement_once(monkeypatch) -> None:
+    statement = "SELECT " + ", ".join(f"'v;{n}' AS c{n}" for n in range(300))
+    sql = f"{statement} FROM t;\nSELECT 1;\n"
+    tokenized = []
+    original = parser._tokenize
+
+    def counting(text, dialect):
+        tokenized.append(len(text))
+        return original(text, dialect)
+
+    monkeypatch.setattr(parser, "_tokenize", counting)
+    chunks = list(iter_stream_chunks(io.StringIO(sql), "postgres", block_size=16))
+    assert [chunk.sql for chunk in chunks] == [f"{statement} FROM t", "SELECT 1"]
+    assert sum(tokenized) <= 2 * len(sql)
+
+
+def test_oversized_statement_becomes_error() -> None:
+    sql = "SELECT 1 AS a; SELECT '" + "x" * 500 + "' AS b; SELECT 2 AS c;"
+    statements = list(
+        iter_analyze(
+            io.StringIO(sql), "postgres", block_size=32, max_statement_size=100
+        )
+    )
+    assert [item.statement_type for item in statements] == [
+        "select",
+        "unparsed",
+        "select",
+    ]
+    assert [item.index for item in statements] == [1, 2, 3]
+    assert statements[1].errors == ["Statement exceeds 100 characters"]
+
+
+def test_iter_analyze_accepts_paths_and_strings() -> None:
+    from_path = list(iter_analyze(FIXTURE, dialect="postgres"))
+    from_text = list(iter_analyze(FIXTURE.read_text(encoding="utf-8"), "postgres"))
+    assert [item.to_dict() for item in from_path] == [
+        item.to_dict() for item in from_text
+    ]
+    assert [item.index for item in from_path] == list(range(1, len(from_path) + 1))
+
+
+def test_cli_ndjson_writes_one_line_per_statement(capsys) -> None:
+    code = main(
+        ["analyze", "--file", str(FIXTURE), "--dialect", "postgres", "--ndjson"]
+    )
+    lines = capsys.readouterr().out.splitlines()
+    assert code == 0
+    assert len(lines) == len(analyze(FIXTURE.read_text(), "postgres")["statements"])
+    assert json.loads(lines[0])["index"] == 1
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from sql_lineage import analyze
+
+RECURSIVE_SQL = """
+WITH RECURSIVE t AS (
+    SELECT 1 AS n
+    UNION ALL
+    SELECT n + 1 AS n FROM t WHERE n < 5
+)
+SELECT n FROM t;
+"""
+
+
+def _fan_out_chain(levels: int) -> str:
+    """Build a CTE chain where every level uses both columns of the previous."""
+
+    ctes = ["c0 AS (SELECT s.x AS x, s.y AS y FROM core.src s)"]
+    for level in range(1, levels + 1):
+        prev = f"c{level - 1}"
+        ctes.append(
+            f"c{level} AS (SELECT {prev}.x + {prev}.y AS x, "
+            f"{prev}.x * {prev}.y AS y FROM {prev})"
+        )
+    return f"WITH {', '.join(ctes)} SELECT c{levels}.x AS x FROM c{levels}"
+
+
+def test_recursive_cte_reports_cycle_note() -> None:
+    result = analyze(RECURSIVE_SQL, dialect="postgres")
+    column = result["statements"][0]["output"]["columns"][0]
+    assert {"lineage_cycle": "t.n"} in column["lineage"]["notes"]
+
+
+def test_fan_out_cte_chain_expands_once_per_pair() -> None:
+    result = analyze(_fan_out_chain(40), dialect="postgres")
+    column = result["statements"][0]["output"]["columns"][0]
+    inputs = column["lineage"]["inputs"]
+    assert {"table": "s", "column": "x"} in inputs
+    assert {"table": "s", "column": "y"} in inputs
+    assert len(inputs) == len({(item["table"], item["column"]) for item in inputs})
+    assert column["lineage"]["notes"] == []
+
+
+def test_depth_limit_is_reported_as_note() -> None:
+    result = analyze(_fan_out_chain(10), dialect="postgres", max_lineage_depth=3)
+    column = result["statements"][0]["output"]["columns"][0]
+    assert {"table": "s", "column": "x"} not in column["lineage"]["inputs"]
+    assert any("lineage_depth_limit" in note for note in column["lineage"]["notes"])
+
+
+def test_depth_limited_expansion_does_not_depend_on_order() -> None:
+    chain = (
+        "WITH c1 AS (SELECT s.x AS x FROM core.src s), "
+        "c2 AS (SELECT c1.x AS x FROM c1), c3 AS (SELECT c2.x AS x FROM c2), "
+        "c4 AS (SELECT c3.x AS x FROM c3), c5 AS (SELECT c4.x AS x FROM c4), "
+        "c6 AS (SELECT c5.x AS x FROM c5) "
+    )
+
+    def lineage(select: str) -> dict:
+        result = analyze(chain + select, dialect="postgres", max_lineage_depth=3)
+        return result["statements"][0]["output"]["columns"][-1]["lineage"]
+
+    alone = lineage("SELECT c4.x AS x FROM c4")
+    after_deeper = lineage("SELECT c6.x AS a, c4.x AS x FROM c6, c4")
+    assert after_deeper == alone
+    assert {"table": "c1", "column": "x"} in alone["inputs"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import LineageGraph, build_graph
+from sql_lineage.lineage_graph import GraphTraversal
+from sql_lineage.serialization import dump_graph
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def _graph(edges, extra_nodes=()) -> dict:
+    names = sorted({name for edge in edges for name in edge[:2]} | set(extra_nodes))
+    return {
+        "nodes": [{"id": name, "type": "column"} for name in names],
+        "edges": [
+            {"id": f"e{index}", "type": edge_type, "from": source, "to": target}
+            for index, (source, target, edge_type) in enumerate(edges)
+        ],
+    }
+
+
+def test_indexes_and_traversal_on_fixture_graph() -> None:
+    graph = LineageGraph(
+        build_graph(_load_fixture("postgres_complex.sql"), dialect="postgres")
+    )
+    target = "analytics.result_table.net_total_filled"
+    assert graph.node_id(target) == f"column:{target}"
+    assert len(graph.columns_of("analytics.result_table")) == 5
+    assert {node["type"] for node in graph.nodes_of_type("cte")} == {"cte"}
+    assert {edge["type"] for edge in graph.in_edges(target)} == {
+        "contains",
+        "lineage",
+        "produces",
+    }
+    assert [edge["type"] for edge in graph.in_edges(target, ["produces"])] == [
+        "produces"
+    ]
+
+    upstream = dict(graph.upstream(target))
+    assert upstream["column:core.orders.total"] == 1
+    assert "table:analytics.result_table" not in upstream
+    assert "table:analytics.result_table" in dict(
+        graph.upstream(target, edge_types=None)
+    )
+    downstream = dict(graph.downstream("core.orders.total"))
+    assert downstream["column:analytics.summary_table.sum_total"] == 2
+    assert list(graph.paths("core.orders.total", target)) == [
+        ["column:core.orders.total", f"column:{target}"],
+        [
+            "column:core.orders.total",
+            "expr:1:net_total_filled:98d9962b",
+            f"column:{target}",
+        ],
+    ]
+    with pytest.raises(KeyError):
+        graph.upstream("missing.column")
+
+
+def test_bfs_depth_edge_types_cycles_and_paths() -> None:
+    graph = LineageGraph(
+        _graph(
+            [
+                ("a", "b", "lineage"),
+                ("a", "b", "uses"),
+                ("b", "c", "lineage"),
+                ("a", "c", "lineage"),
+                ("c", "a", "lineage"),
+                ("c", "d", "contains"),
+                ("x", "y", "lineage"),
+            ],
+            extra_nodes=["lonely"],
+        )
+    )
+    assert list(graph.downstream("a")) == [("b", 1), ("c", 1)]
+    assert list(graph.downstream("a", depth=1, edge_types=["uses"])) == [("b", 1)]
+    assert dict(graph.downstream("a", edge_types=None))["d"] == 2
+    assert list(graph.upstream("c")) == [("b", 1), ("a", 1)]
+    assert list(graph.paths("a", "c")) == [["a", "c"], ["a", "b", "c"]]
+    assert list(graph.paths("a", "c", depth=1)) == [["a", "c"]]
+    assert list(graph.paths("a", "y")) == []
+    assert list(graph.downstream("lonely")) == []
+
+
+def test_load_from_json_and_ndjson(tmp_path) -> None:
+    data = build_graph(
+        _load_fixture("mysql_complex.sql"), dialect="mysql", mode="er_columns"
+    )
+    json_path = tmp_path / "graph.json"
+    json_path.write_text(json.dumps(data), encoding="utf-8")
+    ndjson_path = tmp_path / "graph.ndjson"
+    with open(ndjson_path, "w", encoding="utf-8") as handle:
+        dump_graph(handle, data, style="ndjson")
+
+    stream = io.StringIO()
+    dump_graph(stream, data, style="ndjson")
+    stream.seek(0)
+    for graph in (
+        LineageGraph.load(json_path),
+        LineageGraph.load(str(ndjson_path)),
+        LineageGraph.load(stream),
+    ):
+        assert len(graph) == len(data["nodes"])
+        assert len(graph.edges) == len(data["edges"])
+        assert graph.to_dict() == data
+
+
+def test_graph_traversal_requires_key_name_and_neighbors() -> None:
+    class Partial(GraphTraversal):
+        def _key(self, node):
+            return node
+
+    with pytest.raises(TypeError):
+        Partial()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from sql_lineage import AnalysisCache, analyze, build_graph, export_graph
+from sql_lineage.profiling import TimingCollector
+
+SQL = """
+WITH recent AS (SELECT user_id, amount FROM sales.orders WHERE amount > 0)
+SELECT u.id, SUM(r.amount) AS total
+FROM core.users u JOIN recent r ON r.user_id = u.id
+GROUP BY u.id;
+INSERT INTO mart.users SELECT id, name FROM core.users;
+"""
+
+
+class _RecordingTracer:
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, str, Optional[int]]] = []
+
+    def enter(self, phase: str, statement: Optional[int]) -> None:
+        self.events.append(("enter", phase, statement))
+
+    def exit(
+        self, phase: str, statement: Optional[int], seconds: float, nodes: int
+    ) -> None:
+        assert seconds >= 0 and nodes >= 0
+        self.events.append(("exit", phase, statement))
+
+
+def test_timings_attached_per_phase_and_statement() -> None:
+    collector = TimingCollector()
+    result = analyze(SQL, dialect="postgres", tracer=collector)
+    timings = result["meta"]["timings"]
+    assert list(timings["phases"]) == ["split", "parse", "context", "lineage"]
+    assert timings["phases"]["parse"]["calls"] == 2
+    assert timings["phases"]["parse"]["nodes"] > 0
+    # The CTE is analyzed inside the context phase of the outer query.
+    context = timings["phases"]["context"]
+    assert context["calls"] == 3
+    assert context["self_seconds"] < context["seconds"]
+    assert [item["index"] for item in timings["statements"]] == [1, 2]
+    assert timings["statements"][1]["phases"]["lineage"]["calls"] == 2
+
+    plain = analyze(SQL, dialect="postgres")
+    assert "meta" not in plain
+    del result["meta"]
+    assert result == plain
+
+
+def test_graph_and_export_phases() -> None:
+    collector = TimingCollector()
+    cache = AnalysisCache()
+    graph = build_graph(
+        SQL, dialect="postgres", include_timestamp=False, tracer=collector, cache=cache
+    )
+    export_graph(graph, format="mermaid_flowchart", tracer=collector)
+    phases = collector.to_dict()["phases"]
+    assert phases["graph"]["nodes"] == len(graph["nodes"])
+    assert phases["export"]["calls"] == 1
+    assert graph["meta"]["timings"]["phases"]["graph"]["calls"] == 1
+
+    cached = build_graph(SQL, dialect="postgres", include_timestamp=False, cache=cache)
+    assert "timings" not in cached["meta"]
+
+
+def test_custom_tracer_sees_nested_balanced_phases() -> None:
+    tracer = _RecordingTracer()
+    build_graph(SQL, dialect="postgres", tracer=tracer)
+    depth = 0
+    for kind, _phase, _statement in tracer.events:
+        depth += 1 if kind == "enter" else -1
+        assert depth >= 0
+    assert depth == 0
+    assert ("enter", "context", 1) in tracer.events
+    assert tracer.events[-1] == ("exit", "graph", None)
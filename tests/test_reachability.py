@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import LineageGraph, ReachabilityIndex, build_graph
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def _assert_matches_traversal(graph: dict, index: ReachabilityIndex) -> None:
+    indexed = LineageGraph(graph)
+    node_ids = [node["id"] for node in graph["nodes"]]
+    downstream = {
+        node_id: {found for found, _ in indexed.downstream(node_id)}
+        for node_id in node_ids
+    }
+    for source in node_ids:
+        for node in node_ids:
+            assert index.depends_on(node, source) == (node in downstream[source])
+    changed = node_ids[::3]
+    expected = set().union(*(downstream[node_id] for node_id in changed))
+    assert set(index.impacted(changed)) == expected
+
+
+@pytest.mark.parametrize("dialect", ["clickhouse", "mysql", "postgres", "spark"])
+def test_index_matches_downstream_on_fixtures(dialect: str) -> None:
+    graph = build_graph(_load_fixture(f"{dialect}_complex.sql"), dialect)
+    index = ReachabilityIndex(graph)
+    _assert_matches_traversal(graph, index)
+    target = "analytics.result_table.net_total_filled"
+    if dialect == "postgres":
+        assert index.depends_on(target, "core.orders.total")
+        assert not index.depends_on("core.orders.total", target)
+
+
+def test_cycles_and_batch_impact() -> None:
+    edges = [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("x", "y")]
+    graph = {
+        "nodes": [{"id": name, "type": "column"} for name in "abcdxy"],
+        "edges": [
+            {"type": "lineage", "from": source, "to": target}
+            for source, target in edges
+        ],
+    }
+    index = ReachabilityIndex(graph)
+    assert index.component_count == 4
+    assert index.depends_on("a", "c") and index.depends_on("c", "a")
+    assert not index.depends_on("a", "a")
+    assert index.impacted(["a"]) == ["b", "c", "d"]
+    assert index.impacted(["a", "b", "x"]) == ["a", "b", "c", "d", "y"]
+    with pytest.raises(KeyError):
+        index.depends_on("a", "missing")
+
+
+def test_added_edges_update_the_closure_incrementally() -> None:
+    generator = random.Random(7)
+    for _ in range(50):
+        size = generator.randint(2, 12)
+        edges = [
+            {
+                "type": generator.choice(["lineage", "col_lineage", "contains"]),
+                "from": f"n{generator.randrange(size)}",
+                "to": f"n{generator.randrange(size + 2)}",
+            }
+            for _ in range(generator.randint(1, 20))
+        ]
+        split = generator.randint(0, len(edges))
+        nodes = [{"id": f"n{position}", "type": "column"} for position in range(size)]
+        index = ReachabilityIndex({"nodes": nodes, "edges": edges[:split]})
+        index.add_edges(edges[split:])
+        full = {"nodes": nodes, "edges": edges}
+        assert index.impacted(index.positions) == ReachabilityIndex(full).impacted(
+            index.positions
+        )
+        _assert_matches_traversal(full, index)
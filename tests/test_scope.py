@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlglot import exp, parse
+
+from sql_lineage.collectors import collect_joins
+from sql_lineage.scope import build_select_scope
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_select_scope_matches_find_all_order() -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    for statement in parse(sql, read="postgres"):
+        for select in statement.find_all(exp.Select):
+            scope = build_select_scope(select)
+            assert scope.subqueries == list(select.find_all(exp.Subquery))
+            for item, select_expr in zip(scope.items, select.expressions):
+                assert item.columns == list(select_expr.find_all(exp.Column))
+                assert item.literals == list(select_expr.find_all(exp.Literal))
+                assert item.functions == list(
+                    select_expr.find_all((exp.Func, exp.Anonymous))
+                )
+
+
+def test_select_scope_collects_joins_and_ctes() -> None:
+    select = parse(
+        "WITH a AS (SELECT 1 AS x), b AS (SELECT 2 AS y) "
+        "SELECT a.x FROM a JOIN b ON a.x = b.y JOIN c ON c.id = a.x",
+        read="postgres",
+    )[0]
+    scope = build_select_scope(select)
+    assert [cte.alias_or_name for cte in scope.ctes] == ["a", "b"]
+    assert [join.this.name for join in scope.joins] == ["b", "c"]
+    assert collect_joins(select, "postgres", join_nodes=scope.joins) == (
+        collect_joins(select, "postgres")
+    )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from sql_lineage import analyze, analyze_typed, iter_analyze, resolve_script_lineage
+from sql_lineage.models import ColumnRef
+
+SCRIPT = """
+CREATE TABLE staging.tmp AS
+SELECT u.id, u.name AS uname, o.amount
+FROM core.users u JOIN core.orders o ON u.id = o.user_id;
+CREATE TABLE mart.agg AS SELECT id, sum(amount) AS total FROM staging.tmp GROUP BY id;
+SELECT * FROM staging.tmp;
+SELECT a.total, t.uname FROM mart.agg a JOIN staging.tmp t ON a.id = t.id;
+"""
+
+
+def _columns(statement: dict) -> dict:
+    return {
+        column["name"]: (
+            [(source["table"], source["column"]) for source in column["sources"]],
+            column["via"],
+        )
+        for column in statement["columns"]
+    }
+
+
+def test_references_resolve_through_prior_targets() -> None:
+    result = analyze(SCRIPT, dialect="postgres", cross_statement=True)
+    statements = result["cross_statement"]["statements"]
+    assert _columns(statements[1])["total"] == ([("core.orders", "amount")], [1])
+    assert _columns(statements[3]) == {
+        "total": ([("core.orders", "amount")], [2, 1]),
+        "uname": ([("core.users", "name")], [1]),
+    }
+    assert result["cross_statement"]["tables"]["mart.agg"]["statement_index"] == 2
+
+
+def test_select_star_expands_prior_target_columns() -> None:
+    result = analyze(SCRIPT, dialect="postgres", cross_statement=True)
+    columns = _columns(result["cross_statement"]["statements"][2])
+    assert list(columns) == ["id", "uname", "amount"]
+    assert columns["amount"] == ([("core.orders", "amount")], [1])
+
+
+def test_latest_definition_wins_and_index_is_incremental() -> None:
+    sql = (
+        "CREATE TABLE s.t AS SELECT a.x FROM src.a a;\n"
+        "CREATE TABLE s.t AS SELECT b.x FROM src.b b;\n"
+        "SELECT t.x FROM s.t t;\n"
+    )
+    lineage = resolve_script_lineage(iter_analyze(sql, dialect="postgres"))
+    assert lineage.column_sources("s.t", "x") == [ColumnRef(table="src.b", column="x")]
+    assert lineage.statements[2].columns[0].via == [2]
+    statements = analyze_typed(sql, dialect="postgres").statements
+    assert resolve_script_lineage(statements).to_dict() == lineage.to_dict()
+
+
+def test_cross_statement_is_opt_in() -> None:
+    assert "cross_statement" not in analyze(SCRIPT, dialect="postgres")
+
+
+def test_star_expands_outer_relations_only() -> None:
+    sql = (
+        "CREATE TABLE staging.tmp AS SELECT u.id, u.name FROM core.users u;\n"
+        "CREATE TABLE mart.x AS WITH c AS (SELECT t.id FROM staging.tmp t) "
+        "SELECT * FROM c;\n"
+        "CREATE TABLE mart.y AS SELECT s.* FROM (SELECT t.id FROM staging.tmp t) s;\n"
+        "CREATE TABLE mart.z AS SELECT * FROM (SELECT t.id FROM staging.tmp t) s "
+        "JOIN staging.tmp t2 ON s.id = t2.id;\n"
+    )
+    lineage = resolve_script_lineage(iter_analyze(sql, dialect="postgres"))
+    assert list(lineage.table_columns("mart.x")) == ["id"]
+    assert lineage.column_sources("mart.x", "id") == [
+        ColumnRef(table="core.users", column="id")
+    ]
+    assert list(lineage.table_columns("mart.y")) == ["id"]
+    assert [column.name for column in lineage.statements[3].columns] == [
+        "id",
+        "id",
+        "name",
+    ]
+
+
+def test_insert_merges_into_created_table() -> None:
+    sql = (
+        "CREATE TABLE s.t AS SELECT u.id, u.name FROM core.users u;\n"
+        "INSERT INTO s.t (id, name) SELECT w.a, w.b FROM core.w w;\n"
+        "INSERT INTO s.t SELECT v.x, v.y FROM core.v v;\n"
+        "SELECT name FROM s.t;\n"
+    )
+    lineage = resolve_script_lineage(iter_analyze(sql, dialect="postgres"))
+    assert lineage.statements[1].target == "s.t"
+    assert [column.name for column in lineage.statements[2].columns] == ["id", "name"]
+    assert lineage.column_sources("s.t", "name") == [
+        ColumnRef(table="core.users", column="name"),
+        ColumnRef(table="core.w", column="b"),
+        ColumnRef(table="core.v", column="y"),
+    ]
+    assert _columns(lineage.to_dict()["statements"][3])["name"] == (
+        [("core.users", "name"), ("core.w", "b"), ("core.v", "y")],
+        [1, 2, 3],
+    )
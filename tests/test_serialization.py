@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import analyze, analyze_typed, build_graph, export_graph
+from sql_lineage.cli import main
+from sql_lineage.serialization import dump_analysis, dump_graph, load_ndjson
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_pretty_output_matches_existing_json() -> None:
+    sql = _load_fixture("postgres_complex.sql")
+    analysis = analyze_typed(sql, dialect="postgres")
+    stream = io.StringIO()
+    dump_analysis(stream, analysis, backend="json")
+    expected = json.dumps(analysis.to_dict(), indent=2, ensure_ascii=False)
+    assert stream.getvalue() == expected
+
+    result = analyze(sql, dialect="postgres", cross_statement=True)
+    stream = io.StringIO()
+    dump_analysis(stream, result, backend="json")
+    assert stream.getvalue() == json.dumps(result, indent=2, ensure_ascii=False)
+
+    graph = build_graph(sql, dialect="postgres")
+    stream = io.StringIO()
+    dump_graph(stream, graph, backend="json")
+    assert stream.getvalue() == export_graph(graph, format="json")
+
+
+def test_compact_and_ndjson_round_trip() -> None:
+    sql = _load_fixture("clickhouse_complex.sql")
+    analysis = analyze_typed(sql, dialect="clickhouse")
+    graph = build_graph(sql, dialect="clickhouse", mode="er_columns")
+
+    binary = io.BytesIO()
+    dump_graph(binary, graph, style="compact", backend="json")
+    assert b"\n" not in binary.getvalue()
+    assert json.loads(binary.getvalue()) == graph
+
+    stream = io.StringIO()
+    dump_graph(stream, graph, style="ndjson", backend="json")
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1 + len(graph["nodes"]) + len(graph["edges"])
+    assert set(json.loads(lines[0])) == {"graph"}
+    rebuilt = load_ndjson(lines)
+    assert rebuilt == graph and list(rebuilt) == list(graph)
+
+    stream = io.StringIO()
+    dump_analysis(stream, analysis, style="ndjson", backend="json")
+    assert load_ndjson(io.StringIO(stream.getvalue())) == analysis.to_dict()
+
+    with pytest.raises(ValueError):
+        dump_graph(io.StringIO(), graph, style="yaml")
+
+
+def test_orjson_backend_matches_json_backend() -> None:
+    pytest.importorskip("orjson")
+    graph = build_graph(_load_fixture("spark_complex.sql"), dialect="spark")
+    for style in ("pretty", "compact", "ndjson"):
+        fast, slow = io.StringIO(), io.StringIO()
+        dump_graph(fast, graph, style=style, backend="orjson")
+        dump_graph(slow, graph, style=style, backend="json")
+        assert fast.getvalue() == slow.getvalue()
+
+
+def test_cli_compact_and_ndjson_graph(capsys) -> None:
+    assert main(["analyze", "--sql", "SELECT a FROM t", "--compact"]) == 0
+    output = capsys.readouterr().out
+    assert output.count("\n") == 1
+    assert json.loads(output) == analyze("SELECT a FROM t")
+
+    assert main(["graph", "--sql", "SELECT a FROM t", "--format", "ndjson"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert list(records[0]) == ["graph"]
+    assert {next(iter(record)) for record in records[1:]} == {"node", "edge"}
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sql_lineage import AnalysisCache, analyze
+from sql_lineage import server as server_module
+from sql_lineage.server import LineageServer
+
+SQL = "SELECT u.id FROM core.users u"
+
+
+def _server(**options) -> LineageServer:
+    options.setdefault("executor", ThreadPoolExecutor(max_workers=2))
+    options.setdefault("workers", 2)
+    return LineageServer(**options)
+
+
+async def _http(port: int, method: str, path: str, body: bytes = b"") -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _sep, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+def test_rpc_methods_over_http() -> None:
+    async def scenario() -> None:
+        lineage = _server(cache=AnalysisCache())
+        listener = await lineage.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        batch = [
+            {"jsonrpc": "2.0", "id": 1, "method": "analyze", "params": {"sql": SQL}},
+            {"jsonrpc": "2.0", "id": 2, "method": "analyze", "params": {"sql": SQL}},
+            {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "method": "export",
+                "params": {"sql": SQL, "format": "mermaid_flowchart"},
+            },
+            {"jsonrpc": "2.0", "id": 4, "method": "nope", "params": {}},
+        ]
+        status, body = await _http(port, "POST", "/", json.dumps(batch).encode())
+        assert status == 200
+        responses = {item["id"]: item for item in json.loads(body)}
+        assert responses[1]["result"] == analyze(SQL)
+        assert responses[2]["result"] == responses[1]["result"]
+        assert responses[3]["result"].startswith("flowchart")
+        assert responses[4]["error"]["code"] == server_module.METHOD_NOT_FOUND
+
+        graph_request = {
+            "jsonrpc": "2.0",
+            "id": 5,
+            "method": "graph",
+            "params": {"sql": SQL, "mode": "tables_only"},
+        }
+        status, body = await _http(
+            port, "POST", "/", json.dumps(graph_request).encode()
+        )
+        assert "generated_at" in json.loads(body)["result"]["meta"]
+
+        status, metrics = await _http(port, "GET", "/metrics")
+        text = metrics.decode()
+        assert status == 200
+        assert 'sql_lineage_requests_total{method="analyze",status="ok"} 2' in text
+        assert 'sql_lineage_request_seconds_count{method="analyze"} 2' in text
+        assert "sql_lineage_cache_hits_total 1" in text
+        assert (await _http(port, "GET", "/missing"))[0] == 404
+        await lineage.close()
+
+    asyncio.run(scenario())
+
+
+def test_timeouts_and_full_queue(monkeypatch) -> None:
+    release = threading.Event()
+
+    def blocking(params):
+        release.wait(5)
+        return {"done": params["sql"]}
+
+    monkeypatch.setitem(server_module.METHODS, "analyze", blocking)
+
+    async def scenario() -> None:
+        lineage = _server(workers=1, max_queue=0, timeout=0.2)
+
+        def request(request_id: int) -> dict:
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "analyze",
+                "params": {"sql": f"SELECT {request_id}"},
+            }
+
+        first = asyncio.ensure_future(lineage.handle_rpc(request(1)))
+        await asyncio.sleep(0.05)
+        busy = await lineage.handle_rpc(request(2))
+        assert busy["error"]["code"] == server_module.SERVER_BUSY
+        timed_out = await first
+        assert timed_out["error"]["code"] == server_module.REQUEST_TIMEOUT
+        release.set()
+        assert lineage.metrics.requests[("analyze", "timeout")] == 1
+        assert lineage.metrics.requests[("analyze", "busy")] == 1
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_jobs_keep_their_slot(monkeypatch) -> None:
+    release = threading.Event()
+
+    def blocking(params):
+        if params["sql"] == "SELECT 1":
+            release.wait(5)
+        return {"done": params["sql"]}
+
+    monkeypatch.setitem(server_module.METHODS, "analyze", blocking)
+
+    async def scenario() -> None:
+        lineage = _server(workers=1, max_queue=0, timeout=0.1)
+
+        def request(request_id: int) -> dict:
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "analyze",
+                "params": {"sql": f"SELECT {request_id}"},
+            }
+
+        timed_out = await lineage.handle_rpc(request(1))
+        assert timed_out["error"]["code"] == server_module.REQUEST_TIMEOUT
+        assert lineage.metrics.in_flight == 1
+        busy = await lineage.handle_rpc(request(2))
+        assert busy["error"]["code"] == server_module.SERVER_BUSY
+        release.set()
+        for _ in range(100):
+            if lineage.metrics.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert lineage.metrics.in_flight == 0
+        assert (await lineage.handle_rpc(request(3)))["result"] == {"done": "SELECT 3"}
+
+    asyncio.run(scenario())
+
+
+def test_invalid_requests() -> None:
+    async def scenario() -> None:
+        lineage = _server()
+        bad_params = await lineage.handle_rpc(
+            {"jsonrpc": "2.0", "id": 1, "method": "analyze", "params": {}}
+        )
+        assert bad_params["error"]["code"] == server_module.INVALID_PARAMS
+        invalid = await lineage.handle_rpc({"id": 2})
+        assert invalid["error"]["code"] == server_module.INVALID_REQUEST
+        notification = await lineage.handle_rpc(
+            {"jsonrpc": "2.0", "method": "analyze", "params": {"sql": SQL}}
+        )
+        assert notification is None
+
+    asyncio.run(scenario())
+
+
+def test_params_are_validated_and_catalog_paths_rejected(tmp_path) -> None:
+    catalog = {"core.users": ["id", "name"]}
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(catalog), encoding="utf-8")
+    star = "SELECT * FROM core.users"
+
+    async def scenario() -> None:
+        lineage = _server(cache=AnalysisCache(), catalog=str(path))
+
+        async def call(params: object) -> dict:
+            return await lineage.handle_rpc(
+                {"jsonrpc": "2.0", "id": 1, "method": "analyze", "params": params}
+            )
+
+        for params in (
+            [SQL],
+            {"sql": SQL, "dialect": 5},
+            {"sql": SQL, "catalog": str(path)},
+            {"sql": SQL, "catalog": {"core.users": 5}},
+        ):
+            response = await call(params)
+            assert response["error"]["code"] == server_module.INVALID_PARAMS
+        expected = analyze(star, catalog=catalog)
+        assert (await call({"sql": star}))["result"] == expected
+        inline = await call({"sql": star, "catalog": {"core.users": ["id"]}})
+        assert inline["result"] == analyze(star, catalog={"core.users": ["id"]})
+
+    asyncio.run(scenario())
+
+
+def test_inline_catalog_is_loaded_once_off_the_loop(monkeypatch) -> None:
+    threads = []
+    load_catalog = server_module.load_catalog
+
+    def counting_load(source):
+        threads.append(threading.get_ident())
+        return load_catalog(source)
+
+    monkeypatch.setattr(server_module, "load_catalog", counting_load)
+    star = "SELECT * FROM core.users"
+    catalog = {"core.users": ["id", "name"]}
+
+    async def scenario() -> None:
+        lineage = _server(cache=AnalysisCache(), catalog=catalog)
+        loop_thread = threading.get_ident()
+        for params in ({"sql": star}, {"sql": star}, {"sql": star, "catalog": catalog}):
+            response = await lineage.handle_rpc(
+                {"jsonrpc": "2.0", "id": 1, "method": "analyze", "params": params}
+            )
+            assert response["result"] == analyze(star, catalog=catalog)
+        assert len(threads) == 2
+        assert loop_thread not in threads
+
+    asyncio.run(scenario())
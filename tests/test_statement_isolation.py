@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sql_lineage import analyze
+from sql_lineage.parser import split_statements
+
+SCRIPT = """
+SELECT a.id AS id FROM core.a a;
+CREATE TABLE broken (id INT) ENGINE = ????;
+-- a comment; with a semicolon
+SELECT 'x;y' AS label, b.id AS id FROM core.b b;
+"""
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def test_split_statements_respects_strings_and_comments() -> None:
+    chunks = split_statements(SCRIPT, "postgres")
+    assert len(chunks) == 3
+    assert chunks[2].sql.startswith("SELECT 'x;y' AS label")
+    assert SCRIPT[chunks[0].start : chunks[0].end] == chunks[0].sql
+
+
+def test_parse_error_is_isolated_to_failing_statement() -> None:
+    result = analyze(SCRIPT, dialect="postgres")
+    statements = result["statements"]
+    assert result["errors"] == []
+    assert [item["index"] for item in statements] == [1, 2, 3]
+    assert [item["type"] for item in statements] == ["select", "unparsed", "select"]
+    assert statements[0]["errors"] == [] and statements[2]["errors"] == []
+    assert statements[1]["errors"][0].startswith("Failed to parse")
+    label = statements[2]["output"]["columns"][0]
+    assert label["name"] == "label"
+
+
+def test_parallel_statement_analysis_matches_sequential() -> None:
+    sql = _load_fixture("clickhouse_complex.sql") + SCRIPT
+    assert analyze(sql, dialect="clickhouse", workers=2) == analyze(
+        sql, dialect="clickhouse"
+    )
+
+
+def test_tokenizer_error_only_breaks_its_statement() -> None:
+    sql = "SELECT a.id FROM core.a a; SELECT $tag$ x; SELECT b.id FROM core.b b;"
+    chunks = split_statements(sql, "postgres")
+    assert [chunk.sql for chunk in chunks] == [
+        "SELECT a.id FROM core.a a",
+        "SELECT $tag$ x",
+        "SELECT b.id FROM core.b b",
+    ]
+    assert sql[chunks[1].start : chunks[1].end] == chunks[1].sql
+    statements = analyze(sql, dialect="postgres")["statements"]
+    assert [item["type"] for item in statements] == ["select", "unparsed", "select"]
+
+
+def test_trailing_comment_is_not_a_statement() -> None:
+    statements = analyze("SELECT 1; SELECT $tag$ x; -- hi\n", dialect="postgres")[
+        "statements"
+    ]
+    assert [item["type"] for item in statements] == ["select", "unparsed"]
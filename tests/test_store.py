@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from sql_lineage import GraphStore, LineageGraph, build_graph
+
+
+def _load_fixture(name: str) -> str:
+    """Load SQL fixture content."""
+
+    return Path(__file__).parent.joinpath("fixtures", name).read_text(encoding="utf-8")
+
+
+def _ordered(reached) -> list:
+    return sorted(reached, key=lambda item: (item[1], item[0]))
+
+
+@pytest.mark.parametrize("dialect", ["clickhouse", "mysql", "postgres", "spark"])
+def test_store_round_trips_and_matches_traversal(tmp_path, dialect: str) -> None:
+    graph = build_graph(_load_fixture(f"{dialect}_complex.sql"), dialect)
+    store = GraphStore(str(tmp_path / "graph.db"))
+    store.write({"nodes": [], "edges": []})
+    store.write(graph)
+    store.close()
+
+    store = GraphStore(str(tmp_path / "graph.db"))
+    assert store.read() == graph
+    assert list(store.read()) == list(graph)
+    assert sum(item["nodes"] for item in store.statements()) == len(graph["nodes"])
+    indexed = LineageGraph(graph)
+    for node in graph["nodes"]:
+        node_id = node["id"]
+        assert store.node(node_id) == node
+        assert sorted(edge["id"] for edge in store.in_edges(node_id)) == sorted(
+            edge["id"] for edge in indexed.in_edges(node_id)
+        )
+        for depth in (None, 1):
+            assert store.upstream(node_id, depth=depth) == _ordered(
+                indexed.upstream(node_id, depth=depth)
+            )
+            assert store.downstream(node_id, depth=depth) == _ordered(
+                indexed.downstream(node_id, depth=depth)
+            )
+
+
+def test_lookups_by_table_type_and_neighbors() -> None:
+    store = GraphStore(":memory:")
+    store.write(build_graph(_load_fixture("postgres_complex.sql"), "postgres"))
+    target = "analytics.result_table.net_total_filled"
+    assert target in store and store.node_id(target) == f"column:{target}"
+    assert len(store.columns_of("analytics.result_table")) == 5
+    assert [node["id"] for node in store.tables("core.*")] == [
+        "table:core.users",
+        "table:core.orders",
+    ]
+    assert {node["type"] for node in store.nodes_of_type("cte")} == {"cte"}
+    assert store.neighbors(target, "in", ["contains"]) == [
+        "table:analytics.result_table"
+    ]
+    with pytest.raises(KeyError):
+        store.node("missing.column")
+    with pytest.raises(ValueError):
+        store.neighbors(target, "sideways")
+
+
+def test_traversal_terminates_on_cycles() -> None:
+    pairs = ["ab", "ba", "bc", "cc", "cd"]
+    store = GraphStore(":memory:")
+    store.write(
+        {
+            "nodes": [{"id": name, "type": "column"} for name in "abcd"],
+            "edges": [
+                {"id": f"e{index}", "type": "lineage", "from": pair[0], "to": pair[1]}
+                for index, pair in enumerate(pairs)
+            ],
+        }
+    )
+    assert store.downstream("a") == [("b", 1), ("c", 2), ("d", 3)]
+    assert store.upstream("d", depth=2) == [("c", 1), ("b", 2)]
+    assert store.neighbors("b", "both") == ["a", "c"]